@@ -27,7 +27,13 @@ if config.config_file_name is not None:
 from modules.auth.infrastructure.user_db_model import UserDB
 from modules.menu.infrastructure.menu_item_db_model import MenuItemDB
 from modules.menu.infrastructure.pre_order_item_db_model import PreOrderItemDB
+from modules.menu.infrastructure.stock_shard_db_model import StockShardDB
 from modules.reservation.infrastructure.reservation_db_model import ReservationDBModel
+from modules.reservation.infrastructure.idempotency_db_model import IdempotencyKeyDB
+from modules.reservation.infrastructure.waitlist_db_model import WaitlistEntryDB
+from modules.reservation.infrastructure.reservation_view_db_model import ReservationViewDB
+from modules.reservation.infrastructure.slot_hold_db_model import SlotHoldDB
+from modules.reservation.infrastructure.slot_covers_db_model import SlotCoversDB
 from modules.restaurant.infrastructure.restaurant_db_model import RestaurantDBModel
 from modules.restaurant.infrastructure.table_db_model import TableDBModel
 from sqlmodel import SQLModel
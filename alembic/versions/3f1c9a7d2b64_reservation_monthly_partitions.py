@@ -0,0 +1,109 @@
+"""reservation monthly partitions
+
+Revision ID: 3f1c9a7d2b64
+Revises: e522690ed455
+Create Date: 2026-10-18 15:20:44.107615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b64'
+down_revision: Union[str, None] = 'e522690ed455'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status IN ('PENDING', 'CONFIRMED')")
+MONTHS_AHEAD = 12
+
+EXCLUDE_ACTIVE_OVERLAP = (
+    "EXCLUDE USING gist (table_id WITH =, tsrange(start_time, end_time, '[)') WITH &&) "
+    "WHERE (status IN ('PENDING', 'CONFIRMED'))"
+)
+
+
+def create_indexes() -> None:
+    # Sobre la tabla particionada cada índice se propaga a todas las particiones (presentes y futuras)
+    op.create_index('ix_reservationdbmodel_uuid', 'reservationdbmodel', ['uuid'], unique=False)
+    op.create_index('ix_reservationdbmodel_user_id', 'reservationdbmodel', ['user_id'], unique=False)
+    op.create_index('ix_reservationdbmodel_table_id', 'reservationdbmodel', ['table_id'], unique=False)
+    op.create_index('ix_reservation_active_table_time', 'reservationdbmodel',
+                    ['table_id', 'start_time', 'end_time'], unique=False, postgresql_where=ACTIVE)
+    op.create_index('ix_reservation_active_user_time', 'reservationdbmodel',
+                    ['user_id', 'start_time', 'end_time'], unique=False, postgresql_where=ACTIVE)
+    op.create_index('ix_reservation_start_time_uuid', 'reservationdbmodel', ['start_time', 'uuid'], unique=False)
+    op.create_index('ix_reservation_table_start_time', 'reservationdbmodel', ['table_id', 'start_time'], unique=False)
+    op.create_index('ix_reservation_active_end_time', 'reservationdbmodel', ['end_time'], unique=False,
+                    postgresql_where=ACTIVE)
+
+
+def upgrade() -> None:
+    # Una FK necesita una clave única sobre la columna referida y en una tabla particionada toda
+    # clave única incluye start_time: pre_order_items.reservation_id pasa a ser una columna indexada.
+    op.execute("ALTER TABLE pre_order_items DROP CONSTRAINT IF EXISTS pre_order_items_reservation_id_fkey")
+    op.create_index('ix_pre_order_items_reservation_id', 'pre_order_items', ['reservation_id'], unique=False)
+
+    op.execute(
+        "CREATE TABLE reservationdbmodel_partitioned "
+        "(LIKE reservationdbmodel INCLUDING DEFAULTS, PRIMARY KEY (uuid, start_time)) "
+        "PARTITION BY RANGE (start_time)"
+    )
+    # Un mes por partición, desde la reserva más antigua hasta MONTHS_AHEAD meses después del actual.
+    # La exclusión contra el doble booking no se admite sobre la tabla padre: cada partición lleva la
+    # suya (mismo prefijo de nombre que detecta ReservationRepository). Solo compara reservas del mismo
+    # mes; los solapes sobre un cambio de mes los frena ReservationRepository con un candado por mesa.
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            m date := date_trunc('month', COALESCE((SELECT min(start_time) FROM reservationdbmodel), now()));
+            last_month date := date_trunc('month', GREATEST(
+                (SELECT max(start_time) FROM reservationdbmodel), now()::timestamp)) + interval '{MONTHS_AHEAD} months';
+            suffix text;
+        BEGIN
+            WHILE m <= last_month LOOP
+                suffix := to_char(m, '"y"YYYY"m"MM');
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF reservationdbmodel_partitioned FOR VALUES FROM (%L) TO (%L)',
+                    'reservationdbmodel_' || suffix, m, (m + interval '1 month')::date);
+                EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I {EXCLUDE_ACTIVE_OVERLAP.replace("'", "''")}',
+                    'reservationdbmodel_' || suffix, 'reservation_table_no_overlap_' || suffix);
+                m := (m + interval '1 month')::date;
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute("CREATE TABLE reservationdbmodel_default PARTITION OF reservationdbmodel_partitioned DEFAULT")
+    op.execute(f"ALTER TABLE reservationdbmodel_default ADD CONSTRAINT reservation_table_no_overlap_default "
+               f"{EXCLUDE_ACTIVE_OVERLAP}")
+
+    op.execute("INSERT INTO reservationdbmodel_partitioned SELECT * FROM reservationdbmodel")
+    op.drop_table('reservationdbmodel')
+    op.rename_table('reservationdbmodel_partitioned', 'reservationdbmodel')
+    op.execute("ALTER TABLE reservationdbmodel RENAME CONSTRAINT reservationdbmodel_partitioned_pkey "
+               "TO reservationdbmodel_pkey")
+    op.create_foreign_key('reservationdbmodel_table_id_fkey', 'reservationdbmodel', 'tabledbmodel',
+                          ['table_id'], ['id'])
+    create_indexes()
+    op.execute("ANALYZE reservationdbmodel")
+
+
+def downgrade() -> None:
+    op.execute("CREATE TABLE reservationdbmodel_plain (LIKE reservationdbmodel INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO reservationdbmodel_plain SELECT * FROM reservationdbmodel")
+    # DROP de la tabla particionada borra también sus particiones (las archivadas ya no le pertenecen)
+    op.drop_table('reservationdbmodel')
+    op.rename_table('reservationdbmodel_plain', 'reservationdbmodel')
+    op.create_primary_key('reservationdbmodel_pkey', 'reservationdbmodel', ['uuid'])
+    op.create_foreign_key('reservationdbmodel_table_id_fkey', 'reservationdbmodel', 'tabledbmodel',
+                          ['table_id'], ['id'])
+    op.execute(f"ALTER TABLE reservationdbmodel ADD CONSTRAINT reservation_table_no_overlap {EXCLUDE_ACTIVE_OVERLAP}")
+    create_indexes()
+
+    op.drop_index('ix_pre_order_items_reservation_id', table_name='pre_order_items')
+    op.create_foreign_key('pre_order_items_reservation_id_fkey', 'pre_order_items', 'reservationdbmodel',
+                          ['reservation_id'], ['uuid'])
@@ -0,0 +1,42 @@
+"""menu item stock shards
+
+Revision ID: 6c2f9b14d8a7
+Revises: d41f8a2c6e37
+Create Date: 2026-10-18 19:41:08.216547
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c2f9b14d8a7'
+down_revision: Union[str, None] = 'd41f8a2c6e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('menu_items', sa.Column('stock_shards', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('menu_item_stock_shards',
+    sa.Column('menu_item_id', sa.Uuid(), nullable=False),
+    sa.Column('shard', sa.Integer(), nullable=False),
+    sa.Column('stock', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ),
+    sa.PrimaryKeyConstraint('menu_item_id', 'shard')
+    )
+
+
+def downgrade() -> None:
+    # Antes de borrar los sub-contadores se devuelve su suma a available_stock
+    op.execute(
+        """
+        UPDATE menu_items m SET available_stock = s.total
+        FROM (SELECT menu_item_id, sum(stock) AS total FROM menu_item_stock_shards GROUP BY menu_item_id) s
+        WHERE s.menu_item_id = m.id AND m.stock_shards > 0
+        """
+    )
+    op.drop_table('menu_item_stock_shards')
+    op.drop_column('menu_items', 'stock_shards')
@@ -0,0 +1,31 @@
+"""reservation active end_time index
+
+Revision ID: 81ff7dd3d885
+Revises: c7522105f179
+Create Date: 2026-10-18 13:20:41.511208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '81ff7dd3d885'
+down_revision: Union[str, None] = 'c7522105f179'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_reservation_active_end_time', 'reservationdbmodel', ['end_time'], unique=False,
+                        postgresql_where=sa.text("status IN ('PENDING', 'CONFIRMED')"),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_reservation_active_end_time', table_name='reservationdbmodel',
+                      postgresql_concurrently=True, if_exists=True)
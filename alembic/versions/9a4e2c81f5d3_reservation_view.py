@@ -0,0 +1,66 @@
+"""reservation view
+
+Revision ID: 9a4e2c81f5d3
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 16:02:17.553901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e2c81f5d3'
+down_revision: Union[str, None] = '3f1c9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('reservation_view',
+    sa.Column('uuid', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('table_id', sa.Uuid(), nullable=False),
+    sa.Column('restaurant_id', sa.Uuid(), nullable=False),
+    sa.Column('restaurant_name', sa.String(), nullable=False),
+    sa.Column('table_number', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('num_people', sa.Integer(), nullable=False),
+    sa.Column('special_instructions', sa.String(), nullable=True),
+    # El tipo enum ya existe (lo usa reservationdbmodel)
+    sa.Column('status', postgresql.ENUM('PENDING', 'CONFIRMED', 'CANCELLED', 'COMPLETED', name='reservationstatus',
+                                        create_type=False), nullable=False),
+    sa.Column('pre_order_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('uuid')
+    )
+    op.create_index('ix_reservation_view_user_start', 'reservation_view', ['user_id', 'start_time', 'uuid'], unique=False)
+    op.create_index('ix_reservation_view_restaurant_start', 'reservation_view',
+                    ['restaurant_id', 'start_time', 'uuid'], unique=False)
+    op.create_index('ix_reservation_view_start', 'reservation_view', ['start_time', 'uuid'], unique=False)
+    op.create_index('ix_reservation_view_table', 'reservation_view', ['table_id'], unique=False)
+
+    # Backfill (lo mismo que `python -m modules.reservation.infrastructure.reservation_view rebuild`)
+    op.execute(
+        """
+        INSERT INTO reservation_view (uuid, user_id, table_id, restaurant_id, restaurant_name, table_number,
+                                      start_time, end_time, num_people, special_instructions, status, pre_order_count)
+        SELECT r.uuid, r.user_id, r.table_id, t.restaurant_id, rest.name, t.number,
+               r.start_time, r.end_time, r.num_people, r.special_instructions, r.status,
+               (SELECT count(*) FROM pre_order_items p WHERE p.reservation_id = r.uuid)
+        FROM reservationdbmodel r
+        JOIN tabledbmodel t ON t.id = r.table_id
+        JOIN restaurantdbmodel rest ON rest.id = t.restaurant_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reservation_view_table', table_name='reservation_view')
+    op.drop_index('ix_reservation_view_start', table_name='reservation_view')
+    op.drop_index('ix_reservation_view_restaurant_start', table_name='reservation_view')
+    op.drop_index('ix_reservation_view_user_start', table_name='reservation_view')
+    op.drop_table('reservation_view')
@@ -0,0 +1,45 @@
+"""menu item unique lower name
+
+Revision ID: a3e8d51c7f02
+Revises: 6c2f9b14d8a7
+Create Date: 2026-10-18 21:05:37.604219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e8d51c7f02'
+down_revision: Union[str, None] = '6c2f9b14d8a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Antes la unicidad la revisaba solo el servicio, y con carreras pudieron quedar nombres
+    # repetidos: se conserva uno y a los demás se les agrega el inicio de su id.
+    op.execute("""
+        UPDATE menu_items AS m
+        SET name = m.name || ' #' || left(m.id::text, 8)
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY restaurant_id, lower(name) ORDER BY id) AS n
+            FROM menu_items
+        ) AS duplicates
+        WHERE duplicates.id = m.id AND duplicates.n > 1
+    """)
+    # CONCURRENTLY no bloquea las escrituras del menú mientras se construye. Si falla (p. ej.
+    # alguien creó un repetido mientras tanto) deja un índice INVALID que hay que borrar antes
+    # de volver a correr la migración.
+    with op.get_context().autocommit_block():
+        op.create_index('uq_menu_items_restaurant_lower_name', 'menu_items',
+                        ['restaurant_id', sa.text('lower(name)')], unique=True,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_menu_items_restaurant_lower_name', table_name='menu_items',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,51 @@
+"""slot holds
+
+Revision ID: b7d3e5f1a920
+Revises: 9a4e2c81f5d3
+Create Date: 2026-10-18 17:41:09.318244
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e5f1a920'
+down_revision: Union[str, None] = '9a4e2c81f5d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('slot_holds',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('table_id', sa.Uuid(), nullable=False),
+    sa.Column('restaurant_id', sa.Uuid(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('num_people', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_slot_holds_table_time', 'slot_holds', ['table_id', 'start_time', 'end_time'], unique=False)
+    op.create_index('ix_slot_holds_restaurant_time', 'slot_holds', ['restaurant_id', 'start_time'], unique=False)
+    op.create_index(op.f('ix_slot_holds_expires_at'), 'slot_holds', ['expires_at'], unique=False)
+    # Igual que reservation_table_no_overlap, pero sin filtro: las vencidas se borran antes de insertar
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        """
+        ALTER TABLE slot_holds
+        ADD CONSTRAINT slot_hold_table_no_overlap
+        EXCLUDE USING gist (table_id WITH =, tsrange(start_time, end_time, '[)') WITH &&)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_slot_holds_expires_at'), table_name='slot_holds')
+    op.drop_index('ix_slot_holds_restaurant_time', table_name='slot_holds')
+    op.drop_index('ix_slot_holds_table_time', table_name='slot_holds')
+    op.drop_table('slot_holds')
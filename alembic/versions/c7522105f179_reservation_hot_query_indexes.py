@@ -0,0 +1,49 @@
+"""reservation hot query indexes
+
+Revision ID: c7522105f179
+Revises: 78b9366f9afb
+Create Date: 2026-10-18 11:40:02.918344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7522105f179'
+down_revision: Union[str, None] = '78b9366f9afb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status IN ('PENDING', 'CONFIRMED')")
+
+
+def upgrade() -> None:
+    # CONCURRENTLY no puede correr dentro de una transacción: no bloquea las escrituras
+    # sobre reservationdbmodel mientras se construyen los índices.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_reservation_active_table_time', 'reservationdbmodel',
+                        ['table_id', 'start_time', 'end_time'], unique=False,
+                        postgresql_where=ACTIVE, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_reservation_active_user_time', 'reservationdbmodel',
+                        ['user_id', 'start_time', 'end_time'], unique=False,
+                        postgresql_where=ACTIVE, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_reservation_start_time_uuid', 'reservationdbmodel',
+                        ['start_time', 'uuid'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_reservation_table_start_time', 'reservationdbmodel',
+                        ['table_id', 'start_time'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in (
+            'ix_reservation_table_start_time',
+            'ix_reservation_start_time_uuid',
+            'ix_reservation_active_user_time',
+            'ix_reservation_active_table_time',
+        ):
+            op.drop_index(name, table_name='reservationdbmodel', postgresql_concurrently=True, if_exists=True)
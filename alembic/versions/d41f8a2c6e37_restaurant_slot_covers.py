@@ -0,0 +1,50 @@
+"""restaurant slot covers
+
+Revision ID: d41f8a2c6e37
+Revises: b7d3e5f1a920
+Create Date: 2026-10-18 18:27:45.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f8a2c6e37'
+down_revision: Union[str, None] = 'b7d3e5f1a920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('restaurantdbmodel', sa.Column('max_covers_per_slot', sa.Integer(), nullable=True))
+    op.create_table('restaurant_slot_covers',
+    sa.Column('restaurant_id', sa.Uuid(), nullable=False),
+    sa.Column('slot_start', sa.DateTime(), nullable=False),
+    sa.Column('covers', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('restaurant_id', 'slot_start')
+    )
+
+    # Backfill: cubiertos de las reservas activas futuras en cada franja de 15 minutos que tocan
+    op.execute(
+        """
+        INSERT INTO restaurant_slot_covers (restaurant_id, slot_start, covers)
+        SELECT t.restaurant_id, slot, sum(r.num_people)
+        FROM reservationdbmodel r
+        JOIN tabledbmodel t ON t.id = r.table_id
+        CROSS JOIN LATERAL generate_series(
+            date_trunc('hour', r.start_time) + floor(extract(minute FROM r.start_time) / 15) * interval '15 minutes',
+            r.end_time - interval '1 microsecond',
+            interval '15 minutes'
+        ) AS slot
+        WHERE r.status IN ('PENDING', 'CONFIRMED') AND r.end_time > now() AT TIME ZONE 'utc'
+        GROUP BY t.restaurant_id, slot
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('restaurant_slot_covers')
+    op.drop_column('restaurantdbmodel', 'max_covers_per_slot')
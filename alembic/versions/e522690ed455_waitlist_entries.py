@@ -0,0 +1,47 @@
+"""waitlist entries
+
+Revision ID: e522690ed455
+Revises: 6b431640c402
+Create Date: 2026-10-18 14:31:08.672310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e522690ed455'
+down_revision: Union[str, None] = '6b431640c402'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('waitlist_entries',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('restaurant_id', sa.Uuid(), nullable=False),
+    sa.Column('party_size', sa.Integer(), nullable=False),
+    sa.Column('window_start', sa.DateTime(), nullable=False),
+    sa.Column('window_end', sa.DateTime(), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('time_bucket', sa.Date(), nullable=False),
+    sa.Column('status', sa.Enum('WAITING', 'PROMOTED', 'CANCELLED', name='waitliststatus'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('reservation_id', sa.Uuid(), nullable=True),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurantdbmodel.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_waitlist_entries_user_id'), 'waitlist_entries', ['user_id'], unique=False)
+    op.create_index('ix_waitlist_waiting_restaurant_bucket', 'waitlist_entries',
+                    ['restaurant_id', 'time_bucket', 'created_at'], unique=False,
+                    postgresql_where=sa.text("status = 'WAITING'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_waitlist_waiting_restaurant_bucket', table_name='waitlist_entries')
+    op.drop_index(op.f('ix_waitlist_entries_user_id'), table_name='waitlist_entries')
+    op.drop_table('waitlist_entries')
+    sa.Enum(name='waitliststatus').drop(op.get_bind(), checkfirst=False)
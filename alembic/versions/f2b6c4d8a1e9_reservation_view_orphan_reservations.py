@@ -0,0 +1,47 @@
+"""reservation view keeps reservations without a table
+
+Revision ID: f2b6c4d8a1e9
+Revises: a3e8d51c7f02
+Create Date: 2026-10-18 23:41:09.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b6c4d8a1e9'
+down_revision: Union[str, None] = 'a3e8d51c7f02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('reservation_view', 'restaurant_id', existing_type=sa.Uuid(), nullable=True)
+    op.alter_column('reservation_view', 'restaurant_name', existing_type=sa.String(), nullable=True)
+    op.alter_column('reservation_view', 'table_number', existing_type=sa.Integer(), nullable=True)
+
+    # El backfill anterior usaba joins internos: agrega las reservas cuya mesa ya no existe
+    op.execute(
+        """
+        INSERT INTO reservation_view (uuid, user_id, table_id, restaurant_id, restaurant_name, table_number,
+                                      start_time, end_time, num_people, special_instructions, status, pre_order_count)
+        SELECT r.uuid, r.user_id, r.table_id, t.restaurant_id, rest.name, t.number,
+               r.start_time, r.end_time, r.num_people, r.special_instructions, r.status,
+               (SELECT count(*) FROM pre_order_items p WHERE p.reservation_id = r.uuid)
+        FROM reservationdbmodel r
+        LEFT JOIN tabledbmodel t ON t.id = r.table_id
+        LEFT JOIN restaurantdbmodel rest ON rest.id = t.restaurant_id
+        WHERE NOT EXISTS (SELECT 1 FROM reservation_view v WHERE v.uuid = r.uuid)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM reservation_view WHERE restaurant_id IS NULL OR restaurant_name IS NULL "
+               "OR table_number IS NULL")
+    op.alter_column('reservation_view', 'table_number', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('reservation_view', 'restaurant_name', existing_type=sa.String(), nullable=False)
+    op.alter_column('reservation_view', 'restaurant_id', existing_type=sa.Uuid(), nullable=False)
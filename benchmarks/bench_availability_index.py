@@ -0,0 +1,67 @@
+"""
+Compara el chequeo de solapamiento de POST /reservations por base de datos
+(get_active_by_user_and_time + get_active_by_table_and_time) contra el índice en memoria.
+
+    python -m benchmarks.bench_availability_index
+"""
+import random
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from benchmarks.seed import make_engine, reset_schema, seed_restaurant, seed_reservations, timed
+from modules.reservation.infrastructure.availability_index import AvailabilityIndex
+from modules.reservation.infrastructure.reservation_repository import ReservationRepository
+
+TABLES = 60
+DAYS = 30
+CHECKS = 2000
+USERS = 500
+
+
+def main():
+    engine = make_engine()
+    reset_schema(engine)
+    first_day = datetime(2025, 8, 1)
+    user_ids = [uuid4() for _ in range(USERS)]
+    with Session(engine) as db:
+        _, tables = seed_restaurant(db, TABLES)
+        total = seed_reservations(db, tables, DAYS, first_day, user_ids)
+
+    rng = random.Random(1)
+    probes = []
+    for _ in range(CHECKS):
+        table = rng.choice(tables)
+        # Concentradas en pocos días, como un viernes por la noche
+        start = first_day + timedelta(days=rng.randint(0, 2), hours=rng.randint(12, 22), minutes=rng.choice((0, 30)))
+        probes.append((table.id, rng.choice(user_ids), start, start + timedelta(hours=2)))
+
+    with Session(engine) as db:
+        repo = ReservationRepository(db, index=AvailabilityIndex(ttl_seconds=3600))
+        it = iter(probes * 2)
+
+        def db_path():
+            table_id, user_id, start, end = next(it)
+            repo.get_active_by_user_and_time(user_id, start, end)
+            repo.get_active_by_table_and_time(table_id, start, end)
+
+        def index_path():
+            table_id, user_id, start, end = next(it)
+            repo.exists_active_by_user_and_time(user_id, start, end)
+            repo.exists_active_by_table_and_time(table_id, start, end)
+
+        db_ms = timed(db_path, CHECKS)
+        it = iter(probes * 2)
+        cold_ms = timed(index_path, CHECKS)
+        warm_ms = timed(index_path, CHECKS)
+
+    print(f"reservas: {total}  mesas: {TABLES}  chequeos: {CHECKS}")
+    print(f"base de datos : {db_ms:8.3f} ms/chequeo")
+    print(f"índice (frío) : {cold_ms:8.3f} ms/chequeo (incluye cargas por restaurante-día y usuario-día)")
+    print(f"índice (tibio): {warm_ms:8.3f} ms/chequeo")
+    print(f"aceleración   : {db_ms / cold_ms:8.1f}x frío, {db_ms / warm_ms:8.1f}x tibio")
+
+
+if __name__ == "__main__":
+    main()
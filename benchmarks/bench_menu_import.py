@@ -0,0 +1,75 @@
+"""
+Importación masiva del menú: 50.000 platos en CSV a través de MenuServices.import_menu_items.
+
+El archivo se genera y se entrega en trozos de 64 KiB, como llegaría en el cuerpo de la petición,
+y se mide el tiempo total y el pico de memoria de Python (tracemalloc) durante la importación.
+Luego se exporta de vuelta y se verifica que no se perdió ni se duplicó ningún plato.
+
+    python -m benchmarks.bench_menu_import
+"""
+import time
+import tracemalloc
+
+from sqlmodel import Session
+
+from benchmarks.seed import make_engine, reset_schema, seed_restaurant
+from modules.menu.application.menu_bulk import iter_lines, iter_rows, serialize
+from modules.menu.application.menu_services import MenuServices
+from modules.menu.infrastructure.available_dish_cache import AvailableDishCache
+from modules.menu.infrastructure.menu_repository import MenuRepository
+from modules.restaurant.infrastructure.restaurant_repository import RestaurantRepository
+
+ITEMS = 50_000
+CHUNK_SIZE = 64 * 1024
+
+
+def csv_chunks(items: int):
+    buffer = ["name,description,category,price,available_stock,image_url\n"]
+    size = len(buffer[0])
+    for i in range(items):
+        line = f"Plato {i},Descripción del plato {i},Categoría {i % 12},{5 + i % 20}.50,{i % 40},\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    # Una fila repetida al final: debe descartarse
+    buffer.append("PLATO 0,Repetido,Categoría 0,5.50,1,\n")
+    yield "".join(buffer).encode()
+
+
+def import_once(db, restaurant_id):
+    service = MenuServices(MenuRepository(db, cache=AvailableDishCache()), RestaurantRepository(db))
+    return service.import_menu_items(restaurant_id, iter_rows(iter_lines(csv_chunks(ITEMS)), "csv"))
+
+
+def main():
+    engine = make_engine()
+    reset_schema(engine)
+    with Session(engine) as db:
+        restaurant_id, _ = seed_restaurant(db, 1)
+        started = time.perf_counter()
+        result = import_once(db, restaurant_id)
+        elapsed = time.perf_counter() - started
+
+        # tracemalloc hace todo más lento: la memoria se mide en una segunda importación aparte
+        other_restaurant_id, _ = seed_restaurant(db, 1)
+        tracemalloc.start()
+        import_once(db, other_restaurant_id)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        service = MenuServices(MenuRepository(db, cache=AvailableDishCache()))
+        started = time.perf_counter()
+        exported_bytes = sum(len(chunk) for chunk in serialize(service.export_menu_items(restaurant_id), "csv"))
+        export_elapsed = time.perf_counter() - started
+        exported = sum(1 for _ in service.export_menu_items(restaurant_id))
+
+    print(f"motor: {engine.dialect.name}  filas: {ITEMS + 1}")
+    print(f"importación : {elapsed:6.2f} s  ({ITEMS / elapsed:,.0f} platos/s)  pico de memoria {peak / 2**20:.1f} MiB")
+    print(f"resultado   : {result.imported} importados, {result.skipped_duplicates} repetidos, {result.invalid} inválidos")
+    print(f"exportación : {export_elapsed:6.2f} s  ({exported_bytes / 2**20:.1f} MiB de CSV, {exported} platos)")
+
+
+if __name__ == "__main__":
+    main()
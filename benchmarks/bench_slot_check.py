@@ -0,0 +1,68 @@
+"""
+Consulta de disponibilidad por lotes: una grilla de 200 mesas × 24 franjas de media hora.
+
+Compara ReservationService.check_slots (una consulta de rango + barrido en memoria) contra
+preguntar celda por celda con exists_active_by_table_and_time, y verifica que ambos coincidan.
+
+    python -m benchmarks.bench_slot_check
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from benchmarks.seed import make_engine, reset_schema, seed_restaurant, seed_reservations, timed
+from modules.reservation.application.dtos.slot_check_dto import SlotCandidateDto
+from modules.reservation.application.reservation_services import ReservationService
+from modules.reservation.infrastructure.availability_index import AvailabilityIndex
+from modules.reservation.infrastructure.reservation_repository import ReservationRepository
+
+TABLES = 200
+SLOTS = 24
+REPEAT = 20
+PER_CELL_SAMPLE = 500
+USERS = 300
+
+
+def main():
+    engine = make_engine()
+    reset_schema(engine)
+    day = datetime(2025, 9, 5)
+    with Session(engine) as db:
+        _, tables = seed_restaurant(db, TABLES)
+        total = seed_reservations(db, tables, 3, day - timedelta(days=1), [uuid4() for _ in range(USERS)])
+
+    opening = day + timedelta(hours=12)
+    candidates = [
+        SlotCandidateDto(table_id=table.id, start_time=opening + timedelta(minutes=30 * i),
+                         end_time=opening + timedelta(minutes=30 * (i + 1)))
+        for table in tables for i in range(SLOTS)
+    ]
+
+    with Session(engine) as db:
+        repo = ReservationRepository(db, index=AvailabilityIndex())
+        service = ReservationService(repo, None, None, None)
+        results = service.check_slots(candidates)
+        batch_ms = timed(lambda: service.check_slots(candidates), REPEAT)
+
+        it = iter(candidates)
+        per_cell_ms = timed(lambda: (lambda c: repo.exists_active_by_table_and_time(
+            c.table_id, c.start_time, c.end_time))(next(it)), PER_CELL_SAMPLE)
+
+        # Índice vacío para que cada celda vaya a la base de datos en la verificación
+        checker = ReservationRepository(db, index=AvailabilityIndex(ttl_seconds=0))
+        mismatches = sum(
+            r.available == checker.exists_active_by_table_and_time(c.table_id, c.start_time, c.end_time)
+            for c, r in zip(candidates, results)
+        )
+
+    taken = sum(not r.available for r in results)
+    print(f"mesas: {TABLES}  franjas: {SLOTS}  candidatos: {len(candidates)}  reservas: {total}")
+    print(f"check_slots (lote)    : {batch_ms:8.3f} ms/llamada  ({taken} celdas ocupadas)")
+    print(f"celda por celda       : {per_cell_ms * len(candidates):8.3f} ms/grilla "
+          f"(estimado con {PER_CELL_SAMPLE} celdas, {per_cell_ms:.3f} ms/celda)")
+    print(f"diferencias con la verificación celda por celda: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Asignación automática de mesa (best-fit) en un restaurante de 200 mesas con la noche llena.
+
+1. Latencia: ReservationService._assign_table (una consulta de ocupación + una pasada en
+   memoria) contra probar mesa por mesa con get_active_by_table_and_time.
+2. Calidad: sobre una noche vacía, cuántos grupos se sientan con best-fit contra
+   first-fit (primera mesa libre por número) para la misma secuencia de pedidos.
+
+    python -m benchmarks.bench_table_allocation
+"""
+import random
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from benchmarks.seed import make_engine, reset_schema, seed_restaurant, seed_reservations, timed
+from modules.reservation.application.reservation_services import ReservationService
+from modules.reservation.application.table_allocator import best_fit_table
+from modules.reservation.domain.table_occupancy import TableOccupancy
+from modules.reservation.infrastructure.availability_index import AvailabilityIndex
+from modules.reservation.infrastructure.reservation_repository import ReservationRepository
+from modules.restaurant.infrastructure.restaurant_repository import RestaurantRepository
+from modules.restaurant.infrastructure.table_repository import TableRepository
+
+TABLES = 200
+CAPACITIES = (2, 2, 4, 4, 4, 6, 8)
+EVENING_HOURS = (18, 20, 22)
+PROBES = 300
+REQUESTS = 900
+USERS = 300
+
+
+def first_fit_table(tables, party_size, start, end):
+    for table in sorted(tables, key=lambda t: t.table_number):
+        if table.capacity >= party_size and all(s >= end or e <= start for s, e in table.booked):
+            return table
+    return None
+
+
+def party_size(rng: random.Random) -> int:
+    return rng.choices((1, 2, 3, 4, 5, 6, 7, 8), weights=(4, 30, 12, 22, 8, 10, 3, 3))[0]
+
+
+def simulate(allocate, tables, day: datetime, seed: int):
+    """Sienta una secuencia de pedidos sobre una noche vacía; devuelve (grupos, cubiertos)."""
+    rng = random.Random(seed)
+    tables = [
+        TableOccupancy(table_id=t.id, table_number=t.number, capacity=t.capacity, location=t.location)
+        for t in tables
+    ]
+    seated = covers = 0
+    for _ in range(REQUESTS):
+        size = party_size(rng)
+        start = day + timedelta(hours=rng.randint(18, 22), minutes=rng.choice((0, 30)))
+        end = start + timedelta(hours=2)
+        table = allocate(tables, size, start, end)
+        if table:
+            table.booked.append((start, end))
+            seated += 1
+            covers += size
+    return seated, covers
+
+
+def main():
+    engine = make_engine()
+    reset_schema(engine)
+    day = datetime(2025, 9, 5)
+    user_ids = [uuid4() for _ in range(USERS)]
+    with Session(engine) as db:
+        restaurant_id, tables = seed_restaurant(db, TABLES, CAPACITIES)
+        total = seed_reservations(db, tables, 1, day, user_ids, slot_hours=EVENING_HOURS)
+
+    rng = random.Random(5)
+    probes = []
+    for _ in range(PROBES):
+        start = day + timedelta(hours=rng.randint(18, 22), minutes=rng.choice((0, 30)))
+        probes.append((party_size(rng), start, start + timedelta(hours=2)))
+
+    with Session(engine) as db:
+        reservation_repo = ReservationRepository(db, index=AvailabilityIndex())
+        table_repo = TableRepository(db)
+        service = ReservationService(reservation_repo, table_repo, None, RestaurantRepository(db))
+        it = iter(probes * 2)
+
+        def preloaded():
+            size, start, end = next(it)
+            try:
+                service._assign_table(restaurant_id, size, start, end)
+            except Exception:
+                pass  # 409: no hay mesa libre
+
+        def per_table():
+            size, start, end = next(it)
+            for table in sorted(table_repo.get_by_restaurant_id(restaurant_id), key=lambda t: t.capacity):
+                if table.capacity >= size and not reservation_repo.get_active_by_table_and_time(table.id, start, end):
+                    return table
+
+        preloaded_ms = timed(preloaded, PROBES)
+        it = iter(probes * 2)
+        per_table_ms = timed(per_table, PROBES)
+
+        day_start, day_end = day, day + timedelta(days=1)
+        occupancy = reservation_repo.get_table_occupancy(restaurant_id, day_start, day_end)
+        booked = sum(len(t.booked) for t in occupancy)
+        it = iter(probes * 2)
+
+        def in_memory():
+            size, start, end = next(it)
+            best_fit_table(occupancy, size, start, end, day_start, day_end)
+
+        in_memory_ms = timed(in_memory, PROBES)
+
+    print(f"mesas: {TABLES}  reservas de la noche: {total}  activas: {booked}  pedidos: {PROBES}")
+    print(f"precarga + best-fit     : {preloaded_ms:8.3f} ms/asignación")
+    print(f"solo best-fit (memoria) : {in_memory_ms:8.3f} ms/asignación")
+    print(f"mesa por mesa (consultas): {per_table_ms:8.3f} ms/asignación")
+
+    window = (day, day + timedelta(days=1))
+    best = simulate(lambda t, s, st, en: best_fit_table(t, s, st, en, *window), tables, day, seed=11)
+    first = simulate(first_fit_table, tables, day, seed=11)
+    print(f"\nnoche simulada ({REQUESTS} pedidos):")
+    print(f"best-fit : {best[0]:5d} grupos sentados, {best[1]:5d} cubiertos")
+    print(f"first-fit: {first[0]:5d} grupos sentados, {first[1]:5d} cubiertos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Utilidades compartidas por los benchmarks: motor de base de datos y datos sintéticos.
+
+Por defecto se usa SQLite en memoria; para medir contra Postgres exportar
+BENCH_DATABASE_URL (p. ej. la misma DATABASE_URL de docker-compose apuntando a una base vacía).
+"""
+import os
+import random
+import time
+from datetime import datetime, time as dtime, timedelta
+from typing import List, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine, insert
+
+from modules.auth.infrastructure.user_db_model import UserDB
+from modules.menu.infrastructure.menu_item_db_model import MenuItemDB
+from modules.menu.infrastructure.pre_order_item_db_model import PreOrderItemDB
+from modules.reservation.domain.reservation import ReservationStatus
+from modules.reservation.infrastructure.reservation_db_model import ReservationDBModel
+from modules.reservation.infrastructure import reservation_view
+from modules.restaurant.domain.table import Table
+from modules.restaurant.infrastructure.restaurant_db_model import RestaurantDBModel
+from modules.restaurant.infrastructure.table_db_model import TableDBModel, to_domain as table_to_domain
+
+
+def make_engine():
+    url = os.getenv("BENCH_DATABASE_URL", "sqlite://")
+    if url.startswith("sqlite"):
+        return create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    return create_engine(url)
+
+
+def reset_schema(engine) -> None:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+
+def seed_restaurant(db: Session, num_tables: int, capacities=(2, 4, 6, 8)) -> Tuple[UUID, List[Table]]:
+    restaurant = RestaurantDBModel(
+        id=uuid4(), name=f"Bench {uuid4().hex[:8]}", address="Calle 1",
+        opening_time="12:00:00", closing_time="23:59:00"
+    )
+    db.add(restaurant)
+    tables = [
+        TableDBModel(id=uuid4(), restaurant_id=restaurant.id, number=i + 1,
+                     capacity=capacities[i % len(capacities)], location="Indoor")
+        for i in range(num_tables)
+    ]
+    db.add_all(tables)
+    domain_tables = [table_to_domain(t) for t in tables]
+    restaurant_id = restaurant.id
+    db.commit()
+    return restaurant_id, domain_tables
+
+
+def seed_reservations(db: Session, tables: List[Table], days: int, first_day: datetime, user_ids: List[UUID],
+                      slot_hours=(12, 14, 16, 18, 20), seed: int = 7) -> int:
+    """Llena cada mesa con reservas de 2 horas sin solapamiento durante `days` días."""
+    rng = random.Random(seed)
+    rows = []
+    for d in range(days):
+        day = first_day + timedelta(days=d)
+        for table in tables:
+            for hour in slot_hours:
+                if rng.random() < 0.7:
+                    start = datetime.combine(day.date(), dtime(hour))
+                    rows.append({
+                        "uuid": uuid4(),
+                        "user_id": rng.choice(user_ids),
+                        "table_id": table.id,
+                        "start_time": start,
+                        "end_time": start + timedelta(hours=2),
+                        "num_people": min(table.capacity, rng.randint(2, 8)),
+                        "special_instructions": None,
+                        "status": rng.choice([ReservationStatus.PENDING, ReservationStatus.CONFIRMED,
+                                              ReservationStatus.CANCELLED, ReservationStatus.COMPLETED]),
+                    })
+        if len(rows) >= 5000:
+            _insert_reservations(db, rows)
+            rows = []
+    if rows:
+        _insert_reservations(db, rows)
+    db.commit()
+    return db.query(ReservationDBModel).count()
+
+
+def _insert_reservations(db: Session, rows) -> None:
+    db.exec(insert(ReservationDBModel), params=rows)
+    reservation_view.refresh_reservations(db, [(row["uuid"], row["start_time"]) for row in rows])
+
+
+def timed(fn, repeat: int) -> float:
+    """Tiempo medio por llamada en milisegundos."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
@@ -1,10 +1,28 @@
 import pytest
+from typing import Iterable, List, Optional
+from uuid import UUID, uuid4
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+
+from modules.core.unit_of_work import UnitOfWork
+from modules.menu.infrastructure.menu_repository import MenuRepository
+from modules.reservation.application.reservation_services import ReservationService
+from modules.reservation.infrastructure.availability_index import AvailabilityIndex
+from modules.reservation.infrastructure.reservation_repository import ReservationRepository
+from modules.restaurant.infrastructure.restaurant_repository import RestaurantRepository
+from modules.restaurant.infrastructure.table_repository import TableRepository
 
 # Import all DB models to ensure they are registered with SQLModel.metadata
 from modules.auth.infrastructure.user_db_model import UserDB
 from modules.menu.infrastructure.menu_item_db_model import MenuItemDB
 from modules.menu.infrastructure.pre_order_item_db_model import PreOrderItemDB
+from modules.menu.infrastructure.stock_shard_db_model import StockShardDB
 from modules.reservation.infrastructure.reservation_db_model import ReservationDBModel
+from modules.reservation.infrastructure.idempotency_db_model import IdempotencyKeyDB
+from modules.reservation.infrastructure.waitlist_db_model import WaitlistEntryDB
+from modules.reservation.infrastructure.reservation_view_db_model import ReservationViewDB
+from modules.reservation.infrastructure.slot_hold_db_model import SlotHoldDB
+from modules.reservation.infrastructure.slot_covers_db_model import SlotCoversDB
 from modules.restaurant.infrastructure.restaurant_db_model import RestaurantDBModel
 from modules.restaurant.infrastructure.table_db_model import TableDBModel
 
@@ -12,3 +30,64 @@ from modules.restaurant.infrastructure.table_db_model import TableDBModel
 def load_all_db_models():
     """Ensures all DB models are loaded and registered with SQLModel.metadata."""
     pass
+
+
+@pytest.fixture
+def engine():
+    """Base SQLite en memoria; StaticPool hace que todas las sesiones del test vean la misma."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def seed_restaurant(db):
+    """Crea el restaurante "Goyo" (12:00 a 23:59); los campos se pueden sobrescribir."""
+    def seed(session: Optional[Session] = None, **fields) -> RestaurantDBModel:
+        session = session or db
+        restaurant = RestaurantDBModel(**{
+            "id": uuid4(), "name": "Goyo", "address": "Calle 1",
+            "opening_time": "12:00:00", "closing_time": "23:59:00", **fields,
+        })
+        session.add(restaurant)
+        session.commit()
+        return restaurant
+    return seed
+
+
+@pytest.fixture
+def seed_tables(db):
+    """Crea una mesa interior por número indicado y las devuelve en el mismo orden."""
+    def seed(restaurant_id: UUID, numbers: Iterable[int], capacity: int = 4,
+             session: Optional[Session] = None) -> List[TableDBModel]:
+        session = session or db
+        tables = [TableDBModel(id=uuid4(), restaurant_id=restaurant_id, number=n, capacity=capacity,
+                               location="Indoor")
+                  for n in numbers]
+        session.add_all(tables)
+        session.commit()
+        return tables
+    return seed
+
+
+@pytest.fixture
+def make_reservation_service(db):
+    """
+    Construye un ReservationService sobre repositorios reales. Cada llamada tiene su propio
+    índice de disponibilidad, como un worker distinto sobre la misma base; los repositorios
+    opcionales (waitlist_repo, hold_repo, capacity_repo...) se pasan por nombre.
+    """
+    def make(session: Optional[Session] = None, menu_repo: Optional[MenuRepository] = None,
+             **repos) -> ReservationService:
+        session = session or db
+        return ReservationService(
+            ReservationRepository(session, index=AvailabilityIndex()), TableRepository(session),
+            menu_repo or MenuRepository(session), RestaurantRepository(session), UnitOfWork(session), **repos
+        )
+    return make
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from sqlmodel import SQLModel
 from modules.core.db_connection import engine
@@ -7,13 +8,23 @@ from modules.restaurant.infrastructure.restaurant_controller import router as re
 from modules.reservation.infrastructure.reservation_controller import router as reservation_router
 from modules.restaurant.infrastructure.table_controller import router as table_router
 from modules.dashboard.infrastructure.dashboard_controller import router as dashboard_router
+from modules.reservation.infrastructure.reservation_sweeper import reservation_sweeper, SWEEPER_ENABLED
 
 SQLModel.metadata.create_all(engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tareas de fondo del proceso: se detienen al apagar la aplicación
+    if SWEEPER_ENABLED:
+        reservation_sweeper.start()
+    yield
+    await reservation_sweeper.stop()
+
 app = FastAPI(
     title="Goyo´s Secrets Restaurants API",
     description="API para gestionar restaurantes, reservaciones, usuarios y menús.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 @app.get("/")
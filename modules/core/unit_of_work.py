@@ -0,0 +1,65 @@
+from typing import Callable
+from sqlmodel import Session
+
+_DEPTH = "unit_of_work_depth"
+_AFTER_COMMIT = "unit_of_work_after_commit"
+
+class UnitOfWork:
+    """
+    Agrupa en una sola transacción las escrituras de los repositorios que comparten la sesión.
+
+    Dentro del bloque `with` los repositorios solo hacen flush (ver `commit`); al salir se
+    confirma todo con un único commit, o se revierte si hubo una excepción. Los bloques
+    anidados se suman a la transacción del más externo.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def __enter__(self) -> "UnitOfWork":
+        self.db.info[_DEPTH] = self.db.info.get(_DEPTH, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        depth = self.db.info[_DEPTH] - 1
+        self.db.info[_DEPTH] = depth
+        if depth:
+            return False
+
+        callbacks = self.db.info.pop(_AFTER_COMMIT, [])
+        if exc_type is not None:
+            self.db.rollback()
+            return False
+        try:
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        for callback in callbacks:
+            callback()
+        return False
+
+def in_unit_of_work(db: Session) -> bool:
+    return db.info.get(_DEPTH, 0) > 0
+
+def commit(db: Session) -> bool:
+    """Confirma la transacción, salvo dentro de una unidad de trabajo donde solo hace flush.
+    Devuelve True si hubo commit (los objetos quedan expirados y hay que refrescarlos)."""
+    if in_unit_of_work(db):
+        db.flush()
+        return False
+    db.commit()
+    return True
+
+def rollback(db: Session) -> None:
+    """Revierte tras una escritura fallida, salvo dentro de una unidad de trabajo: ahí el error se
+    propaga y es ella la que revierte, junto con lo que ya se había escrito en la transacción."""
+    if not in_unit_of_work(db):
+        db.rollback()
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Ejecuta `callback` cuando la transacción actual se confirme (de inmediato si no hay unidad de trabajo)."""
+    if in_unit_of_work(db):
+        db.info.setdefault(_AFTER_COMMIT, []).append(callback)
+    else:
+        callback()
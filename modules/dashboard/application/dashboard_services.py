@@ -2,7 +2,7 @@ from collections import defaultdict, Counter
 from datetime import datetime
 from typing import Dict, List
 from sqlmodel import Session, select, func
-from modules.reservation.infrastructure.reservation_db_model import ReservationDBModel
+from modules.reservation.infrastructure.reservation_view_db_model import ReservationViewDB
 from modules.restaurant.infrastructure.table_db_model import TableDBModel
 from modules.restaurant.infrastructure.restaurant_db_model import RestaurantDBModel
 
@@ -11,13 +11,14 @@ class DashboardService:
         self.db = db
 
     def get_reservations_summary(self) -> Dict[str, Dict[str, int]]:
-        result = self.db.exec(select(ReservationDBModel)).all()
+        # Solo la columna necesaria, desde el modelo de lectura
+        result = self.db.exec(select(ReservationViewDB.start_time)).all()
         daily = defaultdict(int)
         weekly = defaultdict(int)
 
-        for r in result:
-            date_str = r.start_time.date().isoformat()
-            week_str = f"{r.start_time.year}-W{r.start_time.isocalendar()[1]}"
+        for start_time in result:
+            date_str = start_time.date().isoformat()
+            week_str = f"{start_time.year}-W{start_time.isocalendar()[1]}"
             daily[date_str] += 1
             weekly[week_str] += 1
 
@@ -36,34 +37,24 @@ class DashboardService:
 
     def get_occupancy_percentage(self) -> List[Dict[str, object]]:
         restaurants = self.db.exec(select(RestaurantDBModel)).all()
-        data = []
 
-        for rest in restaurants:
-            # Total de mesas del restaurante
-            total_tables_result = self.db.exec(
-                select(func.count()).select_from(TableDBModel).where(TableDBModel.restaurant_id == rest.id)
-            ).first()
-            if isinstance(total_tables_result, (tuple, list)):
-                total_tables = total_tables_result[0]
-            else:
-                total_tables = total_tables_result or 0
+        # Total de mesas por restaurante (una consulta agrupada)
+        total_tables = dict(self.db.exec(
+            select(TableDBModel.restaurant_id, func.count()).group_by(TableDBModel.restaurant_id)
+        ).all())
 
-            # Mesas reservadas (únicas)
-            reserved_tables_result = self.db.exec(
-                select(func.count(func.distinct(ReservationDBModel.table_id))).where(
-                    ReservationDBModel.start_time >= datetime.now(),
-                    ReservationDBModel.table_id.in_(
-                        select(TableDBModel.id).where(TableDBModel.restaurant_id == rest.id)
-                    )
-                )
-            ).first()
-            if isinstance(reserved_tables_result, (tuple, list)):
-                reserved_tables = reserved_tables_result[0]
-            else:
-                reserved_tables = reserved_tables_result or 0
+        # Mesas reservadas (únicas) por restaurante: reservation_view ya trae restaurant_id, sin join
+        reserved_tables = dict(self.db.exec(
+            select(ReservationViewDB.restaurant_id, func.count(func.distinct(ReservationViewDB.table_id)))
+            .where(ReservationViewDB.start_time >= datetime.now())
+            .group_by(ReservationViewDB.restaurant_id)
+        ).all())
 
+        data = []
+        for rest in restaurants:
+            total = total_tables.get(rest.id, 0)
             # Calcular ocupación solo si hay mesas
-            occupancy = (reserved_tables / total_tables * 100) if total_tables > 0 else 0.0
+            occupancy = (reserved_tables.get(rest.id, 0) / total * 100) if total > 0 else 0.0
 
             data.append({
                 "restaurant_id": str(rest.id),
@@ -72,4 +63,3 @@ class DashboardService:
             })
 
         return data
-
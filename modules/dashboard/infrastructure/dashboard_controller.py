@@ -4,6 +4,7 @@ from modules.core.db_connection import get_db
 from modules.dashboard.application.dashboard_services import DashboardService
 from modules.auth.infrastructure.auth_controller import get_current_user
 from modules.auth.domain.user import UserRole
+from modules.reservation.infrastructure.reservation_sweeper import reservation_sweeper, SweeperMetrics
 
 router = APIRouter()
 
@@ -39,4 +40,12 @@ def get_ocupacion_por_restaurante(
         return service.get_occupancy_percentage()
     except Exception as e:
         # Aquí verás el mensaje de error real
-        raise HTTPException(status_code=500, detail=f"Dashboard error: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Dashboard error: {e}")
+
+@router.get("/mantenimiento", response_model=SweeperMetrics)
+def get_metricas_barrido_reservas(
+    current_user = Security(get_current_user, scopes=["admin:dashboard"])
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Unauthorized")
+    return reservation_sweeper.metrics
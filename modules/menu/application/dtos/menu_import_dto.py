@@ -0,0 +1,30 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+
+# Errores que se devuelven en el detalle; el resto solo se cuenta en `invalid`
+MAX_REPORTED_ERRORS = 100
+
+
+class MenuItemImportDto(BaseModel):
+    """Una fila del archivo de importación (las columnas extra, como id, se ignoran)."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    name: str = Field(..., min_length=1)
+    description: str
+    category: str = Field(..., min_length=1)
+    price: float = Field(..., ge=0)
+    available_stock: int = Field(..., ge=0)
+    image_url: Optional[str] = None
+
+
+class MenuImportErrorDto(BaseModel):
+    line: int
+    detail: str
+
+
+class MenuImportResultDto(BaseModel):
+    imported: int = 0
+    # Nombres repetidos (sin distinguir mayúsculas) en el archivo o ya presentes en el menú
+    skipped_duplicates: int = 0
+    invalid: int = 0
+    errors: List[MenuImportErrorDto] = []
@@ -1,8 +1,11 @@
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from uuid import UUID
 
+# Más sub-contadores reparten mejor los bloqueos pero vuelven más cara la suma al leer
+MAX_STOCK_SHARDS = 32
+
 
 class MenuItemModifyDto(BaseModel):
     name: Optional[str] = None 
@@ -21,3 +24,8 @@ class MenuItemRegisterDto(BaseModel):
     available_stock: int
     restaurant_id: UUID
     image_url: Optional[str] = None # Optional, can be set later if needed
+
+
+class MenuItemStockShardsDto(BaseModel):
+    # 0 vuelve el stock a la columna available_stock
+    shards: int = Field(..., ge=0, le=MAX_STOCK_SHARDS)
@@ -0,0 +1,111 @@
+"""
+Formatos de importación y exportación masiva del menú (CSV y NDJSON).
+
+Todo trabaja sobre iteradores: el cuerpo de la petición se decodifica y se parsea fila por fila,
+y la exportación escribe por lotes, así la memoria no depende del tamaño del archivo.
+"""
+import codecs
+import csv
+import io
+import json
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from modules.menu.domain.menu_item import MenuItem
+
+CSV_MEDIA_TYPE = "text/csv"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+FORMATS = {CSV_MEDIA_TYPE: "csv", NDJSON_MEDIA_TYPE: "ndjson", "application/ndjson": "ndjson"}
+
+REQUIRED_COLUMNS = ["name", "description", "category", "price", "available_stock"]
+EXPORT_COLUMNS = ["id"] + REQUIRED_COLUMNS + ["image_url"]
+EXPORT_BATCH_SIZE = 1000
+
+
+class RawRow(NamedTuple):
+    line: int
+    fields: Optional[dict]
+    error: Optional[str] = None
+
+
+def format_for(content_type: Optional[str]) -> Optional[str]:
+    """"csv" o "ndjson" según el Content-Type (sin parámetros como charset), o None si no se soporta."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return FORMATS.get(media_type)
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Parte los bytes en líneas (con su fin de línea) sin importar dónde corta cada chunk."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        # La última puede estar incompleta: espera al próximo chunk
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def iter_rows(lines: Iterable[str], fmt: str) -> Iterator[RawRow]:
+    return _iter_csv(lines) if fmt == "csv" else _iter_ndjson(lines)
+
+
+def _iter_csv(lines: Iterable[str]) -> Iterator[RawRow]:
+    # csv.reader consume las líneas de a una y une los campos entre comillas que traen saltos de línea
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [column.strip().lower() for column in header]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"Missing CSV columns: {', '.join(missing)}.")
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        if len(values) != len(header):
+            yield RawRow(reader.line_num, None, f"Expected {len(header)} columns, got {len(values)}.")
+            continue
+        fields = dict(zip(header, values))
+        if not fields.get("image_url"):
+            fields["image_url"] = None
+        yield RawRow(reader.line_num, fields)
+
+
+def _iter_ndjson(lines: Iterable[str]) -> Iterator[RawRow]:
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            fields = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield RawRow(number, None, f"Invalid JSON: {e.msg}.")
+            continue
+        if not isinstance(fields, dict):
+            yield RawRow(number, None, "Each line must be a JSON object.")
+            continue
+        yield RawRow(number, fields)
+
+
+def serialize(items: Iterable[MenuItem], fmt: str) -> Iterator[str]:
+    """Escribe los items en CSV (con encabezado) o NDJSON, un trozo de texto por lote."""
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    for item in items:
+        if fmt == "csv":
+            writer.writerow([getattr(item, column) if getattr(item, column) is not None else ""
+                             for column in EXPORT_COLUMNS])
+        else:
+            buffer.write(item.model_dump_json(include=set(EXPORT_COLUMNS)) + "\n")
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -1,12 +1,29 @@
 from modules.menu.domain.menu_repository_interface import MenuRepositoryInterface
 from modules.menu.domain.menu_item import MenuItem
+from modules.menu.domain.menu_exceptions import MenuItemNameConflictError
 from modules.menu.domain.pre_order_item import PreOrderItem
-from typing import Optional, List
-from uuid import UUID
+from modules.menu.application.dtos.menu_import_dto import (
+    MAX_REPORTED_ERRORS, MenuImportErrorDto, MenuImportResultDto, MenuItemImportDto
+)
+from modules.menu.application.menu_bulk import RawRow
+from modules.restaurant.domain.restaurant_repository_interface import IRestaurantRepository
+from modules.core.unit_of_work import UnitOfWork
+from collections import Counter
+from contextlib import nullcontext
+from pydantic import ValidationError
+from typing import Iterable, Iterator, Optional, List
+from uuid import UUID, uuid4
+
+# Filas por INSERT (o COPY) durante la importación masiva
+IMPORT_BATCH_SIZE = 1000
 
 class MenuServices:
-    def __init__(self, menu_repo: MenuRepositoryInterface):
+    def __init__(self, menu_repo: MenuRepositoryInterface, restaurant_repo: Optional[IRestaurantRepository] = None,
+                 uow: Optional[UnitOfWork] = None):
         self.menu_repo = menu_repo
+        self.restaurant_repo = restaurant_repo
+        # Sin unidad de trabajo (p. ej. en tests) cada repositorio confirma por su cuenta
+        self.uow = uow or nullcontext()
 
 # Caso de uso: Obtener menu item por categoría
     def get_menu_item_by_category(self, category: str) -> Optional[MenuItem]:
@@ -28,21 +45,24 @@ class MenuServices:
     def create_pre_order_items(self, items: List[PreOrderItem]) -> List[PreOrderItem]:
         if not items:
             raise ValueError("Items are required")
-        return self.menu_repo.create_pre_order_items(items)
+        from fastapi import HTTPException
+        if any(item.quantity <= 0 for item in items):
+            raise HTTPException(status_code=400, detail="Quantity must be greater than zero.")
+        quantities = Counter()
+        for item in items:
+            quantities[item.menu_item_id] += item.quantity
+        # El stock se descuenta en la misma transacción que las pre-órdenes: al cancelar la reserva
+        # se devuelve lo pre-ordenado, así que nada puede entrar sin haberlo descontado antes
+        with self.uow:
+            if not self.menu_repo.reserve_stock(dict(quantities)):
+                raise HTTPException(status_code=409, detail="Some pre-ordered dishes are out of stock.")
+            return self.menu_repo.create_pre_order_items(items)
 
 # Caso de uso: Crear menu item
     def create_menu_item(self, name: str, description: str, category: str, price: float, available_stock: int, restaurant_id: UUID, image_url: Optional[str] = None) -> MenuItem:
-        from uuid import uuid4
         if not name or not description or not category or price is None or available_stock is None or not restaurant_id:
             raise ValueError("All fields except image_url are required")
 
-        # El nombre debe ser único dentro del mismo restaurante
-        menu_items = self.menu_repo.get_all_by_restaurant(restaurant_id)
-        for item in menu_items:
-            if item.name.lower() == name.lower():
-                from fastapi import HTTPException
-                raise HTTPException(status_code=409, detail="Menu item with this name already exists in this restaurant.")
-
         menu_item = MenuItem(
             id=uuid4(),
             name=name,
@@ -53,15 +73,20 @@ class MenuServices:
             restaurant_id=restaurant_id,
             image_url=image_url
         )
-        return self.menu_repo.create_menu_item(menu_item)
+        # El nombre debe ser único dentro del mismo restaurante: lo valida el índice único de la base
+        try:
+            return self.menu_repo.create_menu_item(menu_item)
+        except MenuItemNameConflictError:
+            from fastapi import HTTPException
+            raise HTTPException(status_code=409, detail="Menu item with this name already exists in this restaurant.")
 
 # Caso de uso: Modificar menu item
     def modify_menu_item(self, menu_item_id: str, name: Optional[str] = None, description: Optional[str] = None, category: Optional[str] = None, price: Optional[float] = None, available_stock: Optional[int] = None, image_url: Optional[str] = None) -> MenuItem:
         if not menu_item_id:
             raise ValueError("Menu item ID is required")
         existing_item = self.menu_repo.get_menu_item_by_id(menu_item_id)
+        from fastapi import HTTPException
         if not existing_item:
-            from fastapi import HTTPException
             raise HTTPException(status_code=404, detail="Menu item not found.")
 
         # Solo actualiza los campos que no son None
@@ -75,9 +100,78 @@ class MenuServices:
         }
         updated_item = MenuItem(
             id=existing_item.id,
+            restaurant_id=existing_item.restaurant_id,
             **update_data
         )
-        return self.menu_repo.modify_menu_item(updated_item)
+        try:
+            # El stock solo se escribe si se envió: el leído arriba puede estar desactualizado
+            return self.menu_repo.modify_menu_item(updated_item, update_stock=available_stock is not None)
+        except MenuItemNameConflictError:
+            raise HTTPException(status_code=409, detail="Menu item with this name already exists in this restaurant.")
+
+# Caso de uso: Fragmentar el stock de un menu item muy pedido en sub-contadores
+    def set_stock_shards(self, menu_item_id: UUID, shards: int) -> MenuItem:
+        if not menu_item_id:
+            raise ValueError("Menu item ID is required")
+        menu_item = self.menu_repo.set_stock_shards(menu_item_id, shards)
+        if not menu_item:
+            from fastapi import HTTPException
+            raise HTTPException(status_code=404, detail="Menu item not found.")
+        return menu_item
+
+# Caso de uso: Importar el menú de un restaurante desde un archivo (CSV o NDJSON)
+    def import_menu_items(self, restaurant_id: UUID, rows: Iterable[RawRow]) -> MenuImportResultDto:
+        """
+        Valida las filas a medida que llegan y escribe por lotes de IMPORT_BATCH_SIZE. Los nombres
+        repetidos (sin distinguir mayúsculas, contra el archivo, contra el menú actual o creados
+        por otro proceso durante la importación) los descarta el índice único de la base, con su
+        propio lower(), y se cuentan como repetidos. Cada lote se confirma por separado: si la
+        importación se corta, volver a enviar el mismo archivo solo agrega lo que falta.
+        """
+        from fastapi import HTTPException
+        if self.restaurant_repo and not self.restaurant_repo.get_by_id(restaurant_id):
+            raise HTTPException(status_code=404, detail="Restaurant not found.")
+
+        result = MenuImportResultDto()
+        batch: List[MenuItem] = []
+
+        def flush(batch: List[MenuItem]) -> None:
+            inserted = self.menu_repo.bulk_create_menu_items(batch)
+            result.imported += inserted
+            result.skipped_duplicates += len(batch) - inserted
+
+        def reject(line: int, detail: str) -> None:
+            result.invalid += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                result.errors.append(MenuImportErrorDto(line=line, detail=detail))
+
+        try:
+            for row in rows:
+                if row.error:
+                    reject(row.line, row.error)
+                    continue
+                try:
+                    dto = MenuItemImportDto.model_validate(row.fields)
+                except ValidationError as e:
+                    error = e.errors()[0]
+                    reject(row.line, f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}")
+                    continue
+                batch.append(MenuItem(id=uuid4(), restaurant_id=restaurant_id, **dto.model_dump()))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    flush(batch)
+                    batch = []
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="The file must be UTF-8 encoded.")
+        except ValueError as e:
+            # Archivo mal formado (p. ej. faltan columnas en el encabezado CSV)
+            raise HTTPException(status_code=400, detail=str(e))
+        if batch:
+            flush(batch)
+        return result
+
+# Caso de uso: Exportar el menú de un restaurante
+    def export_menu_items(self, restaurant_id: UUID) -> Iterator[MenuItem]:
+        return self.menu_repo.iter_by_restaurant(restaurant_id)
 
 # Caso de uso: Eliminar menu item
     def delete_menu_item(self, menu_item_id: str) -> None:
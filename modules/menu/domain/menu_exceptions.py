@@ -0,0 +1,3 @@
+class MenuItemNameConflictError(Exception):
+    """La base de datos rechazó el nombre: el restaurante ya tiene un plato con ese nombre (sin distinguir mayúsculas)."""
+    pass
@@ -11,3 +11,5 @@ class MenuItem(BaseModel):
     available_stock: int
     image_url: Optional[str]
     restaurant_id: UUID
+    # 0: el stock vive en available_stock; N > 0: repartido en N sub-contadores
+    stock_shards: int = 0
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Set
 from uuid import UUID
 from modules.menu.domain.menu_item import MenuItem
 from modules.menu.domain.pre_order_item import PreOrderItem
@@ -11,6 +11,46 @@ class MenuRepositoryInterface(ABC):
     def get_all_by_restaurant(self, restaurant_id: UUID) -> List[MenuItem]:
         """Obtiene todos los menu items de un restaurante"""
         pass
+
+    @abstractmethod
+    def iter_by_restaurant(self, restaurant_id: UUID, batch_size: int = 1000) -> Iterator[MenuItem]:
+        """Recorre el menú de un restaurante por lotes, sin cargarlo completo en memoria"""
+        pass
+
+    @abstractmethod
+    def bulk_create_menu_items(self, menu_items: List[MenuItem]) -> int:
+        """Inserta varios menu items en una sola operación; devuelve cuántos se insertaron (los nombres ya existentes o repetidos en el lote se omiten)"""
+        pass
+
+    @abstractmethod
+    def get_available_dish_ids(self, restaurant_id: UUID, dish_ids: List[UUID]) -> Set[UUID]:
+        """De dish_ids, devuelve los que son del restaurante y tienen stock"""
+        pass
+
+    @abstractmethod
+    def reserve_stock(self, quantities: Dict[UUID, int]) -> bool:
+        """Descuenta las cantidades {plato: cantidad} solo si alcanza el stock de todos; si no, no descuenta nada"""
+        pass
+
+    @abstractmethod
+    def restore_stock(self, quantities: Dict[UUID, int]) -> None:
+        """Devuelve al stock las cantidades {plato: cantidad}"""
+        pass
+
+    @abstractmethod
+    def set_stock_shards(self, menu_item_id: UUID, shards: int) -> Optional[MenuItem]:
+        """Reparte el stock del plato en `shards` sub-contadores (0 lo vuelve a una sola columna)"""
+        pass
+
+    @abstractmethod
+    def compact_stock_shards(self) -> int:
+        """Nivela los sub-contadores de los platos fragmentados; devuelve cuántos platos procesó"""
+        pass
+
+    @abstractmethod
+    def get_pre_order_quantities(self, reservation_ids: List[UUID]) -> Dict[UUID, int]:
+        """Cantidad pre-ordenada de cada plato, sumada sobre las reservas dadas"""
+        pass
     
     @abstractmethod
     def get_menu_item_by_category(self, category: str) -> Optional[MenuItem]:
@@ -18,8 +58,8 @@ class MenuRepositoryInterface(ABC):
         pass
 
     @abstractmethod
-    def get_menu_item_by_name(self, name: str) -> Optional[MenuItem]:
-        """Obtiene un menu item por su nombre"""
+    def get_menu_item_by_name(self, restaurant_id: UUID, name: str) -> Optional[MenuItem]:
+        """Obtiene un menu item de un restaurante por su nombre, sin distinguir mayúsculas"""
         pass
 
     @abstractmethod
@@ -43,8 +83,8 @@ class MenuRepositoryInterface(ABC):
         pass
 
     @abstractmethod
-    def modify_menu_item(self, menu_item: MenuItem) -> MenuItem:
-        """Actualiza un menu item"""
+    def modify_menu_item(self, menu_item: MenuItem, update_stock: bool = True) -> MenuItem:
+        """Actualiza un menu item; con update_stock=False deja el stock como está en la base"""
         pass
 
     @abstractmethod
@@ -53,9 +93,6 @@ class MenuRepositoryInterface(ABC):
         pass
     
     @abstractmethod
-    def save_pre_order_item(self, pre_order_item):
-        """
-        Guarda un PreOrderItemDB en la base de datos.
-        Debe ser implementado por la clase concreta del repositorio.
-        """
-        raise NotImplementedError
\ No newline at end of file
+    def bulk_save_pre_order_items(self, items: List[PreOrderItem]) -> None:
+        """Inserta varios pre-order items con un único INSERT multi-fila (sin refrescarlos)"""
+        pass
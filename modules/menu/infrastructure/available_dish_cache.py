@@ -0,0 +1,78 @@
+import os
+import threading
+import time as _time
+from typing import Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+
+class AvailableDishCache:
+    """
+    Caché en proceso, por restaurante, de qué platos tienen stock (available_stock > 0).
+
+    Guarda lo que ya se preguntó: los ids disponibles y los que no lo están (no existen, son
+    de otro restaurante o no tienen stock), así una validación repetida no vuelve a la base.
+    Cada restaurante vence a los ttl_seconds; las escrituras del menú en este proceso lo
+    invalidan enseguida y las de otros workers se ven al vencer el TTL.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, clock=_time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        # restaurant_id -> (vence, disponibles, no disponibles)
+        self._entries: Dict[UUID, Tuple[float, Set[UUID], Set[UUID]]] = {}
+
+    def lookup(self, restaurant_id: UUID, dish_ids: Iterable[UUID]) -> Tuple[Set[UUID], Set[UUID]]:
+        """Devuelve (disponibles, desconocidos) entre dish_ids; los desconocidos hay que consultarlos."""
+        dish_ids = set(dish_ids)
+        with self._lock:
+            entry = self._fresh(restaurant_id)
+            if entry is None:
+                return set(), dish_ids
+            _, available, unavailable = entry
+            return dish_ids & available, dish_ids - available - unavailable
+
+    def store(self, restaurant_id: UUID, asked: Iterable[UUID], available: Iterable[UUID]) -> None:
+        """Registra el resultado de una consulta: de `asked`, solo `available` tiene stock."""
+        available = set(available)
+        with self._lock:
+            entry = self._fresh(restaurant_id)
+            if entry is None:
+                entry = self._entries[restaurant_id] = (self._clock() + self.ttl_seconds, set(), set())
+            _, known_available, known_unavailable = entry
+            known_available |= available
+            known_unavailable |= set(asked) - available
+
+    def discard(self, dish_ids: Iterable[UUID]) -> None:
+        """Olvida platos puntuales (su stock cambió) en todos los restaurantes: se vuelven a consultar."""
+        dish_ids = set(dish_ids)
+        if not dish_ids:
+            return
+        with self._lock:
+            for _, available, unavailable in self._entries.values():
+                available -= dish_ids
+                unavailable -= dish_ids
+
+    def invalidate(self, restaurant_id: Optional[UUID] = None) -> None:
+        """Olvida un restaurante (o todos si no se indica)."""
+        with self._lock:
+            if restaurant_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(restaurant_id, None)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def _fresh(self, restaurant_id: UUID):
+        entry = self._entries.get(restaurant_id)
+        if entry is not None and entry[0] <= self._clock():
+            del self._entries[restaurant_id]
+            return None
+        return entry
+
+
+# Instancia compartida por todos los repositorios del proceso
+available_dish_cache = AvailableDishCache(
+    ttl_seconds=float(os.getenv("AVAILABLE_DISH_CACHE_TTL_SECONDS", "30"))
+)
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Security
+import anyio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Security
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 from modules.menu.domain.menu_repository_interface import MenuRepositoryInterface
 from modules.menu.infrastructure.menu_repository import MenuRepository
 from modules.menu.domain.menu_item import MenuItem
 from modules.menu.domain.pre_order_item import PreOrderItem
 from modules.core.db_connection import get_db
+from modules.core.unit_of_work import UnitOfWork
 from modules.auth.infrastructure.auth_controller import get_current_user
 from modules.auth.domain.user import UserRole
-from typing import List
+from typing import Iterator, List, Optional
+from uuid import UUID
 
 router = APIRouter()
 
@@ -55,17 +60,24 @@ async def get_pre_order_items_by_reservation(
 @router.post("/pre-order-item")
 async def create_pre_order_items(
     items: List[PreOrderItem],
-    menu_repo: MenuRepositoryInterface = Depends(get_menu_repository)
+    db: Session = Depends(get_db)
 ):
-    created_items = menu_repo.create_pre_order_items(items)
+    # Pasa por el servicio: descuenta el stock de los platos en la misma transacción
+    menu_services = MenuServices(MenuRepository(db), uow=UnitOfWork(db))
+    created_items = menu_services.create_pre_order_items(items)
     return {
         "message": "Pre-order items created successfully", 
         "items": created_items
     }
 
 # Caso de uso: Crear menu item
-from modules.menu.application.dtos.menu_item_dto import MenuItemRegisterDto
+from modules.menu.application.dtos.menu_item_dto import MenuItemRegisterDto, MenuItemStockShardsDto
 from modules.menu.application.menu_services import MenuServices
+from modules.menu.application.dtos.menu_import_dto import MenuImportResultDto
+from modules.menu.application.menu_bulk import (
+    CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE, format_for, iter_lines, iter_rows, serialize
+)
+from modules.restaurant.infrastructure.restaurant_repository import RestaurantRepository
 
 @router.post("/menu-item")
 async def create_menu_item(
@@ -103,6 +115,22 @@ async def modify_menu_item(
         "menu_item": modified_menu_item
     }
 
+# Caso de uso: Fragmentar el stock de un menu item (solo admin)
+@router.put("/menu-item/{menu_item_id}/stock-shards")
+async def set_menu_item_stock_shards(
+    menu_item_id: UUID,
+    dto: MenuItemStockShardsDto,
+    db: Session = Depends(get_db),
+    current_user = Security(get_current_user, scopes=["admin:menu"])
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can modify menu items.")
+    menu_item = MenuServices(MenuRepository(db)).set_stock_shards(menu_item_id, dto.shards)
+    return {
+        "message": "Menu item stock sharding updated successfully",
+        "menu_item": menu_item
+    }
+
 # Caso de uso: Eliminar menu item
 @router.delete("/menu-item/{menu_item_id}")
 async def delete_menu_item(
@@ -114,3 +142,61 @@ async def delete_menu_item(
         "message": "Menu item deleted successfully"
     }
 
+def body_chunks(request: Request) -> Iterator[bytes]:
+    """Cuerpo de la petición trozo a trozo, para consumirlo desde un hilo del threadpool."""
+    stream = request.stream()
+
+    async def next_chunk() -> Optional[bytes]:
+        try:
+            return await stream.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    while (chunk := anyio.from_thread.run(next_chunk)) is not None:
+        if chunk:
+            yield chunk
+
+# Caso de uso: Importar el menú de un restaurante (CSV o NDJSON en el cuerpo, solo admin)
+@router.post("/restaurant/{restaurant_id}/menu-items/import", response_model=MenuImportResultDto)
+async def import_menu_items(
+    restaurant_id: UUID,
+    request: Request,
+    content_type: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user = Security(get_current_user, scopes=["admin:menu"])
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can import menu items.")
+    fmt = format_for(content_type)
+    if fmt is None:
+        raise HTTPException(status_code=415, detail=f"Send the menu as {CSV_MEDIA_TYPE} or {NDJSON_MEDIA_TYPE}.")
+    service = MenuServices(MenuRepository(db), RestaurantRepository(db))
+    rows = iter_rows(iter_lines(body_chunks(request)), fmt)
+    # Parseo y escrituras son síncronos: corren en un hilo que va pidiendo el cuerpo a medida que llega
+    return await run_in_threadpool(service.import_menu_items, restaurant_id, rows)
+
+# Caso de uso: Exportar el menú de un restaurante (solo admin)
+@router.get("/restaurant/{restaurant_id}/menu-items/export")
+def export_menu_items(
+    restaurant_id: UUID,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+    current_user = Security(get_current_user, scopes=["admin:menu"])
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can export menu items.")
+    if not RestaurantRepository(db).get_by_id(restaurant_id):
+        raise HTTPException(status_code=404, detail="Restaurant not found.")
+    bind = db.get_bind()
+
+    # Las dependencias con yield (get_db) se cierran antes de enviar el cuerpo,
+    # así que el stream abre su propia sesión sobre el mismo motor
+    def body():
+        with Session(bind) as stream_db:
+            yield from serialize(MenuServices(MenuRepository(stream_db)).export_menu_items(restaurant_id), format)
+
+    return StreamingResponse(
+        body(),
+        media_type=CSV_MEDIA_TYPE if format == "csv" else NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="menu-{restaurant_id}.{format}"'},
+    )
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, func
 from uuid import UUID, uuid4
 from modules.menu.domain.menu_item import MenuItem
 from typing import Optional
@@ -15,10 +16,15 @@ class MenuItemDB(SQLModel, MenuItem, table=True):
     available_stock: int
     restaurant_id: UUID = Field(foreign_key="restaurantdbmodel.id", index=True)
     image_url: Optional[str]
+    stock_shards: int = Field(default=0)
 
     # Relación inversa con PreOrderItemDB
     pre_orders: list["PreOrderItemDB"] = Relationship(back_populates="menu_item")
 
+# Nombre único por restaurante sin distinguir mayúsculas; también sirve las búsquedas por nombre
+MENU_ITEM_NAME_INDEX = "uq_menu_items_restaurant_lower_name"
+Index(MENU_ITEM_NAME_INDEX, MenuItemDB.restaurant_id, func.lower(MenuItemDB.name), unique=True)
+
 # Convertir de MenuItemDB (infraestructura) a MenuItem (dominio)
 def to_domain(menu_item_db: MenuItemDB) -> MenuItem:
     return MenuItem(
@@ -29,7 +35,8 @@ def to_domain(menu_item_db: MenuItemDB) -> MenuItem:
         price=menu_item_db.price,
         available_stock=menu_item_db.available_stock,
         restaurant_id=menu_item_db.restaurant_id,
-        image_url=menu_item_db.image_url
+        image_url=menu_item_db.image_url,
+        stock_shards=menu_item_db.stock_shards
     )
 
 # Convertir de MenuItem (dominio) a MenuItemDB (infraestructura)
@@ -41,5 +48,6 @@ def to_db(menu_item: MenuItem) -> MenuItemDB:
         price=menu_item.price,
         available_stock=menu_item.available_stock,
         restaurant_id=menu_item.restaurant_id,
-        image_url=menu_item.image_url
+        image_url=menu_item.image_url,
+        stock_shards=menu_item.stock_shards
     )
\ No newline at end of file
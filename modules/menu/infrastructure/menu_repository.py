@@ -1,18 +1,48 @@
-from sqlmodel import Session, select
-from typing import Optional, List
+import csv
+import io
+import random
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, insert, update, delete, func, case
+from typing import Dict, Iterator, Optional, List, Set, Tuple
 from uuid import UUID
 
 from modules.menu.domain.menu_item import MenuItem
+from modules.menu.domain.menu_exceptions import MenuItemNameConflictError
+from modules.menu.infrastructure.available_dish_cache import AvailableDishCache, available_dish_cache
 from modules.menu.domain.menu_repository_interface import MenuRepositoryInterface   
-from modules.menu.infrastructure.menu_item_db_model import MenuItemDB, to_db, to_domain
+from modules.menu.infrastructure.menu_item_db_model import MENU_ITEM_NAME_INDEX, MenuItemDB, to_db, to_domain
 from modules.menu.infrastructure.pre_order_item_db_model import PreOrderItemDB, to_db as to_db_pre_order, to_domain as to_domain_pre_order
+from modules.menu.infrastructure.stock_shard_db_model import StockShardDB
 from modules.menu.domain.pre_order_item import PreOrderItem
+from modules.core.unit_of_work import commit, after_commit
+from modules.reservation.infrastructure import reservation_view
+
+
+def _is_duplicate_name(error: Exception) -> bool:
+    # Postgres nombra el índice en el mensaje; SQLite dice "UNIQUE constraint failed: index '...'"
+    return MENU_ITEM_NAME_INDEX in str(getattr(error, "orig", error))
+
+
+def split_stock(total: int, shards: int) -> List[int]:
+    """Reparte `total` en `shards` sub-contadores lo más parejos posible."""
+    return [total // shards + (1 if i < total % shards else 0) for i in range(shards)]
+
+def stock_expression():
+    """Stock de cada plato: la columna, o la suma de sus sub-contadores si está fragmentado."""
+    shard_total = (
+        select(func.coalesce(func.sum(StockShardDB.stock), 0))
+        .where(StockShardDB.menu_item_id == MenuItemDB.id)
+        .scalar_subquery()
+    )
+    return case((MenuItemDB.stock_shards > 0, shard_total), else_=MenuItemDB.available_stock)
 
 
 class MenuRepository(MenuRepositoryInterface):
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[AvailableDishCache] = None):
         self.db = db
+        self.cache = cache if cache is not None else available_dish_cache
 
     def get_menu_item_by_category(self, category: str) -> Optional[MenuItem]:
         statement = select(MenuItemDB).where(MenuItemDB.category == category)
@@ -20,9 +50,13 @@ class MenuRepository(MenuRepositoryInterface):
         return result
 
     def get_available_menu_item(self) -> List[MenuItem]:
-        statement = select(MenuItemDB).where(MenuItemDB.available_stock > 0)
-        result = self.db.exec(statement).all()
-        return result
+        return self._read(stock_expression() > 0)
+
+    def _read(self, *conditions) -> List[MenuItem]:
+        # available_stock de los platos fragmentados es la suma de los sub-contadores al momento de leer
+        statement = select(MenuItemDB, stock_expression()).where(*conditions)
+        return [to_domain(item).model_copy(update={"available_stock": stock})
+                for item, stock in self.db.exec(statement).all()]
 
     def get_pre_order_items_by_reservation(self, reservation_id: str) -> List[PreOrderItem]:
         statement = select(PreOrderItemDB).where(PreOrderItemDB.reservation_id == reservation_id)
@@ -35,50 +69,338 @@ class MenuRepository(MenuRepositoryInterface):
             db_item = to_db_pre_order(item)
             self.db.add(db_item)
             db_items.append(db_item)
-        self.db.commit()
-        for db_item in db_items:
-            self.db.refresh(db_item)
+        self.db.flush()
+        reservation_view.refresh_pre_order_counts(self.db, [item.reservation_id for item in items])
+        if commit(self.db):
+            for db_item in db_items:
+                self.db.refresh(db_item)
         return [to_domain_pre_order(db_item) for db_item in db_items]
 
+    def bulk_save_pre_order_items(self, items: List[PreOrderItem]) -> None:
+        if not items:
+            return
+        self.db.exec(insert(PreOrderItemDB), params=[item.model_dump() for item in items])
+        reservation_view.refresh_pre_order_counts(self.db, [item.reservation_id for item in items])
+        commit(self.db)
+
     def get_all_by_restaurant(self, restaurant_id: UUID) -> List[MenuItem]:
-        statement = select(MenuItemDB).where(MenuItemDB.restaurant_id == restaurant_id)
-        results = self.db.exec(statement).all()
-        return [to_domain(r) for r in results]
+        return self._read(MenuItemDB.restaurant_id == restaurant_id)
 
-    def get_menu_item_by_name(self, name: str) -> Optional[MenuItem]:
-        statement = select(MenuItemDB).where(MenuItemDB.name == name)
-        result = self.db.exec(statement).first()
-        return to_domain(result) if result else None
+    def iter_by_restaurant(self, restaurant_id: UUID, batch_size: int = 1000) -> Iterator[MenuItem]:
+        # yield_per usa un cursor del servidor y procesa las filas por lotes
+        statement = (
+            select(MenuItemDB, stock_expression())
+            .where(MenuItemDB.restaurant_id == restaurant_id)
+            .order_by(MenuItemDB.name, MenuItemDB.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for item, stock in self.db.exec(statement):
+            yield to_domain(item).model_copy(update={"available_stock": stock})
+
+    def bulk_create_menu_items(self, menu_items: List[MenuItem]) -> int:
+        if not menu_items:
+            return 0
+        dialect = self.db.get_bind().dialect
+        inserted = None
+        if dialect.name == "postgresql":
+            # COPY dentro de un savepoint: si otro proceso creó uno de los nombres mientras tanto,
+            # se revierte solo el COPY y el lote se repite con INSERT ... ON CONFLICT DO NOTHING
+            try:
+                with self.db.begin_nested():
+                    self._copy_menu_items(menu_items)
+                inserted = len(menu_items)
+            except dialect.dbapi.IntegrityError as e:
+                if not _is_duplicate_name(e):
+                    raise
+        if inserted is None:
+            # INSERT de Core (executemany): sin el paso por el ORM por cada fila. Los nombres que
+            # ya existen, o que se repiten dentro del lote, los descarta el índice único
+            # (restaurant_id, lower(name)); RETURNING devuelve solo las filas que sí entraron
+            dialect_insert = postgresql.insert if dialect.name == "postgresql" else sqlite.insert
+            statement = (
+                dialect_insert(MenuItemDB.__table__)
+                .on_conflict_do_nothing()
+                .returning(MenuItemDB.__table__.c.id)
+            )
+            inserted = len(self.db.exec(statement, params=[item.model_dump() for item in menu_items]).all())
+        commit(self.db)
+        restaurant_ids = {item.restaurant_id for item in menu_items}
+
+        def invalidate():
+            for restaurant_id in restaurant_ids:
+                self.cache.invalidate(restaurant_id)
+        after_commit(self.db, invalidate)
+        return inserted
+
+    def _copy_menu_items(self, menu_items: List[MenuItem]) -> None:
+        # COPY ... FROM STDIN en la misma transacción de la sesión: mucho más rápido que un INSERT
+        # de muchas filas. Con QUOTE_ALL un "" es texto vacío, salvo image_url (FORCE_NULL).
+        columns = ["id", "name", "description", "category", "price", "available_stock",
+                   "restaurant_id", "image_url", "stock_shards"]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        for item in menu_items:
+            writer.writerow([getattr(item, column) if getattr(item, column) is not None else ""
+                             for column in columns])
+        buffer.seek(0)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {MenuItemDB.__tablename__} ({', '.join(columns)}) "
+                "FROM STDIN WITH (FORMAT csv, FORCE_NULL (image_url))",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+    def get_available_dish_ids(self, restaurant_id: UUID, dish_ids: List[UUID]) -> Set[UUID]:
+        available, unknown = self.cache.lookup(restaurant_id, dish_ids)
+        if unknown:
+            # Solo ids, solo los platos pedidos: un Index Scan sobre la PK
+            statement = select(MenuItemDB.id).where(
+                MenuItemDB.id.in_(unknown),
+                MenuItemDB.restaurant_id == restaurant_id,
+                stock_expression() > 0,
+            )
+            found = set(self.db.exec(statement).all())
+            self.cache.store(restaurant_id, unknown, found)
+            available |= found
+        return available
+
+    def reserve_stock(self, quantities: Dict[UUID, int]) -> bool:
+        if not quantities:
+            return True
+        sharded = self._shard_counts(quantities)
+        plain = {dish_id: quantity for dish_id, quantity in quantities.items() if dish_id not in sharded}
+        sold_out: Set[UUID] = set()
+
+        taken_plain = self._take_plain(plain, sold_out)
+        reserved = set(taken_plain)
+        taken_shards: List[Tuple[UUID, int, int]] = []
+        if len(reserved) == len(plain):
+            # Orden fijo entre platos para que dos pre-órdenes no se bloqueen mutuamente
+            for dish_id in sorted(sharded):
+                taken = self._take_from_shards(dish_id, sharded[dish_id], quantities[dish_id], sold_out)
+                if taken is None:
+                    break
+                taken_shards.extend(taken)
+                reserved.add(dish_id)
+
+        if len(reserved) < len(quantities):
+            # A algún plato no le alcanzó: se devuelve lo que sí se descontó
+            self._add_stock(taken_plain)
+            self._add_to_shards(taken_shards)
+            sold_out |= set(quantities) - reserved
+        commit(self.db)
+        after_commit(self.db, lambda: self.cache.discard(sold_out))
+        return len(reserved) == len(quantities)
+
+    def restore_stock(self, quantities: Dict[UUID, int]) -> None:
+        if not quantities:
+            return
+        sharded = self._shard_counts(quantities)
+        self._add_stock({dish_id: quantity for dish_id, quantity in quantities.items() if dish_id not in sharded})
+        self._add_to_shards([(dish_id, random.randrange(shards), quantities[dish_id])
+                             for dish_id, shards in sharded.items()])
+        commit(self.db)
+        after_commit(self.db, lambda: self.cache.discard(quantities))
+
+    def _shard_counts(self, dish_ids) -> Dict[UUID, int]:
+        statement = select(MenuItemDB.id, MenuItemDB.stock_shards).where(
+            MenuItemDB.id.in_(list(dish_ids)), MenuItemDB.stock_shards > 0
+        )
+        return dict(self.db.exec(statement).all())
+
+    def _take_plain(self, quantities: Dict[UUID, int], sold_out: Set[UUID]) -> Dict[UUID, int]:
+        if not quantities:
+            return {}
+        # Un solo UPDATE condicional para todos los platos: cada fila se bloquea y el WHERE se vuelve
+        # a evaluar sobre el valor confirmado, así dos pre-órdenes concurrentes no venden de más
+        requested = case(quantities, value=MenuItemDB.id)
+        stmt = (
+            update(MenuItemDB)
+            .where(MenuItemDB.id.in_(list(quantities)), MenuItemDB.available_stock >= requested)
+            .values(available_stock=MenuItemDB.available_stock - requested)
+            .returning(MenuItemDB)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        reserved = self.db.exec(stmt).scalars().all()
+        sold_out.update(dish.id for dish in reserved if dish.available_stock <= 0)
+        return {dish.id: quantities[dish.id] for dish in reserved}
+
+    def _take_from_shards(self, dish_id: UUID, shards: int, quantity: int,
+                          sold_out: Set[UUID]) -> Optional[List[Tuple[UUID, int, int]]]:
+        """Descuenta `quantity` de los sub-contadores del plato; devuelve [(plato, shard, cantidad)] o None."""
+        shard = random.randrange(shards)
+        hit = self.db.exec(
+            update(StockShardDB)
+            .where(StockShardDB.menu_item_id == dish_id, StockShardDB.shard == shard, StockShardDB.stock >= quantity)
+            .values(stock=StockShardDB.stock - quantity)
+            .returning(StockShardDB.shard)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if hit is not None:
+            return [(dish_id, shard, quantity)]
+
+        # Al sub-contador elegido no le alcanza: se bloquean todos los del plato (en orden) y se
+        # toma de varios. Es el camino lento; la compactación lo mantiene poco frecuente.
+        rows = self._lock_shards(dish_id)
+        total = sum(row.stock for row in rows)
+        if total < quantity:
+            if total <= 0:
+                sold_out.add(dish_id)
+            return None
+        taken, remaining = [], quantity
+        for row in rows:
+            part = min(row.stock, remaining)
+            if part > 0:
+                row.stock -= part
+                taken.append((dish_id, row.shard, part))
+                remaining -= part
+            if not remaining:
+                break
+        if total == quantity:
+            sold_out.add(dish_id)
+        self.db.flush()
+        return taken
+
+    def _add_stock(self, quantities: Dict[UUID, int]) -> None:
+        if quantities:
+            returned = case(quantities, value=MenuItemDB.id)
+            self.db.exec(
+                update(MenuItemDB)
+                .where(MenuItemDB.id.in_(list(quantities)))
+                .values(available_stock=MenuItemDB.available_stock + returned)
+                .execution_options(synchronize_session=False)
+            )
+
+    def _add_to_shards(self, parts: List[Tuple[UUID, int, int]]) -> None:
+        for dish_id, shard, quantity in parts:
+            self.db.exec(
+                update(StockShardDB)
+                .where(StockShardDB.menu_item_id == dish_id, StockShardDB.shard == shard)
+                .values(stock=StockShardDB.stock + quantity)
+                .execution_options(synchronize_session=False)
+            )
+
+    def set_stock_shards(self, menu_item_id: UUID, shards: int) -> Optional[MenuItem]:
+        menu_item_db = self.db.exec(
+            select(MenuItemDB).where(MenuItemDB.id == menu_item_id).with_for_update()
+        ).first()
+        if menu_item_db is None:
+            return None
+        total = self._lock_shards_total(menu_item_db)
+        self.db.exec(delete(StockShardDB).where(StockShardDB.menu_item_id == menu_item_id))
+        if shards > 0:
+            self.db.add_all([StockShardDB(menu_item_id=menu_item_id, shard=i, stock=stock)
+                             for i, stock in enumerate(split_stock(total, shards))])
+        menu_item_db.stock_shards = shards
+        menu_item_db.available_stock = total
+        self.db.commit()
+        self.db.refresh(menu_item_db)
+        self.cache.discard([menu_item_id])
+        return to_domain(menu_item_db)
+
+    def compact_stock_shards(self) -> int:
+        """Vuelve a nivelar los sub-contadores de cada plato fragmentado (un commit por plato)."""
+        dish_ids = self.db.exec(select(MenuItemDB.id).where(MenuItemDB.stock_shards > 0)).all()
+        for dish_id in dish_ids:
+            menu_item_db = self.db.get(MenuItemDB, dish_id)
+            if menu_item_db is not None and menu_item_db.stock_shards > 0:
+                self._rebalance(menu_item_db)
+                self.db.commit()
+        return len(dish_ids)
+
+    def _lock_shards(self, dish_id: UUID) -> List[StockShardDB]:
+        return self.db.exec(
+            select(StockShardDB)
+            .where(StockShardDB.menu_item_id == dish_id)
+            .order_by(StockShardDB.shard)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).all()
+
+    def _lock_shards_total(self, menu_item_db: MenuItemDB) -> int:
+        if menu_item_db.stock_shards <= 0:
+            return menu_item_db.available_stock
+        return sum(row.stock for row in self._lock_shards(menu_item_db.id))
+
+    def _rebalance(self, menu_item_db: MenuItemDB, total: Optional[int] = None) -> None:
+        """Reparte el stock (el actual o `total`) en partes iguales; available_stock queda como foto del total."""
+        rows = self._lock_shards(menu_item_db.id)
+        if total is None:
+            total = sum(row.stock for row in rows)
+        for row, stock in zip(rows, split_stock(total, len(rows))):
+            row.stock = stock
+        menu_item_db.available_stock = total
+
+    def get_pre_order_quantities(self, reservation_ids: List[UUID]) -> Dict[UUID, int]:
+        if not reservation_ids:
+            return {}
+        statement = (
+            select(PreOrderItemDB.menu_item_id, func.sum(PreOrderItemDB.quantity))
+            .where(PreOrderItemDB.reservation_id.in_(reservation_ids))
+            .group_by(PreOrderItemDB.menu_item_id)
+        )
+        return {dish_id: quantity for dish_id, quantity in self.db.exec(statement).all()}
+
+    def get_menu_item_by_name(self, restaurant_id: UUID, name: str) -> Optional[MenuItem]:
+        # Mismas expresiones que el índice único: la búsqueda lo usa y no distingue mayúsculas
+        results = self._read(MenuItemDB.restaurant_id == restaurant_id,
+                             func.lower(MenuItemDB.name) == func.lower(name))
+        return results[0] if results else None
 
     def get_menu_item_by_id(self, menu_item_id: UUID) -> Optional[MenuItem]:
-        statement = select(MenuItemDB).where(MenuItemDB.id == menu_item_id)
-        result = self.db.exec(statement).first()
-        return to_domain(result) if result else None
+        results = self._read(MenuItemDB.id == menu_item_id)
+        return results[0] if results else None
 
     def create_menu_item(self, menu_item: MenuItem) -> MenuItem:
         menu_item_db = to_db(menu_item)
         self.db.add(menu_item_db)
-        self.db.commit()
+        self._commit_name(menu_item)
         self.db.refresh(menu_item_db)
+        self.cache.invalidate(menu_item_db.restaurant_id)
         return to_domain(menu_item_db)
 
-    def modify_menu_item(self, menu_item: MenuItem) -> MenuItem:
-        self.db.commit()
-        self.db.refresh(menu_item)
-        return menu_item
+    def modify_menu_item(self, menu_item: MenuItem, update_stock: bool = True) -> MenuItem:
+        # Con stock se bloquea la fila: el valor nuevo no se mezcla con un reserve_stock a medias
+        statement = select(MenuItemDB).where(MenuItemDB.id == menu_item.id)
+        if update_stock:
+            statement = statement.with_for_update()
+        menu_item_db = self.db.exec(statement.execution_options(populate_existing=True)).first()
+        if menu_item_db is None:
+            return None
+        previous_restaurant_id = menu_item_db.restaurant_id
+        # El modo de stock solo se cambia con set_stock_shards. Sin update_stock no se escribe
+        # available_stock: el valor leído antes puede haber perdido descuentos de otras reservas
+        exclude = {"id", "stock_shards"} if update_stock else {"id", "stock_shards", "available_stock"}
+        menu_item_db.sqlmodel_update(menu_item.model_dump(exclude=exclude))
+        if update_stock and menu_item_db.stock_shards > 0:
+            # _rebalance bloquea los sub-contadores (FOR UPDATE) antes de repartir el total nuevo
+            self._rebalance(menu_item_db, total=menu_item.available_stock)
+        self._commit_name(menu_item)
+        self.db.refresh(menu_item_db)
+        self.cache.invalidate(previous_restaurant_id)
+        self.cache.invalidate(menu_item_db.restaurant_id)
+        return to_domain(menu_item_db)
+
+    def _commit_name(self, menu_item: MenuItem) -> None:
+        # La unicidad del nombre la garantiza el índice: sin lectura previa ni carrera entre dos altas
+        try:
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            if _is_duplicate_name(e):
+                raise MenuItemNameConflictError(
+                    f"Menu item '{menu_item.name}' already exists in restaurant {menu_item.restaurant_id}"
+                ) from e
+            raise
 
     def delete_menu_item(self, menu_item_id: str) -> None:
         menu_item = self.db.get(MenuItemDB, menu_item_id)
         if menu_item:
+            restaurant_id = menu_item.restaurant_id
+            self.db.exec(delete(StockShardDB).where(StockShardDB.menu_item_id == menu_item.id))
             self.db.delete(menu_item)
             self.db.commit()
-            
-    def save_pre_order_item(self, pre_order_item: PreOrderItemDB):
-        """
-        Guarda un PreOrderItemDB en la base de datos.
-        """
-        self.db.add(pre_order_item)
-        self.db.commit()
-        self.db.refresh(pre_order_item)
-        return pre_order_item
-
+            self.cache.invalidate(restaurant_id)
@@ -16,13 +16,17 @@ class PreOrderItemDB(SQLModel, PreOrderItem, table=True):
     
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     menu_item_id: UUID = Field(foreign_key="menu_items.id")
-    reservation_id: UUID = Field(foreign_key="reservationdbmodel.uuid")
+    # Sin foreign_key: reservationdbmodel está particionada y su PK es (uuid, start_time)
+    reservation_id: UUID = Field(index=True)
     quantity: int
     special_instructions: Optional[str]
     
     # Relationships
     menu_item: Optional["MenuItemDB"] = Relationship(back_populates="pre_orders")
-    reservation: Optional["ReservationDBModel"] = Relationship(back_populates="pre_orders")
+    reservation: Optional["ReservationDBModel"] = Relationship(
+        back_populates="pre_orders",
+        sa_relationship_kwargs={"primaryjoin": "foreign(PreOrderItemDB.reservation_id) == ReservationDBModel.uuid"},
+    )
 
 # Convertir de PreOrderItemDB (infraestructura) a PreOrderItem (dominio)
 def to_domain(pre_order_item_db: PreOrderItemDB) -> PreOrderItem:
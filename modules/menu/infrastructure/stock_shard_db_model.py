@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+from uuid import UUID
+
+class StockShardDB(SQLModel, table=True):
+    """
+    Sub-contadores de stock de un plato con stock fragmentado (MenuItemDB.stock_shards > 0).
+
+    Cada pre-orden descuenta de un sub-contador elegido al azar, así las pre-órdenes concurrentes
+    de un plato muy pedido no esperan todas el bloqueo de la misma fila. El stock del plato es la
+    suma de sus sub-contadores; la compactación periódica los vuelve a nivelar.
+    """
+    __tablename__ = "menu_item_stock_shards"
+
+    menu_item_id: UUID = Field(foreign_key="menu_items.id", primary_key=True)
+    shard: int = Field(primary_key=True)
+    stock: int = 0
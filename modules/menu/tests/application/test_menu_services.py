@@ -6,6 +6,7 @@ from fastapi import HTTPException
 from modules.menu.application.menu_services import MenuServices
 from modules.menu.domain.menu_repository_interface import MenuRepositoryInterface
 from modules.menu.domain.menu_item import MenuItem
+from modules.menu.domain.menu_exceptions import MenuItemNameConflictError
 
 @pytest.fixture
 def mock_menu_repo():
@@ -16,16 +17,6 @@ def menu_service(mock_menu_repo):
     return MenuServices(mock_menu_repo)
 
 def test_create_menu_item_name_already_exists(menu_service, mock_menu_repo):
-    existing_menu_item = MenuItem(
-        id=uuid4(),
-        name="Existing Dish",
-        description="A test description",
-        category="Test Category",
-        price=10.0,
-        available_stock=10,
-        image_url="",
-        restaurant_id=uuid4()
-    )
     new_menu_item = MenuItem(
         id=uuid4(),
         name="Existing Dish",
@@ -37,7 +28,8 @@ def test_create_menu_item_name_already_exists(menu_service, mock_menu_repo):
         restaurant_id=uuid4()
     )
 
-    mock_menu_repo.get_all_by_restaurant.return_value = [existing_menu_item]
+    # El índice único de la base rechaza el nombre
+    mock_menu_repo.create_menu_item.side_effect = MenuItemNameConflictError("Existing Dish")
 
     with pytest.raises(HTTPException) as exc_info:
         menu_service.create_menu_item(
@@ -52,8 +44,8 @@ def test_create_menu_item_name_already_exists(menu_service, mock_menu_repo):
 
     assert exc_info.value.status_code == 409
     assert exc_info.value.detail == "Menu item with this name already exists in this restaurant."
-    mock_menu_repo.get_all_by_restaurant.assert_called_once_with(new_menu_item.restaurant_id)
-    mock_menu_repo.create_menu_item.assert_not_called()
+    mock_menu_repo.get_all_by_restaurant.assert_not_called()
+    mock_menu_repo.create_menu_item.assert_called_once()
 
 def test_create_menu_item_success(menu_service, mock_menu_repo):
     new_menu_item = MenuItem(
@@ -67,7 +59,6 @@ def test_create_menu_item_success(menu_service, mock_menu_repo):
         restaurant_id=uuid4()
     )
 
-    mock_menu_repo.get_all_by_restaurant.return_value = []
     mock_menu_repo.create_menu_item.return_value = new_menu_item
 
     created_item = menu_service.create_menu_item(
@@ -81,7 +72,7 @@ def test_create_menu_item_success(menu_service, mock_menu_repo):
     )
 
     assert created_item == new_menu_item
-    mock_menu_repo.get_all_by_restaurant.assert_called_once_with(new_menu_item.restaurant_id)
+    mock_menu_repo.get_all_by_restaurant.assert_not_called()
     mock_menu_repo.create_menu_item.assert_called_once()
     called_item = mock_menu_repo.create_menu_item.call_args[0][0]
     assert called_item.name == new_menu_item.name
@@ -91,3 +82,13 @@ def test_create_menu_item_success(menu_service, mock_menu_repo):
     assert called_item.available_stock == new_menu_item.available_stock
     assert called_item.restaurant_id == new_menu_item.restaurant_id
     assert called_item.image_url == new_menu_item.image_url
+
+def test_set_stock_shards_unknown_item_returns_404(menu_service, mock_menu_repo):
+    menu_item_id = uuid4()
+    mock_menu_repo.set_stock_shards.return_value = None
+
+    with pytest.raises(HTTPException) as exc_info:
+        menu_service.set_stock_shards(menu_item_id, 8)
+
+    assert exc_info.value.status_code == 404
+    mock_menu_repo.set_stock_shards.assert_called_once_with(menu_item_id, 8)
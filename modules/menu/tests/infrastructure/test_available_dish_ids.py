@@ -0,0 +1,82 @@
+import pytest
+from uuid import uuid4
+from sqlalchemy import event
+
+from modules.menu.domain.menu_item import MenuItem
+from modules.menu.infrastructure.available_dish_cache import AvailableDishCache
+from modules.menu.infrastructure.menu_item_db_model import MenuItemDB
+from modules.menu.infrastructure.menu_repository import MenuRepository
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def repo(db, clock):
+    return MenuRepository(db, cache=AvailableDishCache(ttl_seconds=30, clock=clock))
+
+@pytest.fixture
+def queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+def add_dish(db, restaurant_id, stock):
+    # Nombre distinto por plato: el índice único no admite dos iguales en un restaurante
+    dish = MenuItemDB(id=uuid4(), name=f"Arepa {uuid4().hex[:8]}", description="", category="Main", price=5.0,
+                      available_stock=stock, restaurant_id=restaurant_id, image_url=None)
+    db.add(dish)
+    db.commit()
+    return dish.id
+
+def test_only_dishes_of_the_restaurant_with_stock_are_available(db, repo, queries, seed_restaurant):
+    restaurant_id, other_restaurant_id = seed_restaurant().id, seed_restaurant().id
+    in_stock = add_dish(db, restaurant_id, stock=3)
+    sold_out = add_dish(db, restaurant_id, stock=0)
+    elsewhere = add_dish(db, other_restaurant_id, stock=3)
+    queries.clear()
+
+    assert repo.get_available_dish_ids(restaurant_id, [in_stock, sold_out, elsewhere, uuid4()]) == {in_stock}
+    # Una sola consulta, y trae solo ids
+    assert len(queries) == 1
+    assert queries[0].lstrip().startswith("SELECT menu_items.id \nFROM menu_items")
+
+def test_repeated_validation_is_served_from_the_cache(db, repo, queries, clock, seed_restaurant):
+    restaurant_id = seed_restaurant().id
+    in_stock, sold_out = add_dish(db, restaurant_id, stock=3), add_dish(db, restaurant_id, stock=0)
+    repo.get_available_dish_ids(restaurant_id, [in_stock, sold_out])
+    queries.clear()
+
+    assert repo.get_available_dish_ids(restaurant_id, [sold_out, in_stock]) == {in_stock}
+    assert queries == []
+
+    # Solo se consultan los ids que el caché aún no conoce
+    new_dish = add_dish(db, restaurant_id, stock=1)
+    queries.clear()
+    assert repo.get_available_dish_ids(restaurant_id, [in_stock, new_dish]) == {in_stock, new_dish}
+    assert len(queries) == 1
+
+    clock.now = 31
+    queries.clear()
+    repo.get_available_dish_ids(restaurant_id, [in_stock])
+    assert len(queries) == 1
+
+def test_menu_writes_invalidate_the_restaurant(db, repo, seed_restaurant):
+    restaurant_id = seed_restaurant().id
+    dish_id = add_dish(db, restaurant_id, stock=0)
+    assert repo.get_available_dish_ids(restaurant_id, [dish_id]) == set()
+
+    restocked = MenuItem(id=dish_id, name="Arepa", description="", category="Main", price=5.0,
+                         available_stock=4, image_url=None, restaurant_id=restaurant_id)
+    assert repo.modify_menu_item(restocked).available_stock == 4
+    assert repo.get_available_dish_ids(restaurant_id, [dish_id]) == {dish_id}
+
+    repo.delete_menu_item(dish_id)
+    assert repo.get_available_dish_ids(restaurant_id, [dish_id]) == set()
@@ -0,0 +1,105 @@
+import json
+import pytest
+from uuid import uuid4
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from modules.auth.domain.user import User, UserRole
+from modules.auth.infrastructure.auth_controller import get_current_user
+from modules.core.db_connection import get_db
+from modules.menu.application import menu_services
+from modules.menu.application.menu_bulk import iter_lines
+from modules.menu.infrastructure.menu_controller import router
+from modules.menu.infrastructure.menu_item_db_model import MenuItemDB
+from modules.menu.infrastructure.menu_repository import MenuRepository
+
+app = FastAPI()
+app.include_router(router, prefix="/menu")
+
+CSV_HEADERS = {"Content-Type": "text/csv; charset=utf-8"}
+NDJSON_HEADERS = {"Content-Type": "application/x-ndjson"}
+
+@pytest.fixture
+def restaurant_id(db, seed_restaurant):
+    restaurant = seed_restaurant()
+    db.add(MenuItemDB(id=uuid4(), name="Arepa", description="", category="Main", price=5.0,
+                      available_stock=3, restaurant_id=restaurant.id, image_url=None))
+    db.commit()
+    return restaurant.id
+
+@pytest.fixture
+def client(db):
+    admin = User(uuid=uuid4(), name="Admin", email="admin@example.com", hashed_password="hashed",
+                 role=UserRole.ADMIN)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: admin
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides = {}
+
+def chunked(text, size=7):
+    # Cuerpo enviado en trozos pequeños que cortan líneas y caracteres UTF-8 por la mitad
+    data = text.encode()
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+def test_iter_lines_rebuilds_lines_across_chunks():
+    assert list(iter_lines(chunked("ñame,1\ncazón,2\r\nfin"))) == ["ñame,1\n", "cazón,2\r\n", "fin"]
+
+def test_csv_import_validates_deduplicates_and_batches(client, restaurant_id, monkeypatch):
+    monkeypatch.setattr(menu_services, "IMPORT_BATCH_SIZE", 2)
+    batches = []
+    bulk_create = MenuRepository.bulk_create_menu_items
+    monkeypatch.setattr(MenuRepository, "bulk_create_menu_items",
+                        lambda self, items: batches.append(len(items)) or bulk_create(self, items))
+    body = (
+        "name,description,category,price,available_stock,image_url\n"
+        "Tequeños,Con queso,Entrada,6.5,20,\n"
+        "AREPA,Repetida con el menú actual,Main,5,1,\n"
+        "Pabellón,\"Caraotas, arroz\ny carne\",Main,12,8,http://img/p.png\n"
+        "tequeños,Repetida en el archivo,Entrada,6.5,20,\n"
+        "Cachapa,Precio negativo,Main,-1,4,\n"
+        "Quesillo,Postre,Postre,4,10\n"
+        "Chicha,Bebida,Bebidas,3,15,\n"
+    )
+
+    response = client.post(f"/menu/restaurant/{restaurant_id}/menu-items/import",
+                           content=chunked(body), headers=CSV_HEADERS)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["imported"], result["skipped_duplicates"], result["invalid"]) == (3, 2, 2)
+    assert batches == [2, 2, 1]
+    assert [e["line"] for e in result["errors"]] == [7, 8]
+    assert result["errors"][0]["detail"].startswith("price:")
+
+    exported = client.get(f"/menu/restaurant/{restaurant_id}/menu-items/export")
+    assert exported.headers["content-type"].startswith("text/csv")
+    lines = exported.text.splitlines()
+    assert lines[0] == "id,name,description,category,price,available_stock,image_url"
+    assert [line.split(",")[1] for line in lines[1:] if line.count(",") >= 6] == ["Arepa", "Chicha", "Tequeños"]
+    assert '"Caraotas, arroz\ny carne"' in exported.text
+
+def test_ndjson_import_and_export_round_trip(client, restaurant_id):
+    body = "\n".join([
+        json.dumps({"name": "Empanada", "description": "De pabellón", "category": "Entrada",
+                    "price": 3, "available_stock": 30}),
+        "{not json",
+        json.dumps({"name": "Malta", "description": "", "category": "Bebidas", "price": 2, "available_stock": 0}),
+    ])
+
+    response = client.post(f"/menu/restaurant/{restaurant_id}/menu-items/import",
+                           content=chunked(body), headers=NDJSON_HEADERS)
+
+    assert response.json()["imported"] == 2
+    assert response.json()["errors"][0]["line"] == 2
+    exported = client.get(f"/menu/restaurant/{restaurant_id}/menu-items/export", params={"format": "ndjson"})
+    rows = [json.loads(line) for line in exported.text.splitlines()]
+    assert [(r["name"], r["available_stock"]) for r in rows] == [("Arepa", 3), ("Empanada", 30), ("Malta", 0)]
+
+def test_import_rejects_bad_requests(client, restaurant_id):
+    url = f"/menu/restaurant/{restaurant_id}/menu-items/import"
+
+    assert client.post(url, content=b"name,price\nArepa,5\n", headers=CSV_HEADERS).status_code == 400
+    assert client.post(url, content=b"<menu/>", headers={"Content-Type": "application/xml"}).status_code == 415
+    missing = client.post(f"/menu/restaurant/{uuid4()}/menu-items/import", content=b"", headers=CSV_HEADERS)
+    assert missing.status_code == 404
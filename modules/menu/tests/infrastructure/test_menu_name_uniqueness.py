@@ -0,0 +1,72 @@
+import pytest
+from uuid import uuid4
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from modules.menu.application.menu_services import MenuServices
+from modules.menu.domain.menu_exceptions import MenuItemNameConflictError
+from modules.menu.domain.menu_item import MenuItem
+from modules.menu.infrastructure.available_dish_cache import AvailableDishCache
+from modules.menu.infrastructure.menu_item_db_model import MENU_ITEM_NAME_INDEX
+from modules.menu.infrastructure.menu_repository import MenuRepository
+
+@pytest.fixture
+def repo(db):
+    return MenuRepository(db, cache=AvailableDishCache())
+
+def dish(restaurant_id, name):
+    return MenuItem(id=uuid4(), name=name, description="", category="Main", price=5.0,
+                    available_stock=3, image_url=None, restaurant_id=restaurant_id)
+
+def test_duplicate_names_are_rejected_by_the_index(repo, seed_restaurant):
+    service = MenuServices(repo)
+    restaurant_id, other_restaurant_id = seed_restaurant().id, seed_restaurant().id
+    service.create_menu_item("Arepa", "Reina pepiada", "Main", 5.0, 3, restaurant_id)
+
+    with pytest.raises(HTTPException) as exc_info:
+        service.create_menu_item("AREPA", "Repetida", "Main", 5.0, 3, restaurant_id)
+    assert exc_info.value.status_code == 409
+    # El mismo nombre en otro restaurante sí se permite
+    service.create_menu_item("arepa", "Otra sede", "Main", 5.0, 3, other_restaurant_id)
+
+    cachapa = service.create_menu_item("Cachapa", "Con queso de mano", "Main", 7.0, 2, restaurant_id)
+    with pytest.raises(HTTPException) as exc_info:
+        service.modify_menu_item(cachapa.id, name="arepa")
+    assert exc_info.value.status_code == 409
+    # La sesión sigue usable después del rollback
+    assert repo.get_menu_item_by_id(cachapa.id).name == "Cachapa"
+
+    with pytest.raises(MenuItemNameConflictError):
+        repo.create_menu_item(dish(restaurant_id, "CACHAPA"))
+
+def test_get_menu_item_by_name_is_case_insensitive_and_uses_the_index(db, repo, seed_restaurant):
+    restaurant_id = seed_restaurant().id
+    pabellon = repo.create_menu_item(dish(restaurant_id, "Pabellón Criollo"))
+
+    assert repo.get_menu_item_by_name(restaurant_id, "pabellón criollo").id == pabellon.id
+    assert repo.get_menu_item_by_name(seed_restaurant().id, "Pabellón Criollo") is None
+
+    plan = db.exec(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM menu_items WHERE restaurant_id = :r AND lower(name) = lower(:n)"
+    ), params={"r": restaurant_id.hex, "n": "x"}).all()
+    assert any(MENU_ITEM_NAME_INDEX in row[-1] for row in plan)
+
+def test_bulk_create_skips_names_created_concurrently(repo, seed_restaurant):
+    restaurant_id = seed_restaurant().id
+    # Otro proceso crea "Tequenos" mientras la importación está en curso.
+    # (lower() de SQLite solo pasa a minúsculas ASCII; el de Postgres también "Ñ" y tildes)
+    repo.create_menu_item(dish(restaurant_id, "Tequenos"))
+
+    inserted = repo.bulk_create_menu_items([dish(restaurant_id, "TEQUENOS"), dish(restaurant_id, "Empanada")])
+
+    assert inserted == 1
+    assert sorted(item.name for item in repo.get_all_by_restaurant(restaurant_id)) == ["Empanada", "Tequenos"]
+
+def test_bulk_create_counts_only_the_rows_the_index_let_in(repo, seed_restaurant):
+    restaurant_id = seed_restaurant().id
+    # Repetidos dentro del mismo lote: el índice deja entrar solo el primero
+    inserted = repo.bulk_create_menu_items([dish(restaurant_id, "Arepa"), dish(restaurant_id, "AREPA"),
+                                            dish(restaurant_id, "arepa"), dish(restaurant_id, "Cachapa")])
+
+    assert inserted == 2
+    assert sorted(item.name for item in repo.get_all_by_restaurant(restaurant_id)) == ["Arepa", "Cachapa"]
@@ -0,0 +1,213 @@
+import pytest
+import threading
+from uuid import uuid4
+from datetime import datetime, timedelta
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from modules.core.db_connection import get_db
+from modules.core.unit_of_work import UnitOfWork
+from modules.menu.application.menu_services import MenuServices
+from modules.menu.infrastructure.available_dish_cache import AvailableDishCache
+from modules.menu.infrastructure.menu_controller import router
+from modules.menu.infrastructure.menu_item_db_model import MenuItemDB
+from modules.menu.infrastructure.menu_repository import MenuRepository, split_stock
+from modules.menu.infrastructure.pre_order_item_db_model import PreOrderItemDB
+from modules.menu.infrastructure.stock_shard_db_model import StockShardDB
+from modules.reservation.application.dtos.reservation_create_dto import ReservationCreateDto
+
+EVENING = (datetime.utcnow() + timedelta(days=2)).replace(hour=20, minute=0, second=0, microsecond=0)
+
+@pytest.fixture
+def restaurant_id(seed_restaurant, seed_tables):
+    restaurant = seed_restaurant()
+    seed_tables(restaurant.id, range(1, 4))
+    return restaurant.id
+
+def add_dish(db, restaurant_id, stock):
+    # Nombre distinto por plato: el índice único no admite dos iguales en un restaurante
+    dish = MenuItemDB(id=uuid4(), name=f"Arepa {uuid4().hex[:8]}", description="", category="Main", price=5.0,
+                      available_stock=stock, restaurant_id=restaurant_id, image_url=None)
+    db.add(dish)
+    db.commit()
+    return dish.id
+
+def stock_of(db, dish_id):
+    db.expire_all()
+    return db.get(MenuItemDB, dish_id).available_stock
+
+def test_reserve_stock_is_all_or_nothing(db, restaurant_id):
+    repo = MenuRepository(db, cache=AvailableDishCache())
+    plenty, scarce = add_dish(db, restaurant_id, 5), add_dish(db, restaurant_id, 1)
+
+    assert repo.reserve_stock({plenty: 2, scarce: 1})
+    assert not repo.reserve_stock({plenty: 1, scarce: 1})
+    assert (stock_of(db, plenty), stock_of(db, scarce)) == (3, 0)
+
+    repo.restore_stock({plenty: 2, scarce: 1})
+    assert (stock_of(db, plenty), stock_of(db, scarce)) == (5, 1)
+
+def test_pre_orders_take_stock_and_cancellation_returns_it(db, restaurant_id, make_reservation_service):
+    service = make_reservation_service(menu_repo=MenuRepository(db, cache=AvailableDishCache()))
+    dish_id = add_dish(db, restaurant_id, 3)
+
+    def book(start):
+        return service.create_reservation(uuid4(), ReservationCreateDto(
+            restaurant_id=restaurant_id, start_time=start, end_time=start + timedelta(hours=2), num_people=2,
+            special_instructions=None, preordered_dishes=[dish_id, dish_id]
+        ))
+
+    first = book(EVENING)
+    assert stock_of(db, dish_id) == 1
+
+    # Solo queda una unidad: la reserva entera se revierte
+    with pytest.raises(HTTPException) as exc_info:
+        book(EVENING + timedelta(hours=3))
+    assert exc_info.value.status_code == 409
+    assert stock_of(db, dish_id) == 1
+    assert len(service.get_all_by_restaurant(restaurant_id)) == 1
+
+    service.cancel_reservation(first.uuid, first.user_id)
+    assert stock_of(db, dish_id) == 3
+    # Cancelar dos veces no devuelve el stock dos veces
+    service.cancel_reservation(first.uuid, first.user_id)
+    assert stock_of(db, dish_id) == 3
+
+def test_pre_order_endpoint_takes_stock_that_cancellation_returns(db, restaurant_id, make_reservation_service):
+    app = FastAPI()
+    app.include_router(router, prefix="/menu")
+    app.dependency_overrides[get_db] = lambda: db
+    service = make_reservation_service(menu_repo=MenuRepository(db, cache=AvailableDishCache()))
+    dish_id, side_id = add_dish(db, restaurant_id, 3), add_dish(db, restaurant_id, 5)
+    reservation = service.create_reservation(uuid4(), ReservationCreateDto(
+        restaurant_id=restaurant_id, start_time=EVENING, end_time=EVENING + timedelta(hours=2), num_people=2,
+        special_instructions=None
+    ))
+
+    def pre_order(dish, quantity):
+        return {"id": str(uuid4()), "menu_item_id": str(dish), "reservation_id": str(reservation.uuid),
+                "quantity": quantity}
+
+    with TestClient(app) as client:
+        response = client.post("/menu/pre-order-item", json=[pre_order(dish_id, 1), pre_order(dish_id, 1),
+                                                             pre_order(side_id, 2)])
+        assert response.status_code == 200
+        assert (stock_of(db, dish_id), stock_of(db, side_id)) == (1, 3)
+
+        # Al plato solo le queda una unidad: no entra ninguna de las dos pre-órdenes
+        response = client.post("/menu/pre-order-item", json=[pre_order(side_id, 1), pre_order(dish_id, 2)])
+        assert response.status_code == 409
+        assert (stock_of(db, dish_id), stock_of(db, side_id)) == (1, 3)
+        assert len(db.exec(select(PreOrderItemDB)).all()) == 3
+
+        assert client.post("/menu/pre-order-item", json=[pre_order(dish_id, 0)]).status_code == 400
+
+    service.cancel_reservation(reservation.uuid, reservation.user_id)
+    assert (stock_of(db, dish_id), stock_of(db, side_id)) == (3, 5)
+
+def shard_stocks(db, dish_id):
+    db.expire_all()
+    return db.exec(select(StockShardDB.stock).where(StockShardDB.menu_item_id == dish_id)
+                   .order_by(StockShardDB.shard)).all()
+
+def edit_while_reserving(db, dish_id, **changes):
+    """Edita el plato con el servicio mientras una reserva descuenta stock entre su lectura y su escritura."""
+    repo = MenuRepository(db, cache=AvailableDishCache())
+    read = repo.get_menu_item_by_id
+
+    def read_then_reserve(menu_item_id):
+        menu_item = read(menu_item_id)
+        assert MenuRepository(db, cache=AvailableDishCache()).reserve_stock({dish_id: 1})
+        return menu_item
+    repo.get_menu_item_by_id = read_then_reserve
+    return MenuServices(repo).modify_menu_item(dish_id, **changes)
+
+def test_editing_a_dish_keeps_stock_taken_during_the_edit(db, restaurant_id):
+    dish_id = add_dish(db, restaurant_id, 5)
+
+    edited = edit_while_reserving(db, dish_id, price=6.5)
+
+    assert edited.price == 6.5
+    assert stock_of(db, dish_id) == 4
+    # Si el admin envía el stock, ese valor es el que queda
+    assert edit_while_reserving(db, dish_id, available_stock=10).available_stock == 10
+    assert stock_of(db, dish_id) == 10
+
+def test_editing_a_sharded_dish_keeps_shard_decrements(db, restaurant_id):
+    dish_id = add_dish(db, restaurant_id, 8)
+    MenuRepository(db, cache=AvailableDishCache()).set_stock_shards(dish_id, 4)
+
+    edit_while_reserving(db, dish_id, name="Arepa reina")
+
+    assert sum(shard_stocks(db, dish_id)) == 7
+    # Un stock enviado explícitamente sí vuelve a repartirse entre los sub-contadores
+    edit_while_reserving(db, dish_id, available_stock=12)
+    assert shard_stocks(db, dish_id) == [3, 3, 3, 3]
+
+def test_split_stock_spreads_the_remainder():
+    assert split_stock(10, 4) == [3, 3, 2, 2]
+    assert split_stock(0, 3) == [0, 0, 0]
+
+def test_sharded_stock_is_summed_on_read_and_compacted(db, restaurant_id):
+    repo = MenuRepository(db, cache=AvailableDishCache())
+    hot, plain = add_dish(db, restaurant_id, 10), add_dish(db, restaurant_id, 1)
+
+    assert repo.set_stock_shards(hot, 4).stock_shards == 4
+    assert shard_stocks(db, hot) == [3, 3, 2, 2]
+
+    assert repo.reserve_stock({hot: 1})
+    assert repo.get_menu_item_by_id(hot).available_stock == 9
+    # Ningún sub-contador tiene 5: se toma de varios
+    assert repo.reserve_stock({hot: 5})
+    assert sum(shard_stocks(db, hot)) == 4
+    # Todo o nada también entre platos fragmentados y no fragmentados
+    assert not repo.reserve_stock({hot: 2, plain: 2})
+    assert sum(shard_stocks(db, hot)) == 4 and stock_of(db, plain) == 1
+
+    repo.restore_stock({hot: 3})
+    assert repo.compact_stock_shards() == 1
+    assert shard_stocks(db, hot) == [2, 2, 2, 1]
+    assert stock_of(db, hot) == 7
+
+    assert repo.set_stock_shards(hot, 0).available_stock == 7
+    assert shard_stocks(db, hot) == []
+    assert repo.get_available_dish_ids(restaurant_id, [hot]) == {hot}
+
+@pytest.mark.parametrize("shards", [0, 4])
+def test_concurrent_pre_orders_never_oversell(tmp_path, shards, seed_restaurant):
+    # Base en archivo: cada hilo tiene su propia conexión y su propia transacción
+    engine = create_engine(f"sqlite:///{tmp_path / 'stock.db'}", connect_args={"timeout": 30})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        restaurant = seed_restaurant(session=db)
+        popular, side = add_dish(db, restaurant.id, 40), add_dish(db, restaurant.id, 25)
+        if shards:
+            MenuRepository(db, cache=AvailableDishCache()).set_stock_shards(popular, shards)
+
+    threads, attempts = 8, 10
+    start = threading.Barrier(threads)
+    successes = []
+
+    def customer():
+        start.wait()
+        with Session(engine) as db:
+            repo = MenuRepository(db, cache=AvailableDishCache())
+            for _ in range(attempts):
+                # Cada pedido lleva dos del plato popular y uno del acompañante
+                with UnitOfWork(db):
+                    if repo.reserve_stock({popular: 2, side: 1}):
+                        successes.append(1)
+
+    workers = [threading.Thread(target=customer) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # 80 intentos, pero el plato popular solo alcanza para 20 pedidos
+    with Session(engine) as db:
+        assert len(successes) == 20
+        repo = MenuRepository(db, cache=AvailableDishCache())
+        assert (repo.get_menu_item_by_id(popular).available_stock, stock_of(db, side)) == (0, 5)
+        assert all(stock >= 0 for stock in shard_stocks(db, popular))
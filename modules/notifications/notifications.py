@@ -23,4 +23,8 @@ def notificacion(mensaje: str, data_extractor=None):
 
 @notificacion("Pre-orden con {n_platos} platos.")
 def registrar_preorden(n_platos):
-    pass
\ No newline at end of file
+    pass
+
+@notificacion("Reserva {id_reserva} asignada desde la lista de espera.")
+def registrar_promocion(id_reserva):
+    pass
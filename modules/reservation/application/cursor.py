@@ -0,0 +1,20 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+from fastapi import HTTPException
+
+# Cursor de paginación por keyset sobre (start_time, uuid)
+
+def encode_cursor(start_time: datetime, reservation_id: UUID) -> str:
+    payload = json.dumps({"t": start_time.isoformat(), "id": str(reservation_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), UUID(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from typing import List
+from uuid import UUID
+
+class BulkCancelResultDto(BaseModel):
+    cancelled: int
+    reservation_ids: List[UUID]
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import date
+from typing import List
+from modules.reservation.domain.day_sheet import DaySheetPreOrder
+from modules.reservation.application.dtos.reservation_response_dto import ReservationResponseDto
+
+class DaySheetReservationDto(ReservationResponseDto):
+    pre_orders: List[DaySheetPreOrder] = []
+
+class DaySheetDishTotalDto(BaseModel):
+    # Cantidad total de un plato a preparar en el día
+    menu_item_id: UUID
+    menu_item_name: str
+    quantity: int
+
+class DaySheetDto(BaseModel):
+    restaurant_id: UUID
+    date: date
+    reservations: List[DaySheetReservationDto]
+    dish_totals: List[DaySheetDishTotalDto]
@@ -1,13 +1,20 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
 
 class ReservationCreateDto(BaseModel):
-    table_id: UUID
+    # Sin table_id se asigna automáticamente la mesa que mejor se ajusta en restaurant_id
+    table_id: Optional[UUID] = None
+    restaurant_id: Optional[UUID] = None
     start_time: datetime
     end_time: datetime
     num_people: int 
     special_instructions: Optional[str]
     preordered_dishes: Optional[list[UUID]] = []
 
+    @model_validator(mode="after")
+    def check_table_or_restaurant(self) -> "ReservationCreateDto":
+        if self.table_id is None and self.restaurant_id is None:
+            raise ValueError("Either table_id or restaurant_id (automatic table assignment) is required.")
+        return self
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from modules.reservation.application.dtos.reservation_response_dto import ReservationResponseDto
+
+class ReservationPageDto(BaseModel):
+    items: List[ReservationResponseDto]
+    # Token opaco para pedir la página siguiente; None cuando no hay más resultados
+    next_cursor: Optional[str] = None
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+
+class ReservationRescheduleDto(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    # Sin table_id la reserva se queda en su mesa; otra mesa debe ser del mismo restaurante
+    table_id: Optional[UUID] = None
@@ -14,4 +14,7 @@ class ReservationResponseDto(BaseModel):
     special_instructions: Optional[str] = None
     status: ReservationStatus
     preordered_dishes: Optional[List[UUID]] = []
-    restaurant_name: str
+    restaurant_name: Optional[str] = None
+    restaurant_id: Optional[UUID] = None
+    table_number: Optional[int] = None
+    pre_order_count: int = 0
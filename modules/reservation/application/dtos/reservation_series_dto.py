@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field, model_validator
+from uuid import UUID
+from datetime import datetime
+from typing import List, Optional
+from modules.reservation.application.recurrence import SeriesFrequency, MAX_SERIES_OCCURRENCES
+from modules.reservation.application.dtos.reservation_response_dto import ReservationResponseDto
+
+class ReservationSeriesCreateDto(BaseModel):
+    # start_time/end_time son los de la primera ocurrencia; la serie termina por count o por until
+    table_id: UUID
+    start_time: datetime
+    end_time: datetime
+    num_people: int
+    special_instructions: Optional[str] = None
+    frequency: SeriesFrequency
+    count: Optional[int] = Field(None, ge=1, le=MAX_SERIES_OCCURRENCES)
+    until: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def check_count_or_until(self) -> "ReservationSeriesCreateDto":
+        if (self.count is None) == (self.until is None):
+            raise ValueError("Exactly one of count or until is required.")
+        return self
+
+class SeriesConflictDto(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    reason: str
+
+class ReservationSeriesResultDto(BaseModel):
+    created: List[ReservationResponseDto]
+    conflicts: List[SeriesConflictDto]
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import datetime
+from typing import List
+
+# Candidatos por llamada (una grilla de mesas × franjas de un día)
+MAX_SLOT_CANDIDATES = 5000
+
+class SlotCandidateDto(BaseModel):
+    table_id: UUID
+    start_time: datetime
+    end_time: datetime
+
+class SlotCheckRequestDto(BaseModel):
+    candidates: List[SlotCandidateDto] = Field(..., min_length=1, max_length=MAX_SLOT_CANDIDATES)
+
+class SlotCheckResultDto(SlotCandidateDto):
+    available: bool
@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import datetime
+from typing import List, Optional
+
+# Duración máxima de una retención (lo que tarda un cliente en completar la reserva)
+MAX_HOLD_MINUTES = 15
+
+class SlotHoldCreateDto(BaseModel):
+    table_id: UUID
+    start_time: datetime
+    end_time: datetime
+    num_people: int
+    ttl_minutes: int = Field(10, ge=1, le=MAX_HOLD_MINUTES)
+
+class SlotHoldResponseDto(BaseModel):
+    # id es el token que se envía para confirmar o liberar la retención
+    id: UUID
+    table_id: UUID
+    restaurant_id: UUID
+    start_time: datetime
+    end_time: datetime
+    num_people: int
+    expires_at: datetime
+
+class SlotHoldConfirmDto(BaseModel):
+    special_instructions: Optional[str] = None
+    preordered_dishes: Optional[List[UUID]] = []
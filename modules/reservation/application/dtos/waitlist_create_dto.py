@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+
+class WaitlistCreateDto(BaseModel):
+    restaurant_id: UUID
+    party_size: int
+    # Rango (dentro de un mismo día) en el que el cliente acepta que empiece la reserva
+    window_start: datetime
+    window_end: datetime
+    duration_minutes: int = 120
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+from modules.reservation.domain.waitlist_entry import WaitlistStatus
+
+class WaitlistEntryResponseDto(BaseModel):
+    id: UUID
+    restaurant_id: UUID
+    party_size: int
+    window_start: datetime
+    window_end: datetime
+    duration_minutes: int
+    status: WaitlistStatus
+    created_at: datetime
+    # Reserva creada al promover la entrada
+    reservation_id: Optional[UUID] = None
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import List, Optional, Tuple
+
+# Tope de ocurrencias por serie (un año de reservas semanales)
+MAX_SERIES_OCCURRENCES = 52
+
+
+class SeriesFrequency(Enum):
+    WEEKLY = "WEEKLY"
+    BIWEEKLY = "BIWEEKLY"
+
+
+FREQUENCY_STEP = {
+    SeriesFrequency.WEEKLY: timedelta(weeks=1),
+    SeriesFrequency.BIWEEKLY: timedelta(weeks=2),
+}
+
+
+def expand_occurrences(start: datetime, end: datetime, frequency: SeriesFrequency, count: Optional[int] = None,
+                       until: Optional[datetime] = None) -> List[Tuple[datetime, datetime]]:
+    """
+    Intervalos [inicio, fin) de una serie que arranca en (start, end) y se repite según `frequency`,
+    hasta completar `count` ocurrencias o mientras el inicio no pase de `until` (como COUNT/UNTIL
+    en RRULE). Lanza ValueError si la serie supera MAX_SERIES_OCCURRENCES.
+    """
+    step = FREQUENCY_STEP[frequency]
+    occurrences = []
+    current = start
+    while (count is None or len(occurrences) < count) and (until is None or current <= until):
+        if len(occurrences) == MAX_SERIES_OCCURRENCES:
+            raise ValueError(f"A series can have at most {MAX_SERIES_OCCURRENCES} occurrences.")
+        occurrences.append((current, current + (end - start)))
+        current += step
+    return occurrences
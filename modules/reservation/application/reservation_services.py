@@ -1,15 +1,65 @@
+import hashlib
+from collections import Counter
 from uuid import UUID, uuid4
-from typing import Optional, List
-from datetime import datetime, timedelta
+from typing import Iterator, Optional, List, Tuple
+from contextlib import nullcontext
+from datetime import date, datetime, time, timedelta
 from fastapi import HTTPException
-from modules.reservation.domain.reservation import Reservation, ReservationStatus
+from modules.reservation.domain.reservation import Reservation, ReservationStatus, ACTIVE_STATUSES, MAX_RESERVATION_DURATION
 from modules.reservation.domain.reservation_repository_interface import IReservationRepository
+from modules.reservation.domain.reservation_exceptions import (
+    ReservationConflictError, ReservationUserConflictError, IdempotencyKeyConflictError, SlotHoldConflictError
+)
+from modules.reservation.domain.slot_hold import SlotHold
+from modules.reservation.domain.slot_hold_repository_interface import ISlotHoldRepository
+from modules.reservation.domain.slot_capacity_repository_interface import ISlotCapacityRepository
+from modules.reservation.domain.idempotency_record import IdempotencyRecord
+from modules.reservation.domain.idempotency_repository_interface import IIdempotencyRepository
+from modules.reservation.domain.waitlist_entry import WaitlistEntry, WaitlistStatus
+from modules.reservation.domain.waitlist_repository_interface import IWaitlistRepository
 from modules.restaurant.domain.table_repository_interface import ITableRepository
 from modules.menu.domain.menu_repository_interface import MenuRepositoryInterface
 from modules.reservation.application.dtos.reservation_create_dto import ReservationCreateDto
 from modules.reservation.application.dtos.reservation_response_dto import ReservationResponseDto
+from modules.reservation.application.dtos.reservation_reschedule_dto import ReservationRescheduleDto
+from modules.reservation.application.dtos.reservation_page_dto import ReservationPageDto
+from modules.reservation.application.cursor import encode_cursor, decode_cursor
+from modules.reservation.application.dtos.available_slot_dto import AvailableSlotDto
+from modules.reservation.application.dtos.slot_check_dto import SlotCandidateDto, SlotCheckResultDto
+from modules.reservation.application.dtos.reservation_series_dto import (
+    ReservationSeriesCreateDto, ReservationSeriesResultDto, SeriesConflictDto
+)
+from modules.reservation.application.dtos.bulk_cancel_result_dto import BulkCancelResultDto
+from modules.reservation.application.dtos.day_sheet_dto import DaySheetDto, DaySheetDishTotalDto, DaySheetReservationDto
+from modules.reservation.application.dtos.waitlist_create_dto import WaitlistCreateDto
+from modules.reservation.application.dtos.waitlist_entry_response_dto import WaitlistEntryResponseDto
+from modules.reservation.application.dtos.slot_hold_dto import SlotHoldConfirmDto, SlotHoldCreateDto, SlotHoldResponseDto
+from modules.reservation.application.slots import cover_slots, opening_slots
+from modules.reservation.application.table_allocator import best_fit_table
+from modules.reservation.application.slot_sweep import taken_slots
+from modules.reservation.application.recurrence import expand_occurrences
 from modules.notifications.notifications import notificacion
 from modules.restaurant.domain.restaurant_repository_interface import IRestaurantRepository
+from modules.restaurant.domain.restaurant import Restaurant
+from modules.menu.domain.pre_order_item import PreOrderItem
+from modules.core.unit_of_work import UnitOfWork
+
+MAX_SEARCH_WINDOW = timedelta(days=7)
+
+# Tiempo durante el cual un reintento con la misma Idempotency-Key recibe la respuesta guardada
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+# Entradas de la lista de espera evaluadas por cada cancelación (las más antiguas primero)
+WAITLIST_MATCH_LIMIT = 20
+
+def _request_hash(dto: ReservationCreateDto) -> str:
+    return hashlib.sha256(dto.model_dump_json().encode()).hexdigest()
+
+def _conflict(error: ReservationConflictError) -> HTTPException:
+    # La base rechazó la escritura: por la mesa (exclusión) o por el cliente (re-chequeo del repositorio)
+    if isinstance(error, ReservationUserConflictError):
+        return HTTPException(status_code=409, detail="You already have a reservation in this time slot.")
+    return HTTPException(status_code=409, detail="This table is already reserved at that time.")
 
 class ReservationService:
     def __init__(
@@ -17,89 +67,481 @@ class ReservationService:
         reservation_repo: IReservationRepository,
         table_repo: ITableRepository,
         menu_repo: MenuRepositoryInterface,
-        restaurant_repo: IRestaurantRepository
+        restaurant_repo: IRestaurantRepository,
+        uow: Optional[UnitOfWork] = None,
+        idempotency_repo: Optional[IIdempotencyRepository] = None,
+        waitlist_repo: Optional[IWaitlistRepository] = None,
+        hold_repo: Optional[ISlotHoldRepository] = None,
+        capacity_repo: Optional[ISlotCapacityRepository] = None
     ):
         self.reservation_repo = reservation_repo
         self.table_repo = table_repo
         self.menu_repo = menu_repo
         self.restaurant_repo = restaurant_repo
+        # Sin unidad de trabajo (p. ej. en tests) cada repositorio confirma por su cuenta
+        self.uow = uow or nullcontext()
+        self.idempotency_repo = idempotency_repo
+        self.waitlist_repo = waitlist_repo
+        self.hold_repo = hold_repo
+        self.capacity_repo = capacity_repo
 
     @notificacion("Reserva confirmada para {fecha} en {restaurante}.", data_extractor=lambda r: {"fecha": r.start_time.strftime("%Y-%m-%d %H:%M"), "restaurante": r.restaurant_name})
-    def create_reservation(self, user_id: UUID, dto: ReservationCreateDto) -> ReservationResponseDto:
+    def create_reservation(self, user_id: UUID, dto: ReservationCreateDto,
+                           idempotency_key: Optional[str] = None) -> ReservationResponseDto:
         # Validar duración
         duration = dto.end_time - dto.start_time
-        if duration > timedelta(hours=4) or duration.total_seconds() <= 0:
+        if duration > MAX_RESERVATION_DURATION or duration.total_seconds() <= 0:
             raise HTTPException(status_code=400, detail="Invalid reservation duration (max 4 hours).")
 
-        # Validar mesa existente
-        table = self.table_repo.get_by_id(dto.table_id)
-        if not table:
-            raise HTTPException(status_code=404, detail="Table not found.")
-        
-        restaurant = self.restaurant_repo.get_by_id(table.restaurant_id)
-        if not restaurant:
-            raise HTTPException(status_code=404, detail="Restaurant not found for this table.")
+        if dto.table_id:
+            # Validar mesa existente
+            table = self.table_repo.get_by_id(dto.table_id)
+            if not table:
+                raise HTTPException(status_code=404, detail="Table not found.")
+            restaurant_id = table.restaurant_id
+
+            restaurant = self.restaurant_repo.get_by_id(restaurant_id)
+            if not restaurant:
+                raise HTTPException(status_code=404, detail="Restaurant not found for this table.")
+        else:
+            restaurant_id = dto.restaurant_id
+            restaurant = self.restaurant_repo.get_by_id(restaurant_id)
+            if not restaurant:
+                raise HTTPException(status_code=404, detail="Restaurant not found.")
 
         # Validar que no haya solapamiento por cliente
-        overlapping_user = self.reservation_repo.get_active_by_user_and_time(user_id, dto.start_time, dto.end_time)
-        if overlapping_user:
+        if self.reservation_repo.exists_active_by_user_and_time(user_id, dto.start_time, dto.end_time):
             raise HTTPException(status_code=409, detail="You already have a reservation in this time slot.")
 
-        # Validar que no haya solapamiento por mesa
-        overlapping_table = self.reservation_repo.get_active_by_table_and_time(dto.table_id, dto.start_time, dto.end_time)
-        if overlapping_table:
-            raise HTTPException(status_code=409, detail="This table is already reserved at that time.")
+        if dto.table_id:
+            table_id = dto.table_id
+            # Validar que no haya solapamiento por mesa (chequeo rápido en memoria; la garantía
+            # bajo concurrencia la da la restricción de exclusión en la base de datos)
+            if self.reservation_repo.exists_active_by_table_and_time(table_id, dto.start_time, dto.end_time):
+                raise HTTPException(status_code=409, detail="This table is already reserved at that time.")
+            # Las retenciones de otros clientes también ocupan la mesa (las propias no)
+            if self.hold_repo and self.hold_repo.exists_active_by_table_and_time(
+                    table_id, dto.start_time, dto.end_time, datetime.utcnow(), exclude_user=user_id):
+                raise HTTPException(status_code=409, detail="This table is on hold for another customer at that time.")
+        else:
+            table_id = self._assign_table(restaurant_id, dto.num_people, dto.start_time, dto.end_time, user_id)
 
         # Validar platos (si existen)
         preordered_dishes = getattr(dto, "preordered_dishes", None)
-        if preordered_dishes:
-            if len(preordered_dishes) > 5:
-                raise HTTPException(status_code=400, detail="Cannot pre-order more than 5 dishes.")
-            menu_items = self.menu_repo.get_all_by_restaurant(table.restaurant_id)
-            menu_ids = {dish.id for dish in menu_items if dish.available_stock > 0}
-            for dish_id in preordered_dishes:
-                if dish_id not in menu_ids:
-                    raise HTTPException(status_code=400, detail=f"Dish {dish_id} is not available for this restaurant.")
-            # Notificación de pre-orden
-            from modules.notifications.notifications import registrar_preorden
-            registrar_preorden(n_platos=len(preordered_dishes))
+        self._check_preordered_dishes(restaurant_id, preordered_dishes)
 
         # Crear la reservación sin preordered_dishes (relación muchos a muchos)
         reservation = Reservation(
             uuid=uuid4(),
             user_id=user_id,
+            table_id=table_id,
+            start_time=dto.start_time,
+            end_time=dto.end_time,
+            num_people=dto.num_people,
+            special_instructions=dto.special_instructions,
+            status=ReservationStatus.PENDING
+        )
+
+        # Reserva, pre-órdenes y respuesta idempotente se escriben en una sola transacción con un único commit
+        try:
+            with self.uow:
+                self._admit_covers(restaurant, reservation)
+                saved = self.reservation_repo.save(reservation)
+
+                if preordered_dishes:
+                    # Al final de la transacción: las filas de los platos populares quedan bloqueadas poco tiempo
+                    self._reserve_stock(preordered_dishes)
+                    self.menu_repo.bulk_save_pre_order_items([
+                        PreOrderItem(
+                            id=uuid4(),
+                            menu_item_id=dish_id,
+                            reservation_id=saved.uuid,
+                            quantity=1,
+                            special_instructions=None
+                        )
+                        for dish_id in preordered_dishes
+                    ])
+
+                response_dto_data = saved.model_dump()
+                response_dto_data["preordered_dishes"] = preordered_dishes or []
+                response_dto_data["restaurant_name"] = restaurant.name
+                response_dto_data["restaurant_id"] = restaurant_id
+                response_dto_data["pre_order_count"] = len(preordered_dishes or [])
+                response = ReservationResponseDto(**response_dto_data)
+
+                if idempotency_key:
+                    self._remember_response(user_id, idempotency_key, dto, response)
+        except (ReservationConflictError, IdempotencyKeyConflictError) as e:
+            # Un reintento concurrente con la misma clave ganó la carrera: se devuelve su respuesta
+            replay = self.get_idempotent_response(user_id, idempotency_key, dto) if idempotency_key else None
+            if replay:
+                return replay
+            if isinstance(e, IdempotencyKeyConflictError):
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is already in progress.")
+            raise _conflict(e)
+        return response
+
+    def create_series(self, user_id: UUID, dto: ReservationSeriesCreateDto) -> ReservationSeriesResultDto:
+        """
+        Expande una serie recurrente y reserva todas las ocurrencias libres de una vez: una consulta
+        de solapamiento para todas (mesa o cliente) y un solo INSERT. Las ocurrencias ocupadas se
+        informan en `conflicts` en lugar de hacer fallar la serie completa.
+        """
+        # Como en reschedule_reservation y join_waitlist, las horas se comparan y guardan sin zona
+        dto = dto.model_copy(update={
+            "start_time": dto.start_time.replace(tzinfo=None),
+            "end_time": dto.end_time.replace(tzinfo=None),
+            "until": dto.until.replace(tzinfo=None) if dto.until else None,
+        })
+        duration = dto.end_time - dto.start_time
+        if duration > MAX_RESERVATION_DURATION or duration.total_seconds() <= 0:
+            raise HTTPException(status_code=400, detail="Invalid reservation duration (max 4 hours).")
+        if dto.start_time <= datetime.utcnow():
+            raise HTTPException(status_code=400, detail="The series must start in the future.")
+        try:
+            occurrences = expand_occurrences(dto.start_time, dto.end_time, dto.frequency, dto.count, dto.until)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not occurrences:
+            raise HTTPException(status_code=400, detail="The series has no occurrences.")
+
+        table = self.table_repo.get_by_id(dto.table_id)
+        if not table:
+            raise HTTPException(status_code=404, detail="Table not found.")
+        restaurant = self.restaurant_repo.get_by_id(table.restaurant_id)
+        if not restaurant:
+            raise HTTPException(status_code=404, detail="Restaurant not found for this table.")
+
+        # Las reservas existentes se separan por mesa y por cliente y cada ocurrencia se resuelve con un barrido
+        existing = self.reservation_repo.get_active_overlapping(dto.table_id, user_id, occurrences)
+        by_table = {dto.table_id: [(r.start_time, r.end_time) for r in existing if r.table_id == dto.table_id]}
+        by_user = {user_id: [(r.start_time, r.end_time) for r in existing if r.user_id == user_id]}
+        table_taken = taken_slots(by_table, [(dto.table_id, start, end) for start, end in occurrences])
+        user_taken = taken_slots(by_user, [(user_id, start, end) for start, end in occurrences])
+        # Retenciones de otros clientes sobre la mesa: una consulta para todo el rango de la serie
+        holds = self.hold_repo.get_active_by_restaurant(
+            table.restaurant_id, occurrences[0][0], occurrences[-1][1], datetime.utcnow(), exclude_user=user_id
+        ) if self.hold_repo else []
+        by_hold = {dto.table_id: [(h.start_time, h.end_time) for h in holds if h.table_id == dto.table_id]}
+        table_held = taken_slots(by_hold, [(dto.table_id, start, end) for start, end in occurrences])
+
+        reservations, conflicts = [], []
+        for (start, end), table_busy, user_busy, held in zip(occurrences, table_taken, user_taken, table_held):
+            if user_busy:
+                conflicts.append(SeriesConflictDto(start_time=start, end_time=end,
+                                                   reason="You already have a reservation in this time slot."))
+            elif table_busy:
+                conflicts.append(SeriesConflictDto(start_time=start, end_time=end,
+                                                   reason="This table is already reserved at that time."))
+            elif held:
+                conflicts.append(SeriesConflictDto(start_time=start, end_time=end,
+                                                   reason="This table is on hold for another customer at that time."))
+            else:
+                reservations.append(Reservation(
+                    uuid=uuid4(),
+                    user_id=user_id,
+                    table_id=dto.table_id,
+                    start_time=start,
+                    end_time=end,
+                    num_people=dto.num_people,
+                    special_instructions=dto.special_instructions,
+                    status=ReservationStatus.PENDING
+                ))
+
+        try:
+            with self.uow:
+                if self.capacity_repo:
+                    admitted = []
+                    for reservation in reservations:
+                        if self.capacity_repo.add_covers(table.restaurant_id,
+                                                         cover_slots(reservation.start_time, reservation.end_time),
+                                                         reservation.num_people, restaurant.max_covers_per_slot):
+                            admitted.append(reservation)
+                        else:
+                            conflicts.append(SeriesConflictDto(start_time=reservation.start_time,
+                                                               end_time=reservation.end_time,
+                                                               reason="The restaurant is at capacity for that time."))
+                    reservations = admitted
+                    conflicts.sort(key=lambda c: c.start_time)
+                saved = self.reservation_repo.bulk_save(reservations)
+        except ReservationConflictError:
+            # Otra reserva entró entre la consulta y el INSERT: la serie se reintenta completa
+            raise HTTPException(status_code=409, detail="The series changed while booking; please retry.")
+
+        created = [
+            ReservationResponseDto(**r.model_dump(), restaurant_name=restaurant.name,
+                                   restaurant_id=table.restaurant_id, table_number=table.number)
+            for r in saved
+        ]
+        return ReservationSeriesResultDto(created=created, conflicts=conflicts)
+
+    def _admit_covers(self, restaurant: Optional[Restaurant], reservation: Reservation) -> None:
+        """Suma los cubiertos de la reserva a sus franjas de 15 minutos; 409 si alguna supera el tope."""
+        if not self.capacity_repo or not restaurant:
+            return
+        if not self.capacity_repo.add_covers(restaurant.id, cover_slots(reservation.start_time, reservation.end_time),
+                                             reservation.num_people, restaurant.max_covers_per_slot):
+            raise HTTPException(status_code=409, detail="The restaurant is at capacity for that time.")
+
+    def _release_covers(self, restaurant_id: UUID, reservation: Reservation) -> None:
+        if self.capacity_repo:
+            self.capacity_repo.remove_covers(restaurant_id, cover_slots(reservation.start_time, reservation.end_time),
+                                             reservation.num_people)
+
+    def _restaurant_of_table(self, table_id: UUID) -> Optional[Restaurant]:
+        table = self.table_repo.get_by_id(table_id)
+        return self.restaurant_repo.get_by_id(table.restaurant_id) if table else None
+
+    def _check_preordered_dishes(self, restaurant_id: UUID, preordered_dishes: Optional[List[UUID]]) -> None:
+        if not preordered_dishes:
+            return
+        if len(preordered_dishes) > 5:
+            raise HTTPException(status_code=400, detail="Cannot pre-order more than 5 dishes.")
+        # Solo se consultan los platos pedidos, no el menú completo
+        available_ids = self.menu_repo.get_available_dish_ids(restaurant_id, preordered_dishes)
+        for dish_id in preordered_dishes:
+            if dish_id not in available_ids:
+                raise HTTPException(status_code=400, detail=f"Dish {dish_id} is not available for this restaurant.")
+        # Notificación de pre-orden
+        from modules.notifications.notifications import registrar_preorden
+        registrar_preorden(n_platos=len(preordered_dishes))
+
+    def _reserve_stock(self, preordered_dishes: List[UUID]) -> None:
+        """Descuenta una unidad por plato pre-ordenado; 409 si a alguno ya no le alcanza el stock."""
+        if not self.menu_repo.reserve_stock(dict(Counter(preordered_dishes))):
+            raise HTTPException(status_code=409, detail="Some pre-ordered dishes are out of stock.")
+
+    def _restore_stock(self, reservation_ids: List[UUID]) -> None:
+        """Devuelve al stock lo pre-ordenado por las reservas canceladas."""
+        quantities = self.menu_repo.get_pre_order_quantities(reservation_ids)
+        if quantities:
+            self.menu_repo.restore_stock(quantities)
+
+    def _assign_table(self, restaurant_id: UUID, party_size: int, start: datetime, end: datetime,
+                      user_id: Optional[UUID] = None) -> UUID:
+        # Una consulta trae las mesas con sus reservas activas del día; la elección se hace en memoria
+        day_start = datetime.combine(start.date(), time.min)
+        day_end = datetime.combine(end.date(), time.min) + timedelta(days=1)
+        tables = self.reservation_repo.get_table_occupancy(restaurant_id, day_start, day_end)
+        if self.hold_repo:
+            # Las retenciones vigentes de otros clientes cuentan como ocupación
+            held = {}
+            for hold in self.hold_repo.get_active_by_restaurant(restaurant_id, day_start, day_end,
+                                                                 datetime.utcnow(), exclude_user=user_id):
+                held.setdefault(hold.table_id, []).append((hold.start_time, hold.end_time))
+            for table in tables:
+                table.booked.extend(held.get(table.table_id, []))
+        table = best_fit_table(tables, party_size, start, end, day_start, day_end)
+        if not table:
+            raise HTTPException(status_code=409, detail="No table available for this party size at that time.")
+        return table.table_id
+
+    def get_idempotent_response(self, user_id: UUID, idempotency_key: str,
+                                dto: ReservationCreateDto) -> Optional[ReservationResponseDto]:
+        """Respuesta guardada de un intento anterior con la misma Idempotency-Key, o None."""
+        if self.idempotency_repo is None:
+            return None
+        record = self.idempotency_repo.get(user_id, idempotency_key, datetime.utcnow())
+        if not record:
+            return None
+        if record.request_hash != _request_hash(dto):
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request.")
+        return ReservationResponseDto.model_validate_json(record.response_body)
+
+    def _remember_response(self, user_id: UUID, idempotency_key: str, dto: ReservationCreateDto,
+                           response: ReservationResponseDto) -> None:
+        if self.idempotency_repo is None:
+            return
+        now = datetime.utcnow()
+        self.idempotency_repo.save(IdempotencyRecord(
+            user_id=user_id,
+            key=idempotency_key,
+            request_hash=_request_hash(dto),
+            status_code=201,
+            response_body=response.model_dump_json(),
+            created_at=now,
+            expires_at=now + IDEMPOTENCY_KEY_TTL
+        ))
+
+    def create_hold(self, user_id: UUID, dto: SlotHoldCreateDto) -> SlotHoldResponseDto:
+        """
+        Retiene (mesa, intervalo) durante `ttl_minutes` mientras el cliente arma la reserva. Corre
+        las mismas validaciones que create_reservation, así confirm_hold no necesita repetirlas.
+        """
+        if not self.hold_repo:
+            raise HTTPException(status_code=503, detail="Slot holds are not available.")
+        # Las horas se comparan y guardan sin zona, como en las reservas
+        dto = dto.model_copy(update={
+            "start_time": dto.start_time.replace(tzinfo=None), "end_time": dto.end_time.replace(tzinfo=None)
+        })
+        duration = dto.end_time - dto.start_time
+        if duration > MAX_RESERVATION_DURATION or duration.total_seconds() <= 0:
+            raise HTTPException(status_code=400, detail="Invalid reservation duration (max 4 hours).")
+        now = datetime.utcnow()
+        if dto.start_time <= now:
+            raise HTTPException(status_code=400, detail="The reservation must start in the future.")
+
+        table = self.table_repo.get_by_id(dto.table_id)
+        if not table:
+            raise HTTPException(status_code=404, detail="Table not found.")
+        if self.reservation_repo.exists_active_by_user_and_time(user_id, dto.start_time, dto.end_time):
+            raise HTTPException(status_code=409, detail="You already have a reservation in this time slot.")
+        if self.reservation_repo.exists_active_by_table_and_time(dto.table_id, dto.start_time, dto.end_time):
+            raise HTTPException(status_code=409, detail="This table is already reserved at that time.")
+
+        hold = SlotHold(
+            id=uuid4(),
+            user_id=user_id,
             table_id=dto.table_id,
+            restaurant_id=table.restaurant_id,
             start_time=dto.start_time,
             end_time=dto.end_time,
             num_people=dto.num_people,
+            expires_at=now + timedelta(minutes=dto.ttl_minutes)
+        )
+        try:
+            self.hold_repo.create(hold, now)
+        except SlotHoldConflictError:
+            raise HTTPException(status_code=409, detail="This table is on hold for another customer at that time.")
+        return SlotHoldResponseDto(**hold.model_dump())
+
+    def release_hold(self, hold_id: UUID, user_id: UUID) -> None:
+        hold = self.hold_repo.get(hold_id, datetime.utcnow()) if self.hold_repo else None
+        if not hold:
+            raise HTTPException(status_code=404, detail="Hold not found or expired.")
+        if hold.user_id != user_id:
+            raise HTTPException(status_code=403, detail="You can only release your own holds.")
+        self.hold_repo.delete(hold_id)
+
+    @notificacion("Reserva confirmada para {fecha} en {restaurante}.", data_extractor=lambda r: {"fecha": r.start_time.strftime("%Y-%m-%d %H:%M"), "restaurante": r.restaurant_name})
+    def confirm_hold(self, hold_id: UUID, user_id: UUID, dto: SlotHoldConfirmDto) -> ReservationResponseDto:
+        """
+        Convierte una retención vigente en reserva. La mesa, el horario y los solapamientos ya se
+        validaron al crearla y la retención los mantuvo libres: solo se validan las pre-órdenes.
+        Reserva, pre-órdenes y borrado de la retención van en una sola transacción.
+        """
+        hold = self.hold_repo.get(hold_id, datetime.utcnow()) if self.hold_repo else None
+        if not hold:
+            raise HTTPException(status_code=404, detail="Hold not found or expired.")
+        if hold.user_id != user_id:
+            raise HTTPException(status_code=403, detail="You can only confirm your own holds.")
+        self._check_preordered_dishes(hold.restaurant_id, dto.preordered_dishes)
+
+        reservation = Reservation(
+            uuid=uuid4(),
+            user_id=user_id,
+            table_id=hold.table_id,
+            start_time=hold.start_time,
+            end_time=hold.end_time,
+            num_people=hold.num_people,
             special_instructions=dto.special_instructions,
             status=ReservationStatus.PENDING
         )
+        try:
+            with self.uow:
+                if self.capacity_repo:
+                    self._admit_covers(self.restaurant_repo.get_by_id(hold.restaurant_id), reservation)
+                saved = self.reservation_repo.save(reservation)
+                self.hold_repo.delete(hold.id)
+                if dto.preordered_dishes:
+                    self._reserve_stock(dto.preordered_dishes)
+                    self.menu_repo.bulk_save_pre_order_items([
+                        PreOrderItem(
+                            id=uuid4(),
+                            menu_item_id=dish_id,
+                            reservation_id=saved.uuid,
+                            quantity=1,
+                            special_instructions=None
+                        )
+                        for dish_id in dto.preordered_dishes
+                    ])
+        except ReservationConflictError as e:
+            # Solo si una reserva entró antes de que existiera la retención
+            raise _conflict(e)
 
-        saved = self.reservation_repo.save(reservation)
-
-        # Guardar los pre-ordenes en la tabla intermedia
-        if preordered_dishes:
-            from modules.menu.infrastructure.pre_order_item_db_model import PreOrderItemDB
-            for dish_id in preordered_dishes:
-                pre_order_item = PreOrderItemDB(
-                    menu_item_id=dish_id,
-                    reservation_id=saved.uuid,
-                    quantity=1,  # Puedes ajustar la lógica de cantidad si tu DTO la soporta
-                    special_instructions=None
-                )
-                # Asume que tienes un método para guardar el pre_order_item
-                self.menu_repo.save_pre_order_item(pre_order_item)
+        response = self.get_reservation_by_id(saved.uuid)
+        response.preordered_dishes = dto.preordered_dishes or []
+        return response
 
-        response_dto_data = saved.model_dump()
-        response_dto_data["preordered_dishes"] = preordered_dishes or []
-        if not restaurant: # Defensive check
-            raise HTTPException(status_code=500, detail="Restaurant information missing after initial check.")
-        response_dto_data["restaurant_name"] = restaurant.name
-        return ReservationResponseDto(**response_dto_data)
+    @notificacion("Reserva reprogramada para {fecha} (ID: {id_reserva}).", data_extractor=lambda r: {"fecha": r.start_time.strftime("%Y-%m-%d %H:%M"), "id_reserva": r.uuid})
+    def reschedule_reservation(self, reservation_id: UUID, current_user_id: UUID, dto: ReservationRescheduleDto,
+                               is_admin: bool = False) -> ReservationResponseDto:
+        # Validar duración
+        duration = dto.end_time - dto.start_time
+        if duration > MAX_RESERVATION_DURATION or duration.total_seconds() <= 0:
+            raise HTTPException(status_code=400, detail="Invalid reservation duration (max 4 hours).")
+        now = datetime.utcnow()
+        if dto.start_time.replace(tzinfo=None) <= now:
+            raise HTTPException(status_code=400, detail="The new time must be in the future.")
+
+        reservation = self.reservation_repo.get_by_id(reservation_id)
+        if not reservation:
+            raise HTTPException(status_code=404, detail="Reservation not found.")
+        if not is_admin and reservation.user_id != current_user_id:
+            raise HTTPException(status_code=403, detail="You can only reschedule your own reservations.")
+        if reservation.status not in ACTIVE_STATUSES:
+            raise HTTPException(status_code=400, detail="Only pending or confirmed reservations can be rescheduled.")
+        # Mismas reglas que cancelar: el cliente solo puede mover con al menos 1 hora de antelación
+        if not is_admin and reservation.start_time <= now + timedelta(hours=1):
+            raise HTTPException(status_code=400, detail="You can only reschedule at least 1 hour in advance.")
+        if not is_admin and dto.start_time.replace(tzinfo=None) <= now + timedelta(hours=1):
+            raise HTTPException(status_code=400, detail="The new time must be at least 1 hour in advance.")
+
+        table_id = dto.table_id or reservation.table_id
+        if table_id != reservation.table_id:
+            table = self.table_repo.get_by_id(table_id)
+            current = self.table_repo.get_by_id(reservation.table_id)
+            if not table:
+                raise HTTPException(status_code=404, detail="Table not found.")
+            if current and table.restaurant_id != current.restaurant_id:
+                raise HTTPException(status_code=400, detail="The new table must belong to the same restaurant.")
+
+        # Solapamiento excluyendo la propia reserva (que deja libre su franja actual)
+        if self.reservation_repo.exists_active_by_user_and_time(reservation.user_id, dto.start_time, dto.end_time,
+                                                                exclude=reservation_id):
+            raise HTTPException(status_code=409, detail="You already have a reservation in this time slot.")
+        if self.reservation_repo.exists_active_by_table_and_time(table_id, dto.start_time, dto.end_time,
+                                                                 exclude=reservation_id):
+            raise HTTPException(status_code=409, detail="This table is already reserved at that time.")
+        if self.hold_repo and self.hold_repo.exists_active_by_table_and_time(
+                table_id, dto.start_time, dto.end_time, now, exclude_user=reservation.user_id):
+            raise HTTPException(status_code=409, detail="This table is on hold for another customer at that time.")
+
+        # Un único UPDATE condicional: si entre la lectura y la escritura la reserva cambió de estado
+        # (o de hora), no se toca ninguna fila; la restricción de exclusión cubre la carrera por la mesa
+        try:
+            with self.uow:
+                moved = self.reservation_repo.reschedule(
+                    reservation_id, dto.start_time, dto.end_time, table_id, ACTIVE_STATUSES,
+                    user_id=None if is_admin else current_user_id,
+                    starts_after=None if is_admin else now + timedelta(hours=1),
+                )
+                if moved and self.capacity_repo:
+                    # Se liberan las franjas viejas antes de admitir las nuevas (pueden compartir franjas)
+                    restaurant = self._restaurant_of_table(table_id)
+                    if restaurant:
+                        self._release_covers(restaurant.id, reservation)
+                        self._admit_covers(restaurant, moved)
+        except ReservationConflictError as e:
+            raise _conflict(e)
+        if not moved:
+            raise HTTPException(status_code=409, detail="The reservation changed while rescheduling; please retry.")
+        return self.get_reservation_by_id(reservation_id)
 
     @notificacion("Reserva cancelada (ID: {id_reserva}).", data_extractor=lambda r: {"id_reserva": r.uuid})
-    def cancel_reservation(self, reservation_id: UUID, current_user_id: UUID, is_admin: bool = False) -> None:
+    def cancel_reservation(self, reservation_id: UUID, current_user_id: UUID, is_admin: bool = False) -> Reservation:
+        try:
+            cancelled, promoted = self._cancel(reservation_id, current_user_id, is_admin, promote=True)
+        except ReservationConflictError:
+            # Otra reserva ocupó el hueco entre el cálculo y el insert: se cancela sin promover
+            cancelled, promoted = self._cancel(reservation_id, current_user_id, is_admin, promote=False)
+        if promoted:
+            from modules.notifications.notifications import registrar_promocion
+            registrar_promocion(id_reserva=promoted.uuid)
+        if cancelled:
+            return cancelled
+
+        # No se actualizó ninguna fila: se lee la reserva solo para explicar por qué
         reservation = self.reservation_repo.get_by_id(reservation_id)
         if not reservation:
             raise HTTPException(status_code=404, detail="Reservation not found.")
@@ -107,54 +549,265 @@ class ReservationService:
         if not is_admin and reservation.user_id != current_user_id:
             raise HTTPException(status_code=403, detail="You can only cancel your own reservations.")
 
+        if reservation.status == ReservationStatus.CANCELLED:
+            return reservation
+
         # Cliente solo puede cancelar si falta al menos 1 hora
-        if not is_admin:
-            if reservation.start_time <= datetime.utcnow() + timedelta(hours=1):
-                raise HTTPException(status_code=400, detail="You can only cancel at least 1 hour in advance.")
+        if not is_admin and reservation.start_time <= datetime.utcnow() + timedelta(hours=1):
+            raise HTTPException(status_code=400, detail="You can only cancel at least 1 hour in advance.")
+
+        raise HTTPException(status_code=400, detail="Only pending or confirmed reservations can be cancelled.")
+
+    def cancel_by_restaurant(self, restaurant_id: UUID, start: datetime, end: datetime) -> BulkCancelResultDto:
+        if end <= start:
+            raise HTTPException(status_code=400, detail="End must be after start.")
+        if not self.restaurant_repo.get_by_id(restaurant_id):
+            raise HTTPException(status_code=404, detail="Restaurant not found.")
+
+        with self.uow:
+            cancelled = self.reservation_repo.bulk_transition_status_by_restaurant(
+                restaurant_id, start, end, ReservationStatus.CANCELLED, ACTIVE_STATUSES
+            )
+            if self.capacity_repo and cancelled:
+                # Los cubiertos liberados se suman por franja y se devuelven en una sola escritura
+                freed = Counter()
+                for reservation in cancelled:
+                    for slot in cover_slots(reservation.start_time, reservation.end_time):
+                        freed[slot] += reservation.num_people
+                self.capacity_repo.remove_covers_by_slot(restaurant_id, dict(freed))
+            self._restore_stock([r.uuid for r in cancelled])
+        return BulkCancelResultDto(cancelled=len(cancelled), reservation_ids=[r.uuid for r in cancelled])
+
+    def _cancel(self, reservation_id: UUID, current_user_id: UUID, is_admin: bool,
+                promote: bool) -> Tuple[Optional[Reservation], Optional[Reservation]]:
+        # Un único UPDATE condicional: dueño y antelación mínima de 1 hora (solo clientes).
+        # La promoción de la lista de espera va en la misma transacción que la cancelación.
+        with self.uow:
+            cancelled = self.reservation_repo.transition_status(
+                reservation_id,
+                ReservationStatus.CANCELLED,
+                ACTIVE_STATUSES,
+                user_id=None if is_admin else current_user_id,
+                starts_after=None if is_admin else datetime.utcnow() + timedelta(hours=1),
+            )
+            if cancelled and self.capacity_repo:
+                table = self.table_repo.get_by_id(cancelled.table_id)
+                if table:
+                    self._release_covers(table.restaurant_id, cancelled)
+            if cancelled:
+                self._restore_stock([cancelled.uuid])
+            promoted = self._promote_waitlist(cancelled) if cancelled and promote else None
+        return cancelled, promoted
 
-        reservation.status = ReservationStatus.CANCELLED
-        self.reservation_repo.update(reservation)
-        return reservation
+    def _promote_waitlist(self, freed: Reservation) -> Optional[Reservation]:
+        """Convierte en reserva la primera entrada en espera que entra en el hueco que dejó `freed`."""
+        if self.waitlist_repo is None:
+            return None
+        table = self.table_repo.get_by_id(freed.table_id)
+        if not table:
+            return None
+
+        start, end = freed.start_time.replace(tzinfo=None), freed.end_time.replace(tzinfo=None)
+        first_day = (start - MAX_RESERVATION_DURATION).date()
+        buckets = [first_day + timedelta(days=i) for i in range((end.date() - first_day).days + 1)]
+        candidates = self.waitlist_repo.find_candidates(
+            table.restaurant_id, buckets, table.capacity, start, end, WAITLIST_MATCH_LIMIT
+        )
+        if not candidates:
+            return None
+
+        # Hueco libre de la mesa que contiene el intervalo liberado
+        horizon_start = min(c.window_start for c in candidates)
+        horizon_end = max(c.window_end + c.duration for c in candidates)
+        gap_start, gap_end = horizon_start, horizon_end
+        for booked in self.reservation_repo.get_active_by_table_and_time(table.id, horizon_start, horizon_end):
+            if booked.end_time <= start:
+                gap_start = max(gap_start, booked.end_time)
+            elif booked.start_time >= end:
+                gap_end = min(gap_end, booked.start_time)
+
+        restaurant = None
+        for entry in candidates:
+            slot_start = max(entry.window_start, gap_start)
+            slot_end = slot_start + entry.duration
+            if slot_start > entry.window_end or slot_end > gap_end:
+                continue
+            if self.reservation_repo.exists_active_by_user_and_time(entry.user_id, slot_start, slot_end):
+                continue
+            if self.hold_repo and self.hold_repo.exists_active_by_table_and_time(
+                    table.id, slot_start, slot_end, datetime.utcnow(), exclude_user=entry.user_id):
+                continue
+            reservation = Reservation(
+                uuid=uuid4(),
+                user_id=entry.user_id,
+                table_id=table.id,
+                start_time=slot_start,
+                end_time=slot_end,
+                num_people=entry.party_size,
+                special_instructions=None,
+                status=ReservationStatus.PENDING
+            )
+            if self.capacity_repo:
+                restaurant = restaurant or self.restaurant_repo.get_by_id(table.restaurant_id)
+                capacity = restaurant.max_covers_per_slot if restaurant else None
+                if not self.capacity_repo.add_covers(table.restaurant_id,
+                                                     cover_slots(reservation.start_time, reservation.end_time),
+                                                     reservation.num_people, capacity):
+                    continue
+            # Condicional sobre WAITING: si otra cancelación ya la promovió, se prueba la siguiente
+            if not self.waitlist_repo.mark_promoted(entry.id, reservation.uuid):
+                self._release_covers(table.restaurant_id, reservation)
+                continue
+            return self.reservation_repo.save(reservation)
+        return None
+
+    def join_waitlist(self, user_id: UUID, dto: WaitlistCreateDto) -> WaitlistEntryResponseDto:
+        if self.waitlist_repo is None:
+            raise HTTPException(status_code=503, detail="Waitlist is not available.")
+        if dto.party_size <= 0:
+            raise HTTPException(status_code=400, detail="Party size must be greater than zero.")
+        duration = timedelta(minutes=dto.duration_minutes)
+        if duration > MAX_RESERVATION_DURATION or duration.total_seconds() <= 0:
+            raise HTTPException(status_code=400, detail="Invalid reservation duration (max 4 hours).")
+        window_start, window_end = dto.window_start.replace(tzinfo=None), dto.window_end.replace(tzinfo=None)
+        if window_end < window_start or window_end.date() != window_start.date():
+            raise HTTPException(status_code=400, detail="Waitlist window must be within a single day.")
+        if not self.restaurant_repo.get_by_id(dto.restaurant_id):
+            raise HTTPException(status_code=404, detail="Restaurant not found.")
+
+        entry = self.waitlist_repo.save(WaitlistEntry(
+            id=uuid4(),
+            user_id=user_id,
+            restaurant_id=dto.restaurant_id,
+            party_size=dto.party_size,
+            window_start=window_start,
+            window_end=window_end,
+            duration_minutes=dto.duration_minutes,
+            time_bucket=window_start.date(),
+            status=WaitlistStatus.WAITING,
+            created_at=datetime.utcnow()
+        ))
+        return WaitlistEntryResponseDto(**entry.model_dump())
+
+    def get_waitlist_by_user(self, user_id: UUID) -> List[WaitlistEntryResponseDto]:
+        if self.waitlist_repo is None:
+            return []
+        return [WaitlistEntryResponseDto(**e.model_dump()) for e in self.waitlist_repo.get_by_user(user_id)]
+
+    def leave_waitlist(self, entry_id: UUID, user_id: UUID) -> None:
+        if self.waitlist_repo is None:
+            raise HTTPException(status_code=404, detail="Waitlist entry not found.")
+        if self.waitlist_repo.cancel(entry_id, user_id):
+            return
+        entry = self.waitlist_repo.get_by_id(entry_id)
+        if not entry:
+            raise HTTPException(status_code=404, detail="Waitlist entry not found.")
+        if entry.user_id != user_id:
+            raise HTTPException(status_code=403, detail="You can only remove your own waitlist entries.")
+        raise HTTPException(status_code=400, detail="Only waiting entries can be removed.")
 
     def get_reservations_by_user(self, user_id: UUID) -> List[ReservationResponseDto]:
-        reservations = self.reservation_repo.get_by_user(user_id)
-        result = []
-        for r in reservations:
-            data = r.model_dump()
-            table = self.table_repo.get_by_id(r.table_id)
-            restaurant = self.restaurant_repo.get_by_id(table.restaurant_id) if table else None
-            data["restaurant_name"] = restaurant.name if restaurant else None
-            result.append(ReservationResponseDto(**data))
-        return result
+        reservations = self.reservation_repo.get_details_by_user(user_id)
+        return [ReservationResponseDto(**r.model_dump()) for r in reservations]
 
     def get_reservation_by_id(self, reservation_id: UUID) -> ReservationResponseDto:
-        reservation = self.reservation_repo.get_by_id(reservation_id)
+        reservation = self.reservation_repo.get_detail_by_id(reservation_id)
         if not reservation:
             raise HTTPException(status_code=404, detail="Reservation not found.")
-        data = reservation.model_dump()
-        table = self.table_repo.get_by_id(reservation.table_id)
-        restaurant = self.restaurant_repo.get_by_id(table.restaurant_id) if table else None
-        data["restaurant_name"] = restaurant.name if restaurant else None
-        return ReservationResponseDto(**data)
+        return ReservationResponseDto(**reservation.model_dump())
 
     def get_all_by_restaurant(self, restaurant_id: UUID) -> List[ReservationResponseDto]:
-        reservations = self.reservation_repo.get_all_by_restaurant(restaurant_id)
-        result = []
-        for r in reservations:
-            data = r.model_dump()
-            table = self.table_repo.get_by_id(r.table_id)
-            restaurant = self.restaurant_repo.get_by_id(table.restaurant_id) if table else None
-            data["restaurant_name"] = restaurant.name if restaurant else None
-            result.append(ReservationResponseDto(**data))
-        return result
+        reservations = self.reservation_repo.get_details_by_restaurant(restaurant_id)
+        return [ReservationResponseDto(**r.model_dump()) for r in reservations]
 
     def get_by_date_range(self, start: datetime, end: datetime) -> List[ReservationResponseDto]:
-        reservations = self.reservation_repo.get_by_date_range(start, end)
-        result = []
-        for r in reservations:
-            data = r.model_dump()
-            table = self.table_repo.get_by_id(r.table_id)
-            restaurant = self.restaurant_repo.get_by_id(table.restaurant_id) if table else None
-            data["restaurant_name"] = restaurant.name if restaurant else None
-            result.append(ReservationResponseDto(**data))
-        return result
+        reservations = self.reservation_repo.get_details_by_date_range(start, end)
+        return [ReservationResponseDto(**r.model_dump()) for r in reservations]
+
+    def get_all_by_restaurant_page(self, restaurant_id: UUID, limit: int, cursor: Optional[str] = None) -> ReservationPageDto:
+        after = decode_cursor(cursor) if cursor else None
+        reservations = self.reservation_repo.get_details_by_restaurant(restaurant_id, after=after, limit=limit + 1)
+        return self._to_page(reservations, limit)
+
+    def get_by_date_range_page(self, start: datetime, end: datetime, limit: int, cursor: Optional[str] = None) -> ReservationPageDto:
+        after = decode_cursor(cursor) if cursor else None
+        reservations = self.reservation_repo.get_details_by_date_range(start, end, after=after, limit=limit + 1)
+        return self._to_page(reservations, limit)
+
+    def stream_all_by_restaurant(self, restaurant_id: UUID) -> Iterator[ReservationResponseDto]:
+        for r in self.reservation_repo.iter_details_by_restaurant(restaurant_id):
+            yield ReservationResponseDto(**r.model_dump())
+
+    def stream_by_date_range(self, start: datetime, end: datetime) -> Iterator[ReservationResponseDto]:
+        for r in self.reservation_repo.iter_details_by_date_range(start, end):
+            yield ReservationResponseDto(**r.model_dump())
+
+    def get_day_sheet(self, restaurant_id: UUID, day: date, include_cancelled: bool = False) -> DaySheetDto:
+        restaurant = self.restaurant_repo.get_by_id(restaurant_id)
+        if not restaurant:
+            raise HTTPException(status_code=404, detail="Restaurant not found.")
+
+        start = datetime.combine(day, time.min)
+        entries = self.reservation_repo.get_day_sheet(restaurant_id, start, start + timedelta(days=1), include_cancelled)
+
+        # Totales por plato para la cocina (las reservas canceladas no se preparan)
+        totals = {}
+        for entry in entries:
+            if entry.status == ReservationStatus.CANCELLED:
+                continue
+            for item in entry.pre_orders:
+                total = totals.get(item.menu_item_id)
+                if total is None:
+                    total = totals[item.menu_item_id] = DaySheetDishTotalDto(
+                        menu_item_id=item.menu_item_id, menu_item_name=item.menu_item_name, quantity=0
+                    )
+                total.quantity += item.quantity
+        return DaySheetDto(
+            restaurant_id=restaurant_id,
+            date=day,
+            reservations=[DaySheetReservationDto(**e.model_dump()) for e in entries],
+            dish_totals=sorted(totals.values(), key=lambda t: (t.menu_item_name, str(t.menu_item_id))),
+        )
+
+    @staticmethod
+    def _to_page(reservations, limit: int) -> ReservationPageDto:
+        # Se pide un elemento de más para saber si existe una página siguiente
+        items = [ReservationResponseDto(**r.model_dump()) for r in reservations[:limit]]
+        next_cursor = None
+        if len(reservations) > limit:
+            last = items[-1]
+            next_cursor = encode_cursor(last.start_time, last.uuid)
+        return ReservationPageDto(items=items, next_cursor=next_cursor)
+
+    def search_availability(self, restaurant_id: UUID, party_size: int, start: datetime, end: datetime,
+                            duration_minutes: int = 120, slot_minutes: int = 30) -> List[AvailableSlotDto]:
+        duration = timedelta(minutes=duration_minutes)
+        if duration > MAX_RESERVATION_DURATION or duration.total_seconds() <= 0:
+            raise HTTPException(status_code=400, detail="Invalid reservation duration (max 4 hours).")
+        if party_size <= 0:
+            raise HTTPException(status_code=400, detail="Party size must be greater than zero.")
+        if end <= start or end - start > MAX_SEARCH_WINDOW:
+            raise HTTPException(status_code=400, detail="Invalid search window (max 7 days).")
+
+        restaurant = self.restaurant_repo.get_by_id(restaurant_id)
+        if not restaurant:
+            raise HTTPException(status_code=404, detail="Restaurant not found.")
+
+        slots = opening_slots(start, end, restaurant.opening_time, restaurant.closing_time,
+                              duration, timedelta(minutes=slot_minutes))
+        free = self.reservation_repo.find_free_table_slots(restaurant_id, party_size, slots)
+        return [AvailableSlotDto(**slot.model_dump()) for slot in free]
+
+    def check_slots(self, candidates: List[SlotCandidateDto]) -> List[SlotCheckResultDto]:
+        # Una consulta de rango para todas las mesas; cada candidato se resuelve en memoria
+        if any(c.end_time <= c.start_time for c in candidates):
+            raise HTTPException(status_code=400, detail="Each candidate must end after it starts.")
+        start = min(c.start_time for c in candidates)
+        end = max(c.end_time for c in candidates)
+        if end - start > MAX_SEARCH_WINDOW:
+            raise HTTPException(status_code=400, detail="Invalid search window (max 7 days).")
+
+        table_ids = list({c.table_id for c in candidates})
+        booked = self.reservation_repo.get_active_intervals_by_tables(table_ids, start, end)
+        taken = taken_slots(booked, [(c.table_id, c.start_time, c.end_time) for c in candidates])
+        return [SlotCheckResultDto(**c.model_dump(), available=not t) for c, t in zip(candidates, taken)]
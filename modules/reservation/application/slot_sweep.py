@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+from uuid import UUID
+
+Interval = Tuple[datetime, datetime]
+
+
+def _naive(value: datetime) -> datetime:
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+def taken_slots(booked: Dict[UUID, List[Interval]], candidates: Sequence[Tuple[UUID, datetime, datetime]]) -> List[bool]:
+    """
+    Para cada candidato (mesa, inicio, fin) indica si choca con alguna reserva de `booked`.
+
+    Barrido por mesa: las reservas se ordenan por inicio y los candidatos por fin; al avanzar
+    sobre los candidatos se incorporan las reservas que empiezan antes de su fin, llevando el
+    mayor fin visto. Un candidato está ocupado si ese máximo supera su inicio. Fuera de los
+    ordenamientos es una sola pasada, sin importar cuántos candidatos compartan mesa.
+    """
+    starts = [_naive(start) for _, start, _ in candidates]
+    ends = [_naive(end) for _, _, end in candidates]
+    by_table: Dict[UUID, List[int]] = {}
+    for i, (table_id, _, _) in enumerate(candidates):
+        by_table.setdefault(table_id, []).append(i)
+
+    taken = [False] * len(candidates)
+    for table_id, indexes in by_table.items():
+        intervals = sorted((_naive(s), _naive(e)) for s, e in booked.get(table_id, ()))
+        if not intervals:
+            continue
+        indexes.sort(key=ends.__getitem__)
+        j, max_end = 0, None
+        for i in indexes:
+            start, end = starts[i], ends[i]
+            while j < len(intervals) and intervals[j][0] < end:
+                if max_end is None or intervals[j][1] > max_end:
+                    max_end = intervals[j][1]
+                j += 1
+            taken[i] = max_end is not None and max_end > start
+    return taken
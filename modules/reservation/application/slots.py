@@ -0,0 +1,38 @@
+from datetime import datetime, time, timedelta
+from typing import List, Tuple
+
+def opening_slots(start: datetime, end: datetime, opening_time: time, closing_time: time,
+                  duration: timedelta, step: timedelta) -> List[Tuple[datetime, datetime]]:
+    """
+    Franjas [inicio, inicio + duration) con inicio en [start, end), alineadas a `step`
+    desde la hora de apertura y que terminan a más tardar a la hora de cierre.
+    """
+    start, end = start.replace(tzinfo=None), end.replace(tzinfo=None)
+    slots = []
+    day = start.date()
+    while day <= end.date():
+        opening = datetime.combine(day, opening_time)
+        closing = datetime.combine(day, closing_time)
+        slot_start = opening
+        if start > opening:
+            # Primer inicio alineado a la grilla que no sea anterior a `start`
+            steps = -(-(start - opening) // step)
+            slot_start = opening + steps * step
+        while slot_start < end and slot_start + duration <= closing:
+            slots.append((slot_start, slot_start + duration))
+            slot_start += step
+        day += timedelta(days=1)
+    return slots
+
+# Granularidad de los contadores de cubiertos por franja
+COVER_SLOT = timedelta(minutes=15)
+
+def cover_slots(start: datetime, end: datetime) -> List[datetime]:
+    """Inicios de las franjas de COVER_SLOT (alineadas a la hora) que toca el intervalo [start, end)."""
+    start, end = start.replace(tzinfo=None), end.replace(tzinfo=None)
+    slot = start.replace(minute=start.minute - start.minute % 15, second=0, microsecond=0)
+    slots = []
+    while slot < end:
+        slots.append(slot)
+        slot += COVER_SLOT
+    return slots
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Iterable, Optional
+
+from modules.reservation.domain.table_occupancy import TableOccupancy
+
+
+def _naive(value: datetime) -> datetime:
+    return value.replace(tzinfo=None)
+
+
+def best_fit_table(tables: Iterable[TableOccupancy], party_size: int, start: datetime, end: datetime,
+                   window_start: datetime, window_end: datetime) -> Optional[TableOccupancy]:
+    """
+    Mesa libre en [start, end) para `party_size` personas, elegida por mejor ajuste.
+
+    `tables` trae las reservas activas de cada mesa en [window_start, window_end). Gana la
+    mesa más chica que alcanza (no se sientan 2 personas en una de 8); entre mesas de igual
+    capacidad, la que deja menos tiempo muerto con sus reservas vecinas, para conservar
+    ventanas largas libres en las demás. Una sola pasada sobre los datos precargados.
+    """
+    start, end = _naive(start), _naive(end)
+    window_start, window_end = _naive(window_start), _naive(window_end)
+
+    best: Optional[TableOccupancy] = None
+    best_key = None
+    for table in tables:
+        if table.capacity < party_size:
+            continue
+        previous_end, next_start = window_start, window_end
+        for booked_start, booked_end in table.booked:
+            booked_start, booked_end = _naive(booked_start), _naive(booked_end)
+            if booked_start < end and booked_end > start:
+                break
+            if booked_end <= start:
+                previous_end = max(previous_end, booked_end)
+            else:
+                next_start = min(next_start, booked_start)
+        else:
+            key = (table.capacity, (start - previous_end) + (next_start - end), table.table_number)
+            if best_key is None or key < best_key:
+                best, best_key = table, key
+    return best
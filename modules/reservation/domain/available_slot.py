@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+
+class AvailableSlot(BaseModel):
+    table_id: UUID
+    table_number: int
+    capacity: int
+    location: str
+    start_time: datetime
+    end_time: datetime
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from uuid import UUID
+from typing import List, Optional
+from modules.reservation.domain.reservation import ReservationDetail
+
+class DaySheetPreOrder(BaseModel):
+    # Pre-orden con el nombre del plato ya resuelto (lo que la cocina debe preparar)
+    id: UUID
+    menu_item_id: UUID
+    menu_item_name: str
+    quantity: int
+    special_instructions: Optional[str] = None
+
+class DaySheetEntry(ReservationDetail):
+    # Una reserva de la hoja del día con todas sus pre-órdenes
+    pre_orders: List[DaySheetPreOrder] = []
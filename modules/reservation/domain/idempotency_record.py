@@ -0,0 +1,13 @@
+from uuid import UUID
+from pydantic import BaseModel
+from datetime import datetime
+
+class IdempotencyRecord(BaseModel):
+    # Respuesta guardada de un POST con Idempotency-Key, para devolverla en los reintentos
+    user_id: UUID
+    key: str
+    request_hash: str
+    status_code: int
+    response_body: str
+    created_at: datetime
+    expires_at: datetime
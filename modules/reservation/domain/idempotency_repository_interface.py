@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+from modules.reservation.domain.idempotency_record import IdempotencyRecord
+
+class IIdempotencyRepository(ABC):
+
+    @abstractmethod
+    def get(self, user_id: UUID, key: str, now: datetime) -> Optional[IdempotencyRecord]:
+        """Obtener la respuesta guardada para una clave de un usuario, si no venció"""
+        pass
+
+    @abstractmethod
+    def save(self, record: IdempotencyRecord) -> IdempotencyRecord:
+        """Guardar una respuesta; lanza IdempotencyKeyConflictError si la clave ya existe"""
+        pass
+
+    @abstractmethod
+    def delete_expired(self, now: datetime, limit: int) -> int:
+        """Eliminar hasta `limit` claves vencidas y devolver cuántas se borraron"""
+        pass
@@ -1,7 +1,7 @@
 from typing import Optional, List
 from uuid import UUID
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 
 class ReservationStatus(Enum):
@@ -20,3 +20,16 @@ class Reservation(BaseModel):
     special_instructions: Optional[str]
     
     status: ReservationStatus
+
+class ReservationDetail(Reservation):
+    # Reserva con los datos del restaurante ya resueltos por el repositorio (lecturas)
+    restaurant_name: Optional[str] = None
+    restaurant_id: Optional[UUID] = None
+    table_number: Optional[int] = None
+    pre_order_count: int = 0
+
+# Estados que ocupan una mesa (los usados por los chequeos de solapamiento)
+ACTIVE_STATUSES = (ReservationStatus.PENDING, ReservationStatus.CONFIRMED)
+
+# Duración máxima de una reserva (validada en el servicio)
+MAX_RESERVATION_DURATION = timedelta(hours=4)
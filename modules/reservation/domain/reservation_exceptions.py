@@ -0,0 +1,15 @@
+class ReservationConflictError(Exception):
+    """La base de datos rechazó la reserva porque la mesa ya está ocupada en ese horario."""
+    pass
+
+class ReservationUserConflictError(ReservationConflictError):
+    """El cliente ya tiene otra reserva activa que se solapa (re-chequeo contra la base al escribir)."""
+    pass
+
+class IdempotencyKeyConflictError(Exception):
+    """Otra petición con la misma Idempotency-Key guardó su respuesta primero."""
+    pass
+
+class SlotHoldConflictError(Exception):
+    """Otra retención vigente ocupa la mesa en ese horario."""
+    pass
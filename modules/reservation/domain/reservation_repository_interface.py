@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
-from modules.reservation.domain.reservation import Reservation
+from modules.reservation.domain.reservation import Reservation, ReservationDetail, ReservationStatus
+from modules.reservation.domain.available_slot import AvailableSlot
+from modules.reservation.domain.table_occupancy import TableOccupancy
+from modules.reservation.domain.day_sheet import DaySheetEntry
 
 class IReservationRepository(ABC):
     
@@ -26,16 +29,67 @@ class IReservationRepository(ABC):
         """Obtener reservas activas para una mesa en un rango de tiempo"""
         pass
 
+    @abstractmethod
+    def exists_active_by_user_and_time(self, user_id: UUID, start_time: datetime, end_time: datetime,
+                                       exclude: Optional[UUID] = None) -> bool:
+        """Indica si un usuario tiene alguna reserva activa (distinta de `exclude`) que solape el rango de tiempo"""
+        pass
+
+    @abstractmethod
+    def exists_active_by_table_and_time(self, table_id: UUID, start_time: datetime, end_time: datetime,
+                                        exclude: Optional[UUID] = None) -> bool:
+        """Indica si una mesa tiene alguna reserva activa (distinta de `exclude`) que solape el rango de tiempo"""
+        pass
+
     @abstractmethod
     def save(self, reservation: Reservation) -> Reservation:
         """Crear una nueva reserva"""
         pass
 
+    @abstractmethod
+    def bulk_save(self, reservations: List[Reservation]) -> List[Reservation]:
+        """Crear varias reservas con un solo INSERT. Lanza ReservationConflictError si alguna choca en la base"""
+        pass
+
+    @abstractmethod
+    def get_active_overlapping(self, table_id: UUID, user_id: UUID,
+                               intervals: List[Tuple[datetime, datetime]]) -> List[Reservation]:
+        """Obtener las reservas activas de la mesa o del cliente que solapan alguno de los intervalos, en una sola consulta"""
+        pass
+
     @abstractmethod
     def update(self, reservation: Reservation) -> Reservation:
         """Actualizar una reserva existente (ej: cancelar, confirmar, completar)"""
         pass
 
+    @abstractmethod
+    def transition_status(self, reservation_id: UUID, new_status: ReservationStatus,
+                          from_statuses: Iterable[ReservationStatus], user_id: Optional[UUID] = None,
+                          starts_after: Optional[datetime] = None) -> Optional[Reservation]:
+        """Cambiar el estado de una reserva con un único UPDATE condicional; None si no cumplía las condiciones"""
+        pass
+
+    @abstractmethod
+    def reschedule(self, reservation_id: UUID, start_time: datetime, end_time: datetime, table_id: UUID,
+                   from_statuses: Iterable[ReservationStatus], user_id: Optional[UUID] = None,
+                   starts_after: Optional[datetime] = None) -> Optional[Reservation]:
+        """Mover una reserva (horario y mesa) con un único UPDATE condicional; None si no cumplía las condiciones.
+        Lanza ReservationConflictError si la nueva franja choca con otra reserva activa de la mesa"""
+        pass
+
+    @abstractmethod
+    def bulk_transition_status_by_restaurant(self, restaurant_id: UUID, start: datetime, end: datetime,
+                                             new_status: ReservationStatus,
+                                             from_statuses: Iterable[ReservationStatus]) -> List[Reservation]:
+        """Cambiar el estado de todas las reservas de un restaurante que empiezan en [start, end) en una sola sentencia"""
+        pass
+
+    @abstractmethod
+    def bulk_transition_status_ended_before(self, end_before: datetime, new_status: ReservationStatus,
+                                            from_statuses: Iterable[ReservationStatus], limit: int) -> List[Reservation]:
+        """Cambiar el estado de hasta `limit` reservas que terminaron antes de `end_before`, en una sola sentencia"""
+        pass
+
     @abstractmethod
     def delete(self, reservation_id: UUID) -> None:
         """Eliminar una reserva"""
@@ -50,3 +104,58 @@ class IReservationRepository(ABC):
     def get_by_date_range(self, start: datetime, end: datetime) -> List[Reservation]:
         """Obtener todas las reservas en un rango de fechas"""
         pass
+
+    @abstractmethod
+    def get_detail_by_id(self, reservation_id: UUID) -> Optional[ReservationDetail]:
+        """Obtener una reserva con el nombre de su restaurante"""
+        pass
+
+    @abstractmethod
+    def get_details_by_user(self, user_id: UUID) -> List[ReservationDetail]:
+        """Obtener las reservas de un cliente con el nombre del restaurante (una sola consulta)"""
+        pass
+
+    @abstractmethod
+    def get_details_by_restaurant(self, restaurant_id: UUID, after: Optional[Tuple[datetime, UUID]] = None,
+                                  limit: Optional[int] = None) -> List[ReservationDetail]:
+        """Obtener las reservas de un restaurante con su nombre, ordenadas por (start_time, uuid) y paginables por keyset"""
+        pass
+
+    @abstractmethod
+    def get_details_by_date_range(self, start: datetime, end: datetime, after: Optional[Tuple[datetime, UUID]] = None,
+                                  limit: Optional[int] = None) -> List[ReservationDetail]:
+        """Obtener las reservas de un rango de fechas con el nombre del restaurante, paginables por keyset"""
+        pass
+
+    @abstractmethod
+    def iter_details_by_restaurant(self, restaurant_id: UUID) -> Iterator[ReservationDetail]:
+        """Recorrer las reservas de un restaurante con un cursor del servidor (memoria constante)"""
+        pass
+
+    @abstractmethod
+    def iter_details_by_date_range(self, start: datetime, end: datetime) -> Iterator[ReservationDetail]:
+        """Recorrer las reservas de un rango de fechas con un cursor del servidor (memoria constante)"""
+        pass
+
+    @abstractmethod
+    def get_day_sheet(self, restaurant_id: UUID, start: datetime, end: datetime,
+                      include_cancelled: bool = False) -> List[DaySheetEntry]:
+        """Obtener las reservas de un restaurante que empiezan en [start, end) con sus pre-órdenes y platos"""
+        pass
+
+    @abstractmethod
+    def find_free_table_slots(self, restaurant_id: UUID, party_size: int,
+                              slots: List[Tuple[datetime, datetime]]) -> List[AvailableSlot]:
+        """Obtener los pares (mesa, franja) libres de un restaurante para un grupo, en una sola consulta"""
+        pass
+
+    @abstractmethod
+    def get_active_intervals_by_tables(self, table_ids: List[UUID], start: datetime,
+                                       end: datetime) -> Dict[UUID, List[Tuple[datetime, datetime]]]:
+        """Obtener los intervalos de las reservas activas de varias mesas que solapan [start, end), en una sola consulta"""
+        pass
+
+    @abstractmethod
+    def get_table_occupancy(self, restaurant_id: UUID, start: datetime, end: datetime) -> List[TableOccupancy]:
+        """Obtener todas las mesas de un restaurante con sus reservas activas en [start, end), en una sola consulta"""
+        pass
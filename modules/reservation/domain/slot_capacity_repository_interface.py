@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+from uuid import UUID
+from datetime import datetime
+
+class ISlotCapacityRepository(ABC):
+
+    @abstractmethod
+    def add_covers(self, restaurant_id: UUID, slots: List[datetime], covers: int, capacity: Optional[int]) -> bool:
+        """Sumar `covers` a cada franja si ninguna pasa de `capacity` (None = sin tope); False y sin cambios si no entra"""
+        pass
+
+    @abstractmethod
+    def remove_covers(self, restaurant_id: UUID, slots: List[datetime], covers: int) -> None:
+        """Restar `covers` de cada franja (cancelaciones y reprogramaciones)"""
+        pass
+
+    @abstractmethod
+    def remove_covers_by_slot(self, restaurant_id: UUID, covers_by_slot: Dict[datetime, int]) -> None:
+        """Restar de cada franja sus cubiertos liberados en una sola escritura (cancelaciones masivas)"""
+        pass
+
+    @abstractmethod
+    def get_covers(self, restaurant_id: UUID, start: datetime, end: datetime) -> Dict[datetime, int]:
+        """Obtener los cubiertos ocupados por franja en [start, end)"""
+        pass
@@ -0,0 +1,14 @@
+from uuid import UUID
+from pydantic import BaseModel
+from datetime import datetime
+
+class SlotHold(BaseModel):
+    # Retención temporal de (mesa, intervalo) mientras el cliente completa la reserva; el id es el token
+    id: UUID
+    user_id: UUID
+    table_id: UUID
+    restaurant_id: UUID
+    start_time: datetime
+    end_time: datetime
+    num_people: int
+    expires_at: datetime
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from modules.reservation.domain.slot_hold import SlotHold
+
+class ISlotHoldRepository(ABC):
+
+    @abstractmethod
+    def create(self, hold: SlotHold, now: datetime) -> SlotHold:
+        """Guardar una retención; lanza SlotHoldConflictError si la mesa ya está retenida en ese intervalo"""
+        pass
+
+    @abstractmethod
+    def get(self, hold_id: UUID, now: datetime) -> Optional[SlotHold]:
+        """Obtener una retención por su token, si no venció"""
+        pass
+
+    @abstractmethod
+    def exists_active_by_table_and_time(self, table_id: UUID, start_time: datetime, end_time: datetime,
+                                        now: datetime, exclude_user: Optional[UUID] = None) -> bool:
+        """Indica si la mesa tiene una retención vigente (de otro cliente que `exclude_user`) que solape el rango"""
+        pass
+
+    @abstractmethod
+    def get_active_by_restaurant(self, restaurant_id: UUID, start_time: datetime, end_time: datetime,
+                                 now: datetime, exclude_user: Optional[UUID] = None) -> List[SlotHold]:
+        """Obtener las retenciones vigentes de un restaurante que solapan el rango"""
+        pass
+
+    @abstractmethod
+    def delete(self, hold_id: UUID) -> bool:
+        """Eliminar una retención; devuelve si existía"""
+        pass
+
+    @abstractmethod
+    def delete_expired(self, now: datetime, limit: int) -> int:
+        """Eliminar hasta `limit` retenciones vencidas y devolver cuántas se borraron"""
+        pass
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import List, Tuple
+
+class TableOccupancy(BaseModel):
+    # Una mesa con los intervalos [inicio, fin) de sus reservas activas dentro de una ventana de tiempo
+    table_id: UUID
+    table_number: int
+    capacity: int
+    location: str
+    booked: List[Tuple[datetime, datetime]] = []
@@ -0,0 +1,30 @@
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+from datetime import date, datetime, timedelta
+from enum import Enum
+
+class WaitlistStatus(Enum):
+    WAITING = "WAITING"
+    PROMOTED = "PROMOTED"
+    CANCELLED = "CANCELLED"
+
+class WaitlistEntry(BaseModel):
+    # Pedido de mesa para `party_size` personas que acepta empezar en cualquier
+    # momento de [window_start, window_end] y dura `duration_minutes`
+    id: UUID
+    user_id: UUID
+    restaurant_id: UUID
+    party_size: int
+    window_start: datetime
+    window_end: datetime
+    duration_minutes: int
+    # Día de window_start: la cola se consulta por (restaurante, día), nunca entera
+    time_bucket: date
+    status: WaitlistStatus
+    created_at: datetime
+    reservation_id: Optional[UUID] = None
+
+    @property
+    def duration(self) -> timedelta:
+        return timedelta(minutes=self.duration_minutes)
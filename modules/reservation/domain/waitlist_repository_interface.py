@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from uuid import UUID
+from datetime import date, datetime
+from modules.reservation.domain.waitlist_entry import WaitlistEntry
+
+class IWaitlistRepository(ABC):
+
+    @abstractmethod
+    def save(self, entry: WaitlistEntry) -> WaitlistEntry:
+        """Agregar una entrada a la lista de espera"""
+        pass
+
+    @abstractmethod
+    def get_by_id(self, entry_id: UUID) -> Optional[WaitlistEntry]:
+        """Obtener una entrada por su ID"""
+        pass
+
+    @abstractmethod
+    def get_by_user(self, user_id: UUID) -> List[WaitlistEntry]:
+        """Obtener las entradas de un cliente"""
+        pass
+
+    @abstractmethod
+    def find_candidates(self, restaurant_id: UUID, buckets: List[date], max_party_size: int,
+                        start: datetime, end: datetime, limit: int) -> List[WaitlistEntry]:
+        """Entradas en espera de un restaurante en esos días que podrían usar el intervalo liberado, por orden de llegada"""
+        pass
+
+    @abstractmethod
+    def mark_promoted(self, entry_id: UUID, reservation_id: UUID) -> bool:
+        """Marcar una entrada en espera como promovida; False si ya no estaba en espera"""
+        pass
+
+    @abstractmethod
+    def cancel(self, entry_id: UUID, user_id: UUID) -> bool:
+        """Retirar de la lista una entrada en espera del cliente; False si no estaba en espera"""
+        pass
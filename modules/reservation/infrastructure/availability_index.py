@@ -0,0 +1,260 @@
+import os
+import threading
+import time as _time
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+from modules.reservation.domain.reservation import Reservation, ACTIVE_STATUSES
+
+
+def naive(value: datetime) -> datetime:
+    # Las columnas son "timestamp without time zone": Postgres descarta el offset,
+    # así que el índice compara con la misma semántica.
+    return value.replace(tzinfo=None) if value.tzinfo else value
+
+
+def days_touched(start_time: datetime, end_time: datetime) -> List[date]:
+    """Días calendario que toca el intervalo [start_time, end_time)."""
+    start_time, end_time = naive(start_time), naive(end_time)
+    first = start_time.date()
+    last = max(first, (end_time - timedelta(microseconds=1)).date())
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+
+class BookedInterval(NamedTuple):
+    reservation_id: UUID
+    table_id: UUID
+    user_id: UUID
+    start_time: datetime
+    end_time: datetime
+
+    @classmethod
+    def from_reservation(cls, reservation: Reservation) -> "BookedInterval":
+        return cls(
+            reservation.uuid,
+            reservation.table_id,
+            reservation.user_id,
+            naive(reservation.start_time),
+            naive(reservation.end_time),
+        )
+
+
+class IntervalSet:
+    """Intervalos [start, end) ordenados por inicio, con búsqueda de solapamiento en O(log n)."""
+
+    def __init__(self):
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+        self._ids: List[UUID] = []
+        self._max_span = timedelta(0)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, reservation_id: UUID) -> bool:
+        return reservation_id in self._ids
+
+    def reservation_ids(self) -> List[UUID]:
+        return list(self._ids)
+
+    def add(self, reservation_id: UUID, start: datetime, end: datetime) -> None:
+        self.discard(reservation_id)
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._ids.insert(i, reservation_id)
+        self._max_span = max(self._max_span, end - start)
+
+    def discard(self, reservation_id: UUID) -> bool:
+        try:
+            i = self._ids.index(reservation_id)
+        except ValueError:
+            return False
+        del self._starts[i], self._ends[i], self._ids[i]
+        return True
+
+    def overlaps(self, start: datetime, end: datetime, exclude: Optional[UUID] = None) -> bool:
+        return bool(self.overlapping(start, end, exclude, first_only=True))
+
+    def overlapping(self, start: datetime, end: datetime, exclude: Optional[UUID] = None,
+                    first_only: bool = False) -> List[UUID]:
+        # Solo pueden solapar los intervalos que empiezan antes de `end` y después de
+        # `start - max_span`; con duraciones acotadas eso son pocos elementos.
+        found = []
+        i = bisect_left(self._starts, end) - 1
+        lower = start - self._max_span
+        while i >= 0 and self._starts[i] > lower:
+            if self._ends[i] > start and self._ids[i] != exclude:
+                found.append(self._ids[i])
+                if first_only:
+                    break
+            i -= 1
+        return found
+
+
+BucketKey = Tuple[str, UUID, date]
+
+
+class AvailabilityIndex:
+    """
+    Caché en proceso de intervalos reservados por mesa y por usuario, agrupados por día.
+
+    Un bucket solo responde consultas cuando está "cargado" (el repositorio lo llenó
+    desde la base de datos) y no ha vencido su TTL; las escrituras del propio proceso
+    lo mantienen coherente. Las escrituras de otros workers se ven al recargar.
+
+    Es un filtro rápido, no la garantía: por mesa la da la restricción de exclusión y por
+    cliente el re-chequeo contra la base que hace el repositorio al escribir. Un acierto
+    tampoco se da por bueno: el repositorio lo confirma contra la base antes de rechazar.
+    """
+
+    TABLE = "table"
+    USER = "user"
+
+    def __init__(self, ttl_seconds: float = 60.0, clock=_time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._buckets: Dict[BucketKey, IntervalSet] = {}
+        self._expires: Dict[BucketKey, float] = {}
+        self._loaded: Set[BucketKey] = set()
+        self._locations: Dict[UUID, List[BucketKey]] = {}
+        # Reservas canceladas recientemente: una carga en vuelo no debe resucitarlas
+        self._tombstones: Dict[UUID, float] = {}
+
+    # --- Consultas ---
+
+    def is_loaded(self, kind: str, key_id: UUID, day: date) -> bool:
+        key = (kind, key_id, day)
+        with self._lock:
+            if key not in self._loaded:
+                return False
+            if self._expires[key] <= self._clock():
+                self._evict(key)
+                return False
+            return True
+
+    def overlaps(self, kind: str, key_id: UUID, start_time: datetime, end_time: datetime,
+                 exclude: Optional[UUID] = None) -> bool:
+        start_time, end_time = naive(start_time), naive(end_time)
+        with self._lock:
+            for day in days_touched(start_time, end_time):
+                bucket = self._buckets.get((kind, key_id, day))
+                if bucket is not None and bucket.overlaps(start_time, end_time, exclude):
+                    return True
+            return False
+
+    def overlapping(self, kind: str, key_id: UUID, start_time: datetime, end_time: datetime,
+                    exclude: Optional[UUID] = None) -> List[UUID]:
+        """Reservas del índice que solapan el rango (las mismas que hacen verdadero a `overlaps`)."""
+        start_time, end_time = naive(start_time), naive(end_time)
+        found: List[UUID] = []
+        with self._lock:
+            for day in days_touched(start_time, end_time):
+                bucket = self._buckets.get((kind, key_id, day))
+                if bucket is not None:
+                    found.extend(r for r in bucket.overlapping(start_time, end_time, exclude) if r not in found)
+        return found
+
+    # --- Carga desde la base de datos ---
+
+    def load(self, kind: str, key_ids: Iterable[UUID], day: date, intervals: Iterable[BookedInterval]) -> None:
+        """Marca los buckets (kind, key_id, day) como cargados y les agrega los intervalos."""
+        now = self._clock()
+        with self._lock:
+            self._purge_expired(now)
+            for key_id in key_ids:
+                key = (kind, key_id, day)
+                self._buckets.setdefault(key, IntervalSet())
+                self._expires[key] = now + self.ttl_seconds
+                self._loaded.add(key)
+            for interval in intervals:
+                if interval.reservation_id not in self._tombstones:
+                    self._insert(interval)
+
+    # --- Coherencia con las escrituras ---
+
+    def add(self, reservation: Reservation) -> None:
+        """Registra (o reubica) una reserva; si dejó de estar activa la quita."""
+        if reservation.status not in ACTIVE_STATUSES:
+            self.discard(reservation.uuid)
+            return
+        with self._lock:
+            self._tombstones.pop(reservation.uuid, None)
+            self._remove(reservation.uuid)
+            self._insert(BookedInterval.from_reservation(reservation))
+
+    def discard(self, reservation_id: UUID) -> None:
+        with self._lock:
+            self._remove(reservation_id)
+            self._tombstones[reservation_id] = self._clock() + self.ttl_seconds
+
+    def forget(self, reservation_ids: Iterable[UUID]) -> None:
+        """
+        Quita reservas que la base ya no confirma (otro worker las canceló o movió). Sin lápida:
+        si se movieron, la próxima carga del día nuevo tiene que poder traerlas.
+        """
+        with self._lock:
+            for reservation_id in reservation_ids:
+                self._remove(reservation_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._expires.clear()
+            self._loaded.clear()
+            self._locations.clear()
+            self._tombstones.clear()
+
+    # --- Internos (con el lock tomado) ---
+
+    def _insert(self, interval: BookedInterval) -> None:
+        keys = self._locations.setdefault(interval.reservation_id, [])
+        for day in days_touched(interval.start_time, interval.end_time):
+            for key in ((self.TABLE, interval.table_id, day), (self.USER, interval.user_id, day)):
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    # Bucket aún no cargado: se conserva un TTL por si hay una carga en vuelo
+                    bucket = self._buckets[key] = IntervalSet()
+                    self._expires[key] = self._clock() + self.ttl_seconds
+                bucket.add(interval.reservation_id, interval.start_time, interval.end_time)
+                if key not in keys:
+                    keys.append(key)
+
+    def _remove(self, reservation_id: UUID) -> None:
+        for key in self._locations.pop(reservation_id, []):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(reservation_id)
+
+    def _evict(self, key: BucketKey) -> None:
+        self._expires.pop(key, None)
+        self._loaded.discard(key)
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            return
+        for reservation_id in bucket.reservation_ids():
+            keys = self._locations.get(reservation_id)
+            if keys and key in keys:
+                keys.remove(key)
+                if not keys:
+                    del self._locations[reservation_id]
+
+    def _purge_expired(self, now: float) -> None:
+        for key in [k for k, expires_at in self._expires.items() if expires_at <= now]:
+            self._evict(key)
+        for reservation_id in [r for r, expires_at in self._tombstones.items() if expires_at <= now]:
+            del self._tombstones[reservation_id]
+
+
+# Instancia compartida por todos los repositorios del proceso
+availability_index = AvailabilityIndex(
+    ttl_seconds=float(os.getenv("AVAILABILITY_INDEX_TTL_SECONDS", "60"))
+)
@@ -0,0 +1,25 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, Text
+from uuid import UUID
+from datetime import datetime
+from modules.reservation.domain.idempotency_record import IdempotencyRecord
+
+class IdempotencyKeyDB(SQLModel, table=True):
+    __tablename__ = "idempotency_keys"
+
+    # Las claves son por usuario: dos clientes pueden generar el mismo valor
+    user_id: UUID = Field(primary_key=True)
+    key: str = Field(primary_key=True, max_length=255)
+    request_hash: str = Field(max_length=64)
+    status_code: int
+    response_body: str = Field(sa_column=Column(Text, nullable=False))
+    created_at: datetime
+    expires_at: datetime = Field(index=True)
+
+# Convertir de IdempotencyKeyDB (infraestructura) a IdempotencyRecord (dominio)
+def to_domain(record_db: IdempotencyKeyDB) -> IdempotencyRecord:
+    return IdempotencyRecord(**record_db.model_dump())
+
+# Convertir de IdempotencyRecord (dominio) a IdempotencyKeyDB (infraestructura)
+def to_db(record: IdempotencyRecord) -> IdempotencyKeyDB:
+    return IdempotencyKeyDB(**record.model_dump())
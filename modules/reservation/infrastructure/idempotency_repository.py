@@ -0,0 +1,42 @@
+from sqlmodel import Session, select, delete
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+from modules.core.unit_of_work import commit, rollback
+from modules.reservation.domain.idempotency_record import IdempotencyRecord
+from modules.reservation.domain.idempotency_repository_interface import IIdempotencyRepository
+from modules.reservation.domain.reservation_exceptions import IdempotencyKeyConflictError
+from modules.reservation.infrastructure.idempotency_db_model import IdempotencyKeyDB, to_domain, to_db
+
+class IdempotencyRepository(IIdempotencyRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, user_id: UUID, key: str, now: datetime) -> Optional[IdempotencyRecord]:
+        record = self.db.get(IdempotencyKeyDB, (user_id, key))
+        if not record or record.expires_at <= now:
+            return None
+        return to_domain(record)
+
+    def save(self, record: IdempotencyRecord) -> IdempotencyRecord:
+        self.db.add(to_db(record))
+        try:
+            commit(self.db)
+        except IntegrityError as e:
+            # Se descarta todo el intento: dentro de una unidad de trabajo revierte ella, con la reserva
+            rollback(self.db)
+            raise IdempotencyKeyConflictError(record.key) from e
+        return record
+
+    def delete_expired(self, now: datetime, limit: int) -> int:
+        expired = (
+            select(IdempotencyKeyDB.user_id, IdempotencyKeyDB.key)
+            .where(IdempotencyKeyDB.expires_at <= now)
+            .limit(limit)
+        )
+        stmt = delete(IdempotencyKeyDB).where(tuple_(IdempotencyKeyDB.user_id, IdempotencyKeyDB.key).in_(expired))
+        result = self.db.exec(stmt)
+        commit(self.db)
+        return result.rowcount
@@ -1,19 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, Security, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Security, status, Query, Header
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import SecurityScopes
-from typing import List
+from typing import List, Optional, Union
 from uuid import UUID
-from datetime import datetime
+import hashlib
+from datetime import date, datetime
 from sqlmodel import Session
-from modules.core.db_connection import get_db
+from modules.core.db_connection import get_db, engine
+from modules.core.unit_of_work import UnitOfWork
 from modules.auth.infrastructure.auth_controller import get_current_user
 from modules.auth.domain.user import UserRole
 from modules.reservation.application.reservation_services import ReservationService
 from modules.reservation.infrastructure.reservation_repository import ReservationRepository
+from modules.reservation.infrastructure.idempotency_repository import IdempotencyRepository
+from modules.reservation.infrastructure.waitlist_repository import WaitlistRepository
+from modules.reservation.infrastructure.slot_hold_repository import SlotHoldRepository
+from modules.reservation.infrastructure.slot_capacity_repository import SlotCapacityRepository
 from modules.restaurant.infrastructure.table_repository import TableRepository
 from modules.menu.infrastructure.menu_repository import MenuRepository
 from modules.restaurant.infrastructure.restaurant_repository import RestaurantRepository
 from modules.reservation.application.dtos.reservation_create_dto import ReservationCreateDto
 from modules.reservation.application.dtos.reservation_response_dto import ReservationResponseDto
+from modules.reservation.application.dtos.reservation_reschedule_dto import ReservationRescheduleDto
+from modules.reservation.application.dtos.reservation_series_dto import ReservationSeriesCreateDto, ReservationSeriesResultDto
+from modules.reservation.application.dtos.reservation_page_dto import ReservationPageDto
+from modules.reservation.application.dtos.available_slot_dto import AvailableSlotDto
+from modules.reservation.application.dtos.slot_check_dto import SlotCheckRequestDto, SlotCheckResultDto
+from modules.reservation.application.dtos.bulk_cancel_result_dto import BulkCancelResultDto
+from modules.reservation.application.dtos.day_sheet_dto import DaySheetDto
+from modules.reservation.application.dtos.waitlist_create_dto import WaitlistCreateDto
+from modules.reservation.application.dtos.waitlist_entry_response_dto import WaitlistEntryResponseDto
+from modules.reservation.application.dtos.slot_hold_dto import SlotHoldConfirmDto, SlotHoldCreateDto, SlotHoldResponseDto
 
 router = APIRouter()
 
@@ -23,16 +40,71 @@ def get_reservation_service(db: Session = Depends(get_db)) -> ReservationService
     table_repo = TableRepository(db)
     menu_repo = MenuRepository(db)
     restaurant_repo = RestaurantRepository(db)
-    return ReservationService(reservation_repo, table_repo, menu_repo, restaurant_repo)
+    idempotency_repo = IdempotencyRepository(db)
+    waitlist_repo = WaitlistRepository(db)
+    hold_repo = SlotHoldRepository(db)
+    capacity_repo = SlotCapacityRepository(db)
+    return ReservationService(reservation_repo, table_repo, menu_repo, restaurant_repo, UnitOfWork(db),
+                              idempotency_repo, waitlist_repo, hold_repo, capacity_repo)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+DEFAULT_PAGE_SIZE = 100
+
+def wants_ndjson(accept: Optional[str]) -> bool:
+    return bool(accept) and NDJSON_MEDIA_TYPE in accept
+
+def ndjson_response(produce) -> StreamingResponse:
+    # Las dependencias con yield (get_db) se cierran antes de enviar el cuerpo,
+    # así que el stream abre su propia sesión y la mantiene mientras escribe filas.
+    def body():
+        with Session(engine) as db:
+            for dto in produce(get_reservation_service(db)):
+                yield dto.model_dump_json() + "\n"
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match puede traer varias etiquetas, "*" o etiquetas débiles (W/"...")
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+def cached_json_response(dto, if_none_match: Optional[str]) -> Response:
+    """Responde el DTO con su ETag; si el cliente ya tiene esa versión, 304 sin cuerpo."""
+    body = dto.model_dump_json().encode()
+    etag = etag_for(body)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # POST /reservations/
+# Con "Idempotency-Key" un reintento recibe la respuesta del primer intento sin volver a ejecutarlo
 @router.post("/", response_model=ReservationResponseDto, status_code=status.HTTP_201_CREATED)
 def create_reservation(
     dto: ReservationCreateDto,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", min_length=1, max_length=255),
     service: ReservationService = Depends(get_reservation_service),
     current_user = Security(get_current_user, scopes=["reservation:write"])
 ):
-    return service.create_reservation(current_user.uuid, dto)
+    if idempotency_key:
+        replay = service.get_idempotent_response(current_user.uuid, idempotency_key, dto)
+        if replay:
+            return replay
+    return service.create_reservation(current_user.uuid, dto, idempotency_key)
+
+# POST /reservations/series
+# Serie semanal o quincenal sobre la misma mesa; las ocurrencias ocupadas se informan en "conflicts"
+@router.post("/series", response_model=ReservationSeriesResultDto, status_code=status.HTTP_201_CREATED)
+def create_reservation_series(
+    dto: ReservationSeriesCreateDto,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["reservation:write"])
+):
+    return service.create_series(current_user.uuid, dto)
 
 # GET /reservations/
 @router.get("/", response_model=List[ReservationResponseDto])
@@ -42,18 +114,108 @@ def list_user_reservations(
 ):
     return service.get_reservations_by_user(current_user.uuid)
 
-# GET /reservations/range?start=...&end=...
-@router.get("/range", response_model=List[ReservationResponseDto])
+# GET /reservations/range?start=...&end=...[&limit=...&cursor=...]
+# Con "Accept: application/x-ndjson" las filas se escriben a medida que llegan.
+@router.get("/range", response_model=Union[ReservationPageDto, List[ReservationResponseDto]])
 def get_reservations_by_date_range(
     start: datetime = Query(...),
     end: datetime = Query(...),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    accept: Optional[str] = Header(None),
     service: ReservationService = Depends(get_reservation_service),
     current_user = Security(get_current_user, scopes=["admin:reservation"])
 ):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Only admins can access this data.")
+    if wants_ndjson(accept):
+        return ndjson_response(lambda s: s.stream_by_date_range(start, end))
+    if limit is not None or cursor is not None:
+        return service.get_by_date_range_page(start, end, limit or DEFAULT_PAGE_SIZE, cursor)
     return service.get_by_date_range(start, end)
 
+# GET /reservations/availability?restaurant_id=...&party_size=...&start=...&end=...
+@router.get("/availability", response_model=List[AvailableSlotDto])
+def search_availability(
+    restaurant_id: UUID = Query(...),
+    party_size: int = Query(..., ge=1),
+    start: datetime = Query(...),
+    end: datetime = Query(...),
+    duration_minutes: int = Query(120, ge=15, le=240),
+    slot_minutes: int = Query(30, ge=5, le=240),
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["reservation:read", "admin:reservation"])
+):
+    return service.search_availability(restaurant_id, party_size, start, end, duration_minutes, slot_minutes)
+
+# POST /reservations/availability/check
+# Responde en orden, para cada (mesa, inicio, fin), si está libre; una sola consulta por llamada
+@router.post("/availability/check", response_model=List[SlotCheckResultDto])
+def check_slots(
+    dto: SlotCheckRequestDto,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["reservation:read", "admin:reservation"])
+):
+    return service.check_slots(dto.candidates)
+
+# POST /reservations/waitlist
+# Si una cancelación libera una mesa compatible, la entrada se convierte en reserva automáticamente
+@router.post("/waitlist", response_model=WaitlistEntryResponseDto, status_code=status.HTTP_201_CREATED)
+def join_waitlist(
+    dto: WaitlistCreateDto,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["reservation:write"])
+):
+    return service.join_waitlist(current_user.uuid, dto)
+
+# GET /reservations/waitlist
+@router.get("/waitlist", response_model=List[WaitlistEntryResponseDto])
+def list_user_waitlist(
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["reservation:read"])
+):
+    return service.get_waitlist_by_user(current_user.uuid)
+
+# DELETE /reservations/waitlist/{id}
+@router.delete("/waitlist/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
+def leave_waitlist(
+    entry_id: UUID,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["reservation:write"])
+):
+    service.leave_waitlist(entry_id, current_user.uuid)
+    return
+
+# POST /reservations/holds
+# Retiene la mesa unos minutos mientras el cliente elige pre-órdenes; el id devuelto es el token
+@router.post("/holds", response_model=SlotHoldResponseDto, status_code=status.HTTP_201_CREATED)
+def create_hold(
+    dto: SlotHoldCreateDto,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["reservation:write"])
+):
+    return service.create_hold(current_user.uuid, dto)
+
+# POST /reservations/holds/{id}/confirm
+@router.post("/holds/{hold_id}/confirm", response_model=ReservationResponseDto, status_code=status.HTTP_201_CREATED)
+def confirm_hold(
+    hold_id: UUID,
+    dto: SlotHoldConfirmDto,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["reservation:write"])
+):
+    return service.confirm_hold(hold_id, current_user.uuid, dto)
+
+# DELETE /reservations/holds/{id}
+@router.delete("/holds/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+def release_hold(
+    hold_id: UUID,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["reservation:write"])
+):
+    service.release_hold(hold_id, current_user.uuid)
+    return
+
 # GET /reservations/{id}
 @router.get("/{reservation_id}", response_model=ReservationResponseDto)
 def get_reservation_by_id(
@@ -66,6 +228,18 @@ def get_reservation_by_id(
         raise HTTPException(status_code=403, detail="You can only access your own reservations.")
     return reservation
 
+# PATCH /reservations/{id}
+# Mueve la reserva a otra franja (y opcionalmente otra mesa del restaurante) en una sola transacción
+@router.patch("/{reservation_id}", response_model=ReservationResponseDto)
+def reschedule_reservation(
+    reservation_id: UUID,
+    dto: ReservationRescheduleDto,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["reservation:write", "admin:reservation"])
+):
+    is_admin = current_user.role == UserRole.ADMIN
+    return service.reschedule_reservation(reservation_id, current_user.uuid, dto, is_admin)
+
 # DELETE /reservations/{id}
 @router.delete("/{reservation_id}", status_code=status.HTTP_204_NO_CONTENT)
 def cancel_reservation(
@@ -77,13 +251,50 @@ def cancel_reservation(
     service.cancel_reservation(reservation_id, current_user.uuid, is_admin)
     return
 
-# GET /reservations/restaurant/{restaurant_id}
-@router.get("/restaurant/{restaurant_id}", response_model=List[ReservationResponseDto])
+# GET /reservations/restaurant/{restaurant_id}[?limit=...&cursor=...]
+@router.get("/restaurant/{restaurant_id}", response_model=Union[ReservationPageDto, List[ReservationResponseDto]])
 def get_reservations_by_restaurant(
     restaurant_id: UUID,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    accept: Optional[str] = Header(None),
     service: ReservationService = Depends(get_reservation_service),
     current_user = Security(get_current_user, scopes=["admin:reservation"])
 ):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Only admins can access this data.")
+    if wants_ndjson(accept):
+        return ndjson_response(lambda s: s.stream_all_by_restaurant(restaurant_id))
+    if limit is not None or cursor is not None:
+        return service.get_all_by_restaurant_page(restaurant_id, limit or DEFAULT_PAGE_SIZE, cursor)
     return service.get_all_by_restaurant(restaurant_id)
+
+# GET /reservations/restaurant/{restaurant_id}/day-sheet?date=YYYY-MM-DD
+# Reservas del día con sus pre-órdenes y nombres de platos en una sola respuesta; con
+# "If-None-Match" una hoja sin cambios devuelve 304
+@router.get("/restaurant/{restaurant_id}/day-sheet", response_model=DaySheetDto)
+def get_day_sheet(
+    restaurant_id: UUID,
+    day: date = Query(..., alias="date"),
+    include_cancelled: bool = Query(False),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["admin:reservation"])
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can access this data.")
+    return cached_json_response(service.get_day_sheet(restaurant_id, day, include_cancelled), if_none_match)
+
+# POST /reservations/restaurant/{restaurant_id}/cancel?start=...&end=...
+# Cancela en una sola sentencia todas las reservas activas que empiezan en [start, end)
+@router.post("/restaurant/{restaurant_id}/cancel", response_model=BulkCancelResultDto)
+def cancel_reservations_by_restaurant(
+    restaurant_id: UUID,
+    start: datetime = Query(...),
+    end: datetime = Query(...),
+    service: ReservationService = Depends(get_reservation_service),
+    current_user = Security(get_current_user, scopes=["admin:reservation"])
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can cancel reservations in bulk.")
+    return service.cancel_by_restaurant(restaurant_id, start, end)
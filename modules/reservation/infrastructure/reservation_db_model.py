@@ -1,25 +1,55 @@
 from sqlmodel import Column, SQLModel, Field, Relationship
+from sqlalchemy import Index, event, text
 from uuid import UUID, uuid4
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 from modules.reservation.domain.reservation import Reservation, ReservationStatus
+from modules.reservation.infrastructure.reservation_partitions import NO_DOUBLE_BOOKING_CONSTRAINT, setup_partitions
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from modules.menu.infrastructure.pre_order_item_db_model import PreOrderItemDB
 
+# Filtro de los índices parciales: solo las reservas activas participan en los chequeos de solapamiento
+ACTIVE_STATUS_FILTER = text("status IN ('PENDING', 'CONFIRMED')")
+
 class ReservationDBModel(SQLModel, Reservation, table=True):
+    __table_args__ = (
+        # Solapamiento por mesa (creación, carga restaurante-día, búsqueda de disponibilidad)
+        Index("ix_reservation_active_table_time", "table_id", "start_time", "end_time",
+              postgresql_where=ACTIVE_STATUS_FILTER, sqlite_where=ACTIVE_STATUS_FILTER),
+        # Solapamiento por cliente
+        Index("ix_reservation_active_user_time", "user_id", "start_time", "end_time",
+              postgresql_where=ACTIVE_STATUS_FILTER, sqlite_where=ACTIVE_STATUS_FILTER),
+        # Rangos de fechas y paginación por keyset (start_time, uuid); dashboard
+        Index("ix_reservation_start_time_uuid", "start_time", "uuid"),
+        # Listados por restaurante (join por mesa) ordenados por fecha
+        Index("ix_reservation_table_start_time", "table_id", "start_time"),
+        # Barrido de reservas terminadas (solo las activas: el índice se vacía a medida que se completan)
+        Index("ix_reservation_active_end_time", "end_time",
+              postgresql_where=ACTIVE_STATUS_FILTER, sqlite_where=ACTIVE_STATUS_FILTER),
+        # Particionada por mes de start_time (ver reservation_partitions); la PK debe incluir la clave
+        {"postgresql_partition_by": "RANGE (start_time)"},
+    )
+
     uuid: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     user_id: UUID = Field(index=True)
     table_id: UUID = Field(foreign_key="tabledbmodel.id", index=True)
-    start_time: datetime
+    start_time: datetime = Field(primary_key=True)
     end_time: datetime
     num_people: int
     special_instructions: Optional[str] = None
     status: ReservationStatus = Field(default=ReservationStatus.PENDING)
     # Relación muchos a muchos con PreOrderItemDB
-    pre_orders: List["PreOrderItemDB"] = Relationship(back_populates="reservation")
+    # Sin FK en base (no hay clave única solo sobre uuid en una tabla particionada): join explícito
+    pre_orders: List["PreOrderItemDB"] = Relationship(
+        back_populates="reservation",
+        sa_relationship_kwargs={"primaryjoin": "ReservationDBModel.uuid == foreign(PreOrderItemDB.reservation_id)"},
+    )
+
+# Partición DEFAULT, restricción de exclusión por partición y meses próximos también con create_all
+event.listen(ReservationDBModel.__table__, "after_create", setup_partitions)
 
 def to_domain(res: ReservationDBModel) -> Reservation:
     return Reservation(
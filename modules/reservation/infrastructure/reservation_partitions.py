@@ -0,0 +1,213 @@
+"""
+Particionado mensual de reservationdbmodel (PARTITION BY RANGE (start_time), migración 3f1c9a7d2b64).
+
+Cada mes vive en su propia partición (reservationdbmodel_y2025m07) con su propia restricción de
+exclusión contra el doble booking; la partición DEFAULT recoge lo que caiga fuera de los meses
+creados. La restricción no ve las otras particiones: dos reservas de la misma mesa que se solapan
+sobre un cambio de mes (23:00-01:00 del 31 y 00:30 del 1) quedan en meses distintos, y ahí el que
+las separa es ReservationRepository (candado por mesa y re-chequeo, ver crosses_month_boundary). Las consultas que acotan start_time solo leen las particiones del rango (partition pruning),
+así los índices calientes crecen con los meses abiertos y no con todo el histórico.
+
+Mantenimiento (el sweeper crea los meses futuros en cada pasada; archivar es manual):
+
+    python -m modules.reservation.infrastructure.reservation_partitions list
+    python -m modules.reservation.infrastructure.reservation_partitions ensure --months-ahead 12
+    python -m modules.reservation.infrastructure.reservation_partitions archive --keep-months 24
+
+Archivar separa (DETACH) los meses viejos y los mueve al esquema reservation_archive: dejan de
+participar en las consultas de la aplicación pero se pueden consultar, volcar con pg_dump o borrar.
+"""
+import argparse
+import logging
+import re
+from datetime import date, datetime, time
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from modules.reservation.domain.reservation import MAX_RESERVATION_DURATION
+
+logger = logging.getLogger(__name__)
+
+TABLE = "reservationdbmodel"
+DEFAULT_PARTITION = f"{TABLE}_default"
+ARCHIVE_SCHEMA = "reservation_archive"
+MONTHS_AHEAD = 12
+
+# Una mesa no puede tener dos reservas activas que se solapen (ver migración 78b9366f9afb). Postgres no
+# admite esta exclusión sobre la tabla particionada, así que cada partición lleva la suya con este prefijo
+# y solo compara las reservas de su mes (los solapes entre meses, ver crosses_month_boundary).
+NO_DOUBLE_BOOKING_CONSTRAINT = "reservation_table_no_overlap"
+
+_PARTITION_NAME = re.compile(rf"^{TABLE}_y(\d{{4}})m(\d{{2}})$")
+_LOCK = "reservation_partitions"
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def crosses_month_boundary(start_time: datetime, end_time: datetime) -> bool:
+    """
+    Si una reserva de la mesa que se solape con [start_time, end_time) puede caer en otra partición.
+    Las que se solapan empiezan entre start_time - MAX_RESERVATION_DURATION y end_time: basta con
+    que ese tramo contenga un cambio de mes para que la exclusión de la partición no las compare.
+    """
+    next_month = add_months(month_start(start_time - MAX_RESERVATION_DURATION), 1)
+    return datetime.combine(next_month, time.min) < end_time
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_y{month.year:04d}m{month.month:02d}"
+
+def partition_month(name: str) -> Optional[date]:
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+def missing_partitions(existing: Iterable[str], first_month: date, months_ahead: int) -> List[date]:
+    """Meses de [first_month, first_month + months_ahead] que todavía no tienen partición."""
+    existing = set(existing)
+    months = [add_months(first_month, i) for i in range(months_ahead + 1)]
+    return [m for m in months if partition_name(m) not in existing]
+
+def archivable_partitions(existing: Iterable[str], keep_from: date) -> List[str]:
+    """Particiones mensuales que terminan antes de `keep_from` (la DEFAULT nunca se archiva)."""
+    return sorted(
+        name for name in existing
+        if partition_month(name) is not None and add_months(partition_month(name), 1) <= keep_from
+    )
+
+def _exclusion_ddl(table: str) -> str:
+    constraint = f"{NO_DOUBLE_BOOKING_CONSTRAINT}_{table[len(TABLE) + 1:]}"
+    return (
+        f"ALTER TABLE {table} ADD CONSTRAINT {constraint} "
+        "EXCLUDE USING gist (table_id WITH =, tsrange(start_time, end_time, '[)') WITH &&) "
+        "WHERE (status IN ('PENDING', 'CONFIRMED'))"
+    )
+
+def is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"),
+        {"table": TABLE},
+    ).scalar()
+
+def list_partitions(conn: Connection) -> List[str]:
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+        ),
+        {"table": TABLE},
+    )
+    return [row[0] for row in rows]
+
+def create_default_partition(conn: Connection) -> None:
+    conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+    conn.execute(text(_exclusion_ddl(DEFAULT_PARTITION)))
+
+def create_partition(conn: Connection, month: date, has_default: bool = True) -> str:
+    """
+    Crea la partición de `month` como tabla suelta y la adjunta: ATTACH solo toma SHARE UPDATE
+    EXCLUSIVE sobre la tabla padre (CREATE ... PARTITION OF bloquearía las lecturas).
+    """
+    name, start, end = partition_name(month), month, add_months(month, 1)
+    bounds = {"start": datetime.combine(start, datetime.min.time()), "end": datetime.combine(end, datetime.min.time())}
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS)"))
+    # CHECK con el rango del mes: ATTACH lo aprovecha y no recorre la tabla para validarla
+    conn.execute(text(
+        f"ALTER TABLE {name} ADD CONSTRAINT {name}_bounds "
+        f"CHECK (start_time >= '{start}' AND start_time < '{end}')"
+    ))
+    conn.execute(text(_exclusion_ddl(name)))
+    if has_default:
+        # Reservas del mes que cayeron en DEFAULT (meses sin partición): se mueven antes de adjuntar
+        conn.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE start_time >= :start AND start_time < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ), bounds)
+    conn.execute(text(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"))
+    conn.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT {name}_bounds"))
+    return name
+
+def ensure_partitions(conn: Connection, now: datetime, months_ahead: int = MONTHS_AHEAD) -> List[str]:
+    """Crea las particiones que falten desde el mes de `now` hasta `months_ahead` meses después."""
+    if not is_partitioned(conn) or not missing_partitions(list_partitions(conn), month_start(now), months_ahead):
+        return []
+    # Otro proceso puede estar creando los mismos meses: se serializa y se vuelve a mirar el catálogo
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:lock))"), {"lock": _LOCK})
+    existing = list_partitions(conn)
+    has_default = DEFAULT_PARTITION in existing
+    created = [
+        create_partition(conn, month, has_default)
+        for month in missing_partitions(existing, month_start(now), months_ahead)
+    ]
+    if created:
+        logger.info("Created reservation partitions: %s", ", ".join(created))
+    return created
+
+def archive_partitions(conn: Connection, keep_from: date) -> List[str]:
+    """
+    Separa las particiones de los meses anteriores a `keep_from` y las mueve a ARCHIVE_SCHEMA.
+    Un mes que todavía tiene reservas activas (PENDING o CONFIRMED) se deja en su lugar.
+    """
+    if not is_partitioned(conn):
+        return []
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:lock))"), {"lock": _LOCK})
+    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    archived = []
+    for name in archivable_partitions(list_partitions(conn), keep_from):
+        active = conn.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {name} WHERE status IN ('PENDING', 'CONFIRMED'))"
+        )).scalar()
+        if active:
+            logger.warning("Partition %s still has active reservations; not archived", name)
+            continue
+        conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+        conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        archived.append(name)
+    return archived
+
+def setup_partitions(target, connection: Connection, **kw) -> None:
+    """Listener after_create: con create_all sobre Postgres deja la DEFAULT y los meses próximos."""
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+    create_default_partition(connection)
+    ensure_partitions(connection, datetime.utcnow())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from modules.core.db_connection import engine
+
+    parser = argparse.ArgumentParser(description="Mantenimiento de las particiones mensuales de reservas")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="lista las particiones adjuntas")
+    ensure = commands.add_parser("ensure", help="crea las particiones de los meses próximos")
+    ensure.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD)
+    archive = commands.add_parser("archive", help=f"mueve los meses viejos al esquema {ARCHIVE_SCHEMA}")
+    archive.add_argument("--keep-months", type=int, required=True,
+                         help="meses completos (además del actual) que se conservan en la tabla")
+    args = parser.parse_args(argv)
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            parser.exit(1, f"{TABLE} is not partitioned (run the migrations first)\n")
+        if args.command == "list":
+            names = list_partitions(conn)
+        elif args.command == "ensure":
+            names = ensure_partitions(conn, now, args.months_ahead)
+        else:
+            names = archive_partitions(conn, add_months(month_start(now), -args.keep_months))
+    for name in names:
+        print(name)
+
+
+if __name__ == "__main__":
+    main()
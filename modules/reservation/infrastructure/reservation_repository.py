@@ -1,20 +1,60 @@
-from sqlmodel import Session, select
-from typing import List, Optional
+from sqlmodel import Session, insert, select, update
+from sqlalchemy import DateTime, exists, literal, or_, text, true, tuple_, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
+from modules.core.unit_of_work import commit, after_commit, rollback
 from modules.reservation.domain.reservation_repository_interface import IReservationRepository
-from modules.reservation.domain.reservation import Reservation
+from modules.reservation.domain.reservation import Reservation, ReservationDetail, ReservationStatus, MAX_RESERVATION_DURATION
+from modules.reservation.domain.available_slot import AvailableSlot
+from modules.reservation.domain.table_occupancy import TableOccupancy
+from modules.reservation.domain.day_sheet import DaySheetEntry, DaySheetPreOrder
 from modules.restaurant.infrastructure.table_db_model import TableDBModel
-from modules.reservation.infrastructure.reservation_db_model import ReservationDBModel, to_domain, to_db
+from modules.restaurant.infrastructure.restaurant_db_model import RestaurantDBModel
+from modules.menu.infrastructure.pre_order_item_db_model import PreOrderItemDB
+from modules.reservation.domain.reservation_exceptions import ReservationConflictError, ReservationUserConflictError
+from modules.reservation.infrastructure.reservation_db_model import (
+    ReservationDBModel, NO_DOUBLE_BOOKING_CONSTRAINT, to_domain, to_db
+)
+from modules.reservation.infrastructure.reservation_view_db_model import ReservationViewDB, to_detail
+from modules.reservation.infrastructure import reservation_view
+from modules.reservation.infrastructure.reservation_partitions import crosses_month_boundary
+from modules.reservation.infrastructure.availability_index import (
+    AvailabilityIndex, BookedInterval, availability_index, day_bounds, days_touched
+)
+
+EXCLUSION_VIOLATION = "23P01"
+
+def _is_double_booking(error: IntegrityError) -> bool:
+    return (
+        getattr(error.orig, "pgcode", None) == EXCLUSION_VIOLATION
+        and NO_DOUBLE_BOOKING_CONSTRAINT in str(error.orig)
+    )
+
+def _overlapping(start_time, end_time):
+    # La cota start_time >= inicio - duración máxima es redundante con el solapamiento, pero acota
+    # start_time por ambos lados y Postgres descarta las particiones mensuales fuera del rango
+    return (
+        (ReservationDBModel.start_time < end_time) &
+        (ReservationDBModel.end_time > start_time) &
+        (ReservationDBModel.start_time >= start_time - MAX_RESERVATION_DURATION)
+    )
 
 class ReservationRepository(IReservationRepository):
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, index: Optional[AvailabilityIndex] = None):
         self.db = db
+        self.index = index if index is not None else availability_index
 
     def get_by_id(self, reservation_id: UUID) -> Optional[Reservation]:
-        res = self.db.get(ReservationDBModel, reservation_id)
+        res = self._get_db(reservation_id)
         return to_domain(res) if res else None
 
+    def _get_db(self, reservation_id: UUID) -> Optional[ReservationDBModel]:
+        # La PK es (uuid, start_time) por el particionado: se busca por uuid en lugar de db.get
+        return self.db.exec(select(ReservationDBModel).where(ReservationDBModel.uuid == reservation_id)).first()
+
     def get_by_user(self, user_id: UUID) -> List[Reservation]:
         stmt = select(ReservationDBModel).where(ReservationDBModel.user_id == user_id)
         results = self.db.exec(stmt).all()
@@ -23,8 +63,7 @@ class ReservationRepository(IReservationRepository):
     def get_active_by_user_and_time(self, user_id: UUID, start_time: datetime, end_time: datetime) -> List[Reservation]:
         stmt = select(ReservationDBModel).where(
             (ReservationDBModel.user_id == user_id) &
-            (ReservationDBModel.start_time < end_time) &
-            (ReservationDBModel.end_time > start_time) &
+            _overlapping(start_time, end_time) &
             (ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]))
         )
         results = self.db.exec(stmt).all()
@@ -33,22 +72,196 @@ class ReservationRepository(IReservationRepository):
     def get_active_by_table_and_time(self, table_id: UUID, start_time: datetime, end_time: datetime) -> List[Reservation]:
         stmt = select(ReservationDBModel).where(
             (ReservationDBModel.table_id == table_id) &
-            (ReservationDBModel.start_time < end_time) &
-            (ReservationDBModel.end_time > start_time) &
+            _overlapping(start_time, end_time) &
             (ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]))
         )
         results = self.db.exec(stmt).all()
         return [to_domain(r) for r in results]
 
+    def exists_active_by_user_and_time(self, user_id: UUID, start_time: datetime, end_time: datetime,
+                                       exclude: Optional[UUID] = None) -> bool:
+        for day in days_touched(start_time, end_time):
+            if not self.index.is_loaded(AvailabilityIndex.USER, user_id, day):
+                self._load_user_day(user_id, day)
+        return self._confirm_overlap(AvailabilityIndex.USER, ReservationDBModel.user_id, user_id,
+                                     start_time, end_time, exclude)
+
+    def exists_active_by_table_and_time(self, table_id: UUID, start_time: datetime, end_time: datetime,
+                                        exclude: Optional[UUID] = None) -> bool:
+        for day in days_touched(start_time, end_time):
+            if not self.index.is_loaded(AvailabilityIndex.TABLE, table_id, day):
+                self._load_restaurant_day(table_id, day)
+        return self._confirm_overlap(AvailabilityIndex.TABLE, ReservationDBModel.table_id, table_id,
+                                     start_time, end_time, exclude)
+
+    def _confirm_overlap(self, kind: str, column, key_id: UUID, start_time: datetime, end_time: datetime,
+                         exclude: Optional[UUID]) -> bool:
+        """
+        Un acierto del índice se confirma contra la base antes de rechazar: otro worker pudo cancelar
+        o mover la reserva y este índice la conserva hasta que vence el TTL. Si la base no encuentra
+        ningún solapamiento, las reservas que el índice tenía se olvidan. Un fallo del índice no se
+        consulta: ahí la garantía la dan las escrituras.
+        """
+        candidates = self.index.overlapping(kind, key_id, start_time, end_time, exclude)
+        if not candidates:
+            return False
+        stmt = select(ReservationDBModel.uuid).where(
+            (column == key_id) &
+            _overlapping(start_time, end_time) &
+            (ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]))
+        )
+        if exclude is not None:
+            stmt = stmt.where(ReservationDBModel.uuid != exclude)
+        if self.db.exec(stmt.limit(1)).first() is not None:
+            return True
+        self.index.forget(candidates)
+        return False
+
+    def _load_user_day(self, user_id: UUID, day) -> None:
+        day_start, day_end = day_bounds(day)
+        stmt = select(*self._interval_columns()).where(
+            (ReservationDBModel.user_id == user_id) &
+            _overlapping(day_start, day_end) &
+            (ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]))
+        )
+        intervals = [BookedInterval(*row) for row in self.db.exec(stmt).all()]
+        self.index.load(AvailabilityIndex.USER, [user_id], day, intervals)
+
+    def _load_restaurant_day(self, table_id: UUID, day) -> None:
+        # Una sola consulta trae todas las mesas del restaurante de la mesa pedida
+        # junto con sus reservas activas del día (outer join: mesas libres incluidas).
+        day_start, day_end = day_bounds(day)
+        restaurant_id = select(TableDBModel.restaurant_id).where(TableDBModel.id == table_id).scalar_subquery()
+        stmt = select(TableDBModel.id, *self._interval_columns()).outerjoin(
+            ReservationDBModel,
+            (ReservationDBModel.table_id == TableDBModel.id) &
+            _overlapping(day_start, day_end) &
+            (ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]))
+        ).where(TableDBModel.restaurant_id == restaurant_id)
+        rows = self.db.exec(stmt).all()
+        table_ids = {row[0] for row in rows} | {table_id}
+        intervals = [BookedInterval(*row[1:]) for row in rows if row[1] is not None]
+        self.index.load(AvailabilityIndex.TABLE, table_ids, day, intervals)
+
+    @staticmethod
+    def _interval_columns():
+        return (
+            ReservationDBModel.uuid,
+            ReservationDBModel.table_id,
+            ReservationDBModel.user_id,
+            ReservationDBModel.start_time,
+            ReservationDBModel.end_time,
+        )
+
+    def _lock(self, *keys: str) -> None:
+        # Candados de transacción: se sueltan solos con el commit o el rollback. Se toman en orden
+        # para que dos escrituras no se esperen mutuamente. SQLite ya serializa las escrituras.
+        if self.db.get_bind().dialect.name != "postgresql":
+            return
+        for key in sorted(set(keys)):
+            self.db.exec(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), params={"key": key})
+
+    def _check_user_overlaps(self, intervals: List[Tuple[UUID, datetime, datetime]],
+                             exclude: Optional[UUID] = None) -> None:
+        """
+        Re-chequea contra la base, justo antes de escribir, que ningún cliente quede con dos reservas
+        activas solapadas. El índice en memoria no ve al instante lo que reservan otros workers y no
+        hay restricción en la base para esta regla: el candado por cliente hace que dos escrituras
+        del mismo cliente se vean una a la otra.
+        """
+        self._lock(*[f"reservation_user:{user_id}" for user_id, _, _ in intervals])
+        stmt = select(ReservationDBModel.user_id).where(
+            or_(*[(ReservationDBModel.user_id == user_id) & _overlapping(start, end)
+                  for user_id, start, end in intervals]),
+            ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]),
+        )
+        if exclude is not None:
+            stmt = stmt.where(ReservationDBModel.uuid != exclude)
+        user_id = self.db.exec(stmt.limit(1)).first()
+        if user_id is not None:
+            raise ReservationUserConflictError(str(user_id))
+
+    def _check_table_overlaps_across_months(self, intervals: List[Tuple[UUID, datetime, datetime]],
+                                            exclude: Optional[UUID] = None) -> None:
+        """
+        La exclusión de cada partición solo compara reservas del mismo mes: cerca de un cambio de mes
+        se serializa por mesa y se re-chequea contra la base. Las dos reservas de un solape entre
+        meses quedan cerca del cambio, así que ambas escrituras pasan por aquí y se ven una a la otra.
+        """
+        intervals = [interval for interval in intervals if crosses_month_boundary(*interval[1:])]
+        if not intervals:
+            return
+        self._lock(*[f"reservation_table:{table_id}" for table_id, _, _ in intervals])
+        stmt = select(ReservationDBModel.table_id).where(
+            or_(*[(ReservationDBModel.table_id == table_id) & _overlapping(start, end)
+                  for table_id, start, end in intervals]),
+            ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]),
+        )
+        if exclude is not None:
+            stmt = stmt.where(ReservationDBModel.uuid != exclude)
+        table_id = self.db.exec(stmt.limit(1)).first()
+        if table_id is not None:
+            raise ReservationConflictError(str(table_id))
+
     def save(self, reservation: Reservation) -> Reservation:
+        self._check_user_overlaps([(reservation.user_id, reservation.start_time, reservation.end_time)])
+        self._check_table_overlaps_across_months(
+            [(reservation.table_id, reservation.start_time, reservation.end_time)]
+        )
         db_res = to_db(reservation)
         self.db.add(db_res)
-        self.db.commit()
-        self.db.refresh(db_res)
-        return to_domain(db_res)
+        try:
+            # El INSERT ... SELECT de la vista fuerza el flush de la reserva dentro del try
+            reservation_view.refresh_reservations(self.db, [(reservation.uuid, reservation.start_time)])
+            committed = commit(self.db)
+        except IntegrityError as e:
+            rollback(self.db)
+            if _is_double_booking(e):
+                raise ReservationConflictError(str(reservation.table_id)) from e
+            raise
+        if committed:
+            self.db.refresh(db_res)
+        saved = to_domain(db_res)
+        after_commit(self.db, lambda: self.index.add(saved))
+        return saved
+
+    def bulk_save(self, reservations: List[Reservation]) -> List[Reservation]:
+        if not reservations:
+            return []
+        self._check_user_overlaps([(r.user_id, r.start_time, r.end_time) for r in reservations])
+        self._check_table_overlaps_across_months([(r.table_id, r.start_time, r.end_time) for r in reservations])
+        try:
+            # Un solo INSERT con todas las filas (executemany) y una sola proyección a la vista
+            self.db.exec(insert(ReservationDBModel), params=[to_db(r).model_dump() for r in reservations])
+            reservation_view.refresh_reservations(self.db, [(r.uuid, r.start_time) for r in reservations])
+            commit(self.db)
+        except IntegrityError as e:
+            rollback(self.db)
+            if _is_double_booking(e):
+                raise ReservationConflictError(str(reservations[0].table_id)) from e
+            raise
+        saved = list(reservations)
+
+        def index_all():
+            for reservation in saved:
+                self.index.add(reservation)
+        after_commit(self.db, index_all)
+        return saved
+
+    def get_active_overlapping(self, table_id: UUID, user_id: UUID,
+                               intervals: List[Tuple[datetime, datetime]]) -> List[Reservation]:
+        if not intervals:
+            return []
+        # Un OR de ventanas acotadas: cada una poda sus particiones y usa los índices parciales
+        stmt = select(ReservationDBModel).where(
+            or_(ReservationDBModel.table_id == table_id, ReservationDBModel.user_id == user_id),
+            or_(*[_overlapping(start, end) for start, end in intervals]),
+            ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]),
+        )
+        return [to_domain(r) for r in self.db.exec(stmt).all()]
 
     def update(self, reservation: Reservation) -> Reservation:
-        db_res = self.db.get(ReservationDBModel, reservation.uuid)
+        db_res = self._get_db(reservation.uuid)
         if not db_res:
             raise Exception("Reservation not found")
 
@@ -57,15 +270,118 @@ class ReservationRepository(IReservationRepository):
             setattr(db_res, field, value)
 
         self.db.add(db_res)
-        self.db.commit()
-        self.db.refresh(db_res)
-        return to_domain(db_res)
+        reservation_view.refresh_reservations(self.db, [(reservation.uuid, reservation.start_time)])
+        if commit(self.db):
+            self.db.refresh(db_res)
+        updated = to_domain(db_res)
+        after_commit(self.db, lambda: self.index.add(updated))
+        return updated
+
+    # Transiciones de estado: un solo UPDATE ... RETURNING, sin leer la fila antes
+    def transition_status(self, reservation_id: UUID, new_status: ReservationStatus,
+                          from_statuses: Iterable[ReservationStatus], user_id: Optional[UUID] = None,
+                          starts_after: Optional[datetime] = None) -> Optional[Reservation]:
+        conditions = [
+            ReservationDBModel.uuid == reservation_id,
+            ReservationDBModel.status.in_(list(from_statuses)),
+        ]
+        if user_id is not None:
+            conditions.append(ReservationDBModel.user_id == user_id)
+        if starts_after is not None:
+            conditions.append(ReservationDBModel.start_time > starts_after)
+        updated = self._transition(conditions, new_status)
+        return updated[0] if updated else None
+
+    def reschedule(self, reservation_id: UUID, start_time: datetime, end_time: datetime, table_id: UUID,
+                   from_statuses: Iterable[ReservationStatus], user_id: Optional[UUID] = None,
+                   starts_after: Optional[datetime] = None) -> Optional[Reservation]:
+        conditions = [
+            ReservationDBModel.uuid == reservation_id,
+            ReservationDBModel.status.in_(list(from_statuses)),
+        ]
+        if user_id is not None:
+            conditions.append(ReservationDBModel.user_id == user_id)
+        if starts_after is not None:
+            conditions.append(ReservationDBModel.start_time > starts_after)
+        owner = self.db.exec(select(ReservationDBModel.user_id).where(ReservationDBModel.uuid == reservation_id)).first()
+        if owner is not None:
+            self._check_user_overlaps([(owner, start_time, end_time)], exclude=reservation_id)
+            self._check_table_overlaps_across_months([(table_id, start_time, end_time)], exclude=reservation_id)
+        # Si cambia el mes, Postgres mueve la fila de partición dentro del mismo UPDATE
+        stmt = (
+            update(ReservationDBModel)
+            .where(*conditions)
+            .values(start_time=start_time, end_time=end_time, table_id=table_id)
+            .returning(ReservationDBModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        try:
+            row = self.db.exec(stmt).scalars().first()
+            moved = to_domain(row) if row else None
+            if moved:
+                reservation_view.refresh_reservations(self.db, [(moved.uuid, moved.start_time)])
+            commit(self.db)
+        except IntegrityError as e:
+            rollback(self.db)
+            if _is_double_booking(e):
+                raise ReservationConflictError(str(table_id)) from e
+            raise
+        if moved:
+            after_commit(self.db, lambda: self.index.add(moved))
+        return moved
+
+    def bulk_transition_status_by_restaurant(self, restaurant_id: UUID, start: datetime, end: datetime,
+                                             new_status: ReservationStatus,
+                                             from_statuses: Iterable[ReservationStatus]) -> List[Reservation]:
+        table_ids = select(TableDBModel.id).where(TableDBModel.restaurant_id == restaurant_id)
+        return self._transition([
+            ReservationDBModel.table_id.in_(table_ids),
+            ReservationDBModel.start_time >= start,
+            ReservationDBModel.start_time < end,
+            ReservationDBModel.status.in_(list(from_statuses)),
+        ], new_status)
+
+    def bulk_transition_status_ended_before(self, end_before: datetime, new_status: ReservationStatus,
+                                            from_statuses: Iterable[ReservationStatus], limit: int) -> List[Reservation]:
+        # SKIP LOCKED: filas bloqueadas por otra transacción (o por otro worker barriendo) quedan para el siguiente lote
+        batch = (
+            select(ReservationDBModel.uuid)
+            .where(
+                (ReservationDBModel.end_time <= end_before) &
+                (ReservationDBModel.start_time < end_before) &
+                (ReservationDBModel.status.in_(list(from_statuses)))
+            )
+            .order_by(ReservationDBModel.end_time)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return self._transition([ReservationDBModel.uuid.in_(batch.scalar_subquery())], new_status)
+
+    def _transition(self, conditions, new_status: ReservationStatus) -> List[Reservation]:
+        stmt = (
+            update(ReservationDBModel)
+            .where(*conditions)
+            .values(status=new_status)
+            .returning(ReservationDBModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        updated = [to_domain(r) for r in self.db.exec(stmt).scalars().all()]
+        reservation_view.set_status(self.db, [r.uuid for r in updated], new_status)
+        commit(self.db)
+
+        def reindex():
+            for reservation in updated:
+                self.index.add(reservation)
+        after_commit(self.db, reindex)
+        return updated
 
     def delete(self, reservation_id: UUID) -> None:
-        db_res = self.db.get(ReservationDBModel, reservation_id)
+        db_res = self._get_db(reservation_id)
         if db_res:
             self.db.delete(db_res)
-            self.db.commit()
+            reservation_view.remove_reservations(self.db, [reservation_id])
+            commit(self.db)
+            after_commit(self.db, lambda: self.index.discard(reservation_id))
 
     def get_all_by_restaurant(self, restaurant_id: UUID) -> List[Reservation]:
         stmt = select(ReservationDBModel).join_from(ReservationDBModel, TableDBModel).where(
@@ -90,9 +406,176 @@ class ReservationRepository(IReservationRepository):
     def get_active_by_restaurant_and_time_range(self, restaurant_id: UUID, start_time: datetime, end_time: datetime) -> List[Reservation]:
         stmt = select(ReservationDBModel).join_from(ReservationDBModel, TableDBModel).where(
             (TableDBModel.restaurant_id == restaurant_id) &
-            (ReservationDBModel.start_time < end_time) &
-            (ReservationDBModel.end_time > start_time) &
+            _overlapping(start_time, end_time) &
             (ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]))
         )
         results = self.db.exec(stmt).all()
         return [to_domain(r) for r in results]
+
+    # Lecturas servidas por el modelo de lectura reservation_view: una tabla, un índice, sin joins
+    def get_detail_by_id(self, reservation_id: UUID) -> Optional[ReservationDetail]:
+        view = self.db.get(ReservationViewDB, reservation_id)
+        return to_detail(view) if view else None
+
+    def get_details_by_user(self, user_id: UUID) -> List[ReservationDetail]:
+        stmt = select(ReservationViewDB).where(ReservationViewDB.user_id == user_id)
+        return [to_detail(v) for v in self.db.exec(self._keyset(stmt, None, None)).all()]
+
+    def get_details_by_restaurant(self, restaurant_id: UUID, after: Optional[Tuple[datetime, UUID]] = None,
+                                  limit: Optional[int] = None) -> List[ReservationDetail]:
+        stmt = select(ReservationViewDB).where(ReservationViewDB.restaurant_id == restaurant_id)
+        return [to_detail(v) for v in self.db.exec(self._keyset(stmt, after, limit)).all()]
+
+    def get_details_by_date_range(self, start: datetime, end: datetime, after: Optional[Tuple[datetime, UUID]] = None,
+                                  limit: Optional[int] = None) -> List[ReservationDetail]:
+        stmt = select(ReservationViewDB).where(
+            (ReservationViewDB.start_time >= start) &
+            (ReservationViewDB.start_time <= end)
+        )
+        return [to_detail(v) for v in self.db.exec(self._keyset(stmt, after, limit)).all()]
+
+    def iter_details_by_restaurant(self, restaurant_id: UUID, batch_size: int = 500) -> Iterator[ReservationDetail]:
+        stmt = select(ReservationViewDB).where(ReservationViewDB.restaurant_id == restaurant_id)
+        return self._stream(stmt, batch_size)
+
+    def iter_details_by_date_range(self, start: datetime, end: datetime, batch_size: int = 500) -> Iterator[ReservationDetail]:
+        stmt = select(ReservationViewDB).where(
+            (ReservationViewDB.start_time >= start) &
+            (ReservationViewDB.start_time <= end)
+        )
+        return self._stream(stmt, batch_size)
+
+    @staticmethod
+    def _keyset(stmt, after: Optional[Tuple[datetime, UUID]], limit: Optional[int]):
+        stmt = stmt.order_by(ReservationViewDB.start_time, ReservationViewDB.uuid)
+        if after is not None:
+            stmt = stmt.where(tuple_(ReservationViewDB.start_time, ReservationViewDB.uuid) > tuple_(*after))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    def _stream(self, stmt, batch_size: int) -> Iterator[ReservationDetail]:
+        # yield_per usa un cursor del servidor y procesa las filas por lotes
+        stmt = stmt.order_by(ReservationViewDB.start_time, ReservationViewDB.uuid).execution_options(yield_per=batch_size)
+        for view in self.db.exec(stmt):
+            yield to_detail(view)
+
+    def find_free_table_slots(self, restaurant_id: UUID, party_size: int,
+                              slots: List[Tuple[datetime, datetime]]) -> List[AvailableSlot]:
+        if not slots:
+            return []
+        # Las franjas candidatas viajan como una tabla derivada; el anti-join (NOT EXISTS)
+        # descarta cada (mesa, franja) que choca con una reserva activa.
+        slot_rows = union_all(*[
+            select(literal(start, DateTime).label("slot_start"), literal(end, DateTime).label("slot_end"))
+            for start, end in slots
+        ]).subquery("slots")
+        busy = select(ReservationDBModel.uuid).where(
+            (ReservationDBModel.table_id == TableDBModel.id) &
+            (ReservationDBModel.start_time < slot_rows.c.slot_end) &
+            (ReservationDBModel.end_time > slot_rows.c.slot_start) &
+            _overlapping(min(start for start, _ in slots), max(end for _, end in slots)) &
+            (ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]))
+        )
+        stmt = (
+            select(
+                TableDBModel.id, TableDBModel.number, TableDBModel.capacity, TableDBModel.location,
+                slot_rows.c.slot_start, slot_rows.c.slot_end
+            )
+            .select_from(TableDBModel)
+            .join(slot_rows, true())
+            .where(
+                (TableDBModel.restaurant_id == restaurant_id) &
+                (TableDBModel.capacity >= party_size) &
+                ~exists(busy)
+            )
+            .order_by(slot_rows.c.slot_start, TableDBModel.capacity, TableDBModel.number)
+        )
+        return [
+            AvailableSlot(
+                table_id=table_id, table_number=number, capacity=capacity, location=location,
+                start_time=slot_start, end_time=slot_end
+            )
+            for table_id, number, capacity, location, slot_start, slot_end in self.db.exec(stmt).all()
+        ]
+
+    def get_day_sheet(self, restaurant_id: UUID, start: datetime, end: datetime,
+                      include_cancelled: bool = False) -> List[DaySheetEntry]:
+        # Tres consultas sin importar cuántas reservas haya: las reservas (con mesa y restaurante),
+        # sus pre-órdenes (selectin por IN) y los platos de esas pre-órdenes (selectin por IN)
+        stmt = (
+            select(ReservationDBModel, TableDBModel.number, RestaurantDBModel.name)
+            .join(TableDBModel, TableDBModel.id == ReservationDBModel.table_id)
+            .join(RestaurantDBModel, RestaurantDBModel.id == TableDBModel.restaurant_id)
+            .where(
+                TableDBModel.restaurant_id == restaurant_id,
+                ReservationDBModel.start_time >= start,
+                ReservationDBModel.start_time < end,
+            )
+            .options(selectinload(ReservationDBModel.pre_orders).selectinload(PreOrderItemDB.menu_item))
+            .order_by(ReservationDBModel.start_time, TableDBModel.number, ReservationDBModel.uuid)
+        )
+        if not include_cancelled:
+            stmt = stmt.where(ReservationDBModel.status != ReservationStatus.CANCELLED)
+        return [
+            DaySheetEntry(
+                **to_domain(res).model_dump(),
+                restaurant_id=restaurant_id,
+                restaurant_name=restaurant_name,
+                table_number=number,
+                pre_order_count=len(res.pre_orders),
+                pre_orders=[
+                    DaySheetPreOrder(
+                        id=item.id, menu_item_id=item.menu_item_id, menu_item_name=item.menu_item.name,
+                        quantity=item.quantity, special_instructions=item.special_instructions,
+                    )
+                    for item in sorted(res.pre_orders, key=lambda p: (p.menu_item.name, p.id))
+                ],
+            )
+            for res, number, restaurant_name in self.db.exec(stmt).all()
+        ]
+
+    def get_active_intervals_by_tables(self, table_ids: List[UUID], start: datetime,
+                                       end: datetime) -> Dict[UUID, List[Tuple[datetime, datetime]]]:
+        # Una consulta de rango por el índice parcial (table_id, start_time, end_time); solo columnas
+        booked: Dict[UUID, List[Tuple[datetime, datetime]]] = {}
+        if not table_ids:
+            return booked
+        stmt = (
+            select(ReservationDBModel.table_id, ReservationDBModel.start_time, ReservationDBModel.end_time)
+            .where(
+                ReservationDBModel.table_id.in_(table_ids),
+                _overlapping(start, end),
+                ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]),
+            )
+        )
+        for table_id, booked_start, booked_end in self.db.exec(stmt).all():
+            booked.setdefault(table_id, []).append((booked_start, booked_end))
+        return booked
+
+    def get_table_occupancy(self, restaurant_id: UUID, start: datetime, end: datetime) -> List[TableOccupancy]:
+        # Solo columnas (sin entidades ORM): outer join para incluir las mesas sin reservas
+        stmt = (
+            select(
+                TableDBModel.id, TableDBModel.number, TableDBModel.capacity, TableDBModel.location,
+                ReservationDBModel.start_time, ReservationDBModel.end_time,
+            )
+            .outerjoin(
+                ReservationDBModel,
+                (ReservationDBModel.table_id == TableDBModel.id) &
+                _overlapping(start, end) &
+                (ReservationDBModel.status.in_(["PENDING", "CONFIRMED"]))
+            )
+            .where(TableDBModel.restaurant_id == restaurant_id)
+            .order_by(TableDBModel.number, ReservationDBModel.start_time)
+        )
+        tables: Dict[UUID, TableOccupancy] = {}
+        for table_id, number, capacity, location, booked_start, booked_end in self.db.exec(stmt).all():
+            table = tables.get(table_id)
+            if table is None:
+                table = tables[table_id] = TableOccupancy(
+                    table_id=table_id, table_number=number, capacity=capacity, location=location
+                )
+            if booked_start is not None:
+                table.booked.append((booked_start, booked_end))
+        return list(tables.values())
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import os
+import time as _time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlmodel import Session
+
+from modules.core.db_connection import engine
+from modules.menu.infrastructure.menu_repository import MenuRepository
+from modules.reservation.domain.reservation import ReservationStatus, ACTIVE_STATUSES
+from modules.reservation.infrastructure.reservation_repository import ReservationRepository
+from modules.reservation.infrastructure.idempotency_repository import IdempotencyRepository
+from modules.reservation.infrastructure.slot_hold_repository import SlotHoldRepository
+from modules.reservation.infrastructure.reservation_partitions import MONTHS_AHEAD, ensure_partitions
+
+logger = logging.getLogger(__name__)
+
+
+class SweeperMetrics(BaseModel):
+    runs: int = 0
+    batches: int = 0
+    rows_processed: int = 0
+    idempotency_keys_evicted: int = 0
+    holds_evicted: int = 0
+    stock_items_compacted: int = 0
+    partitions_created: int = 0
+    errors: int = 0
+    # Fallos por etapa (partitions, reservations, idempotency_keys, holds, stock_shards)
+    stage_errors: Dict[str, int] = {}
+    last_error_stage: Optional[str] = None
+    last_run_at: Optional[datetime] = None
+    last_run_rows: int = 0
+    last_run_ms: float = 0.0
+    last_error: Optional[str] = None
+
+
+class ReservationSweeper:
+    """
+    Tarea de fondo que pasa a COMPLETED las reservas activas (PENDING o CONFIRMED) cuya
+    hora de fin ya pasó, para que dejen de contar en los chequeos de solapamiento,
+    elimina las Idempotency-Key y las retenciones de mesa vencidas, nivela los sub-contadores
+    de los platos con stock fragmentado y crea las particiones mensuales que falten hasta
+    `partition_months_ahead` meses (None desactiva el mantenimiento de particiones).
+
+    Cada pasada procesa lotes de `batch_size` filas con un UPDATE ... RETURNING por lote
+    (un commit por lote, para no retener bloqueos) hasta vaciar el pendiente. Cada trabajo es
+    una etapa con su propia sesión y su propio manejo de errores: si una falla (p. ej. crear
+    particiones) se registra en `stage_errors` y las demás corren igual.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = lambda: Session(engine),
+        interval_seconds: float = 60.0,
+        batch_size: int = 500,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        partition_months_ahead: Optional[int] = MONTHS_AHEAD,
+    ):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.clock = clock
+        self.partition_months_ahead = partition_months_ahead
+        self.metrics = SweeperMetrics()
+        self._task: Optional[asyncio.Task] = None
+
+    def sweep_once(self) -> int:
+        """Ejecuta una pasada completa (bloqueante) y devuelve las reservas completadas."""
+        started = _time.perf_counter()
+        now = self.clock()
+        processed = 0
+        for name, stage in self._stages():
+            try:
+                with self.session_factory() as db:
+                    rows = stage(db, now)
+            except Exception as e:
+                self.metrics.errors += 1
+                self.metrics.stage_errors[name] = self.metrics.stage_errors.get(name, 0) + 1
+                self.metrics.last_error = str(e)
+                self.metrics.last_error_stage = name
+                logger.exception("Reservation sweeper stage %s failed", name)
+                continue
+            if name == "reservations":
+                processed = rows
+
+        self.metrics.runs += 1
+        self.metrics.rows_processed += processed
+        self.metrics.last_run_at = now
+        self.metrics.last_run_rows = processed
+        self.metrics.last_run_ms = (_time.perf_counter() - started) * 1000
+        return processed
+
+    def _stages(self) -> List[Tuple[str, Callable[[Session, datetime], int]]]:
+        stages = [
+            ("reservations", self._complete_reservations),
+            ("idempotency_keys", self._evict_idempotency_keys),
+            ("holds", self._evict_holds),
+            ("stock_shards", self._compact_stock_shards),
+        ]
+        if self.partition_months_ahead is not None:
+            stages.insert(0, ("partitions", self._ensure_partitions))
+        return stages
+
+    def _ensure_partitions(self, db: Session, now: datetime) -> int:
+        # Fuera de Postgres o sin particionar no hace nada; si no falta ningún mes es una consulta al catálogo
+        created = ensure_partitions(db.connection(), now, self.partition_months_ahead)
+        db.commit()
+        self.metrics.partitions_created += len(created)
+        return len(created)
+
+    def _complete_reservations(self, db: Session, now: datetime) -> int:
+        repo = ReservationRepository(db)
+        processed = 0
+        while True:
+            completed = repo.bulk_transition_status_ended_before(
+                now, ReservationStatus.COMPLETED, ACTIVE_STATUSES, self.batch_size
+            )
+            if completed:
+                self.metrics.batches += 1
+            processed += len(completed)
+            if len(completed) < self.batch_size:
+                return processed
+
+    def _evict_idempotency_keys(self, db: Session, now: datetime) -> int:
+        keys = IdempotencyRepository(db)
+        total = 0
+        while True:
+            evicted = keys.delete_expired(now, self.batch_size)
+            self.metrics.idempotency_keys_evicted += evicted
+            total += evicted
+            if evicted < self.batch_size:
+                return total
+
+    def _evict_holds(self, db: Session, now: datetime) -> int:
+        holds = SlotHoldRepository(db)
+        total = 0
+        while True:
+            evicted = holds.delete_expired(now, self.batch_size)
+            self.metrics.holds_evicted += evicted
+            total += evicted
+            if evicted < self.batch_size:
+                return total
+
+    def _compact_stock_shards(self, db: Session, now: datetime) -> int:
+        compacted = MenuRepository(db).compact_stock_shards()
+        self.metrics.stock_items_compacted += compacted
+        return compacted
+
+    async def run(self) -> None:
+        while True:
+            try:
+                # La sesión es síncrona: la pasada corre en un hilo para no bloquear el event loop
+                processed = await asyncio.to_thread(self.sweep_once)
+                if processed:
+                    logger.info("Reservation sweeper completed %d reservations", processed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.metrics.errors += 1
+                self.metrics.last_error = str(e)
+                logger.exception("Reservation sweeper run failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="reservation-sweeper")
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# Instancia del proceso, arrancada desde el lifespan de main.py
+reservation_sweeper = ReservationSweeper(
+    interval_seconds=float(os.getenv("RESERVATION_SWEEP_INTERVAL_SECONDS", "60")),
+    batch_size=int(os.getenv("RESERVATION_SWEEP_BATCH_SIZE", "500")),
+    partition_months_ahead=int(os.getenv("RESERVATION_PARTITION_MONTHS_AHEAD", str(MONTHS_AHEAD))),
+)
+
+SWEEPER_ENABLED = os.getenv("RESERVATION_SWEEP_ENABLED", "true").lower() not in ("0", "false", "no")
@@ -0,0 +1,124 @@
+"""
+Mantenimiento de reservation_view (ReservationViewDB), el modelo de lectura de las reservas.
+
+Los repositorios de reservas, mesas, restaurantes y pre-órdenes llaman a estas funciones en la
+misma sesión (y transacción) de su escritura, así la vista nunca queda confirmada a medias.
+Para backfills o para reparar la vista:
+
+    python -m modules.reservation.infrastructure.reservation_view rebuild
+"""
+import argparse
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlmodel import Session, delete, func, insert, select, tuple_, update
+
+from modules.menu.infrastructure.pre_order_item_db_model import PreOrderItemDB
+from modules.reservation.domain.reservation import ReservationStatus
+from modules.reservation.infrastructure.reservation_db_model import ReservationDBModel
+from modules.reservation.infrastructure.reservation_view_db_model import ReservationViewDB
+from modules.restaurant.infrastructure.restaurant_db_model import RestaurantDBModel
+from modules.restaurant.infrastructure.table_db_model import TableDBModel
+
+VIEW_COLUMNS = [
+    "uuid", "user_id", "table_id", "restaurant_id", "restaurant_name", "table_number",
+    "start_time", "end_time", "num_people", "special_instructions", "status", "pre_order_count",
+]
+
+
+def _pre_order_count(reservation_id):
+    return (
+        select(func.count())
+        .select_from(PreOrderItemDB)
+        .where(PreOrderItemDB.reservation_id == reservation_id)
+        .scalar_subquery()
+    )
+
+def _projection(*conditions):
+    """
+    SELECT con las columnas de la vista, en el orden de VIEW_COLUMNS, armado desde las tablas de origen.
+    Los joins son externos: una reserva cuya mesa ya no existe sigue en la vista, sin restaurante ni mesa.
+    """
+    return (
+        select(
+            ReservationDBModel.uuid, ReservationDBModel.user_id, ReservationDBModel.table_id,
+            TableDBModel.restaurant_id, RestaurantDBModel.name, TableDBModel.number,
+            ReservationDBModel.start_time, ReservationDBModel.end_time, ReservationDBModel.num_people,
+            ReservationDBModel.special_instructions, ReservationDBModel.status,
+            _pre_order_count(ReservationDBModel.uuid),
+        )
+        .outerjoin(TableDBModel, TableDBModel.id == ReservationDBModel.table_id)
+        .outerjoin(RestaurantDBModel, RestaurantDBModel.id == TableDBModel.restaurant_id)
+        .where(*conditions)
+    )
+
+def refresh_reservations(db: Session, keys: Iterable[Tuple[UUID, datetime]]) -> None:
+    """Vuelve a proyectar las reservas dadas como (uuid, start_time); start_time permite podar particiones."""
+    keys = list(keys)
+    if not keys:
+        return
+    db.exec(delete(ReservationViewDB).where(ReservationViewDB.uuid.in_([uuid for uuid, _ in keys])))
+    db.exec(insert(ReservationViewDB).from_select(
+        VIEW_COLUMNS, _projection(tuple_(ReservationDBModel.uuid, ReservationDBModel.start_time).in_(keys))
+    ))
+
+def set_status(db: Session, reservation_ids: List[UUID], status: ReservationStatus) -> None:
+    if reservation_ids:
+        db.exec(update(ReservationViewDB).where(ReservationViewDB.uuid.in_(reservation_ids)).values(status=status))
+
+def remove_reservations(db: Session, reservation_ids: List[UUID]) -> None:
+    if reservation_ids:
+        db.exec(delete(ReservationViewDB).where(ReservationViewDB.uuid.in_(reservation_ids)))
+
+def refresh_table(db: Session, table_id: UUID, number: int, restaurant_id: UUID) -> None:
+    restaurant_name = select(RestaurantDBModel.name).where(RestaurantDBModel.id == restaurant_id).scalar_subquery()
+    db.exec(
+        update(ReservationViewDB)
+        .where(ReservationViewDB.table_id == table_id)
+        .values(table_number=number, restaurant_id=restaurant_id, restaurant_name=restaurant_name)
+    )
+
+def detach_table(db: Session, table_id: UUID) -> None:
+    # Mesa borrada: sus reservas quedan en la vista, como las proyecta _projection sin mesa
+    db.exec(
+        update(ReservationViewDB)
+        .where(ReservationViewDB.table_id == table_id)
+        .values(table_number=None, restaurant_id=None, restaurant_name=None)
+    )
+
+def rename_restaurant(db: Session, restaurant_id: UUID, name: str) -> None:
+    db.exec(update(ReservationViewDB).where(ReservationViewDB.restaurant_id == restaurant_id).values(restaurant_name=name))
+
+def refresh_pre_order_counts(db: Session, reservation_ids: Iterable[UUID]) -> None:
+    reservation_ids = list(set(reservation_ids))
+    if reservation_ids:
+        db.exec(
+            update(ReservationViewDB)
+            .where(ReservationViewDB.uuid.in_(reservation_ids))
+            .values(pre_order_count=_pre_order_count(ReservationViewDB.uuid))
+        )
+
+def rebuild(db: Session) -> int:
+    """Reconstruye la vista completa en una sola transacción (los lectores ven la vieja hasta el commit)."""
+    db.exec(delete(ReservationViewDB))
+    db.exec(insert(ReservationViewDB).from_select(VIEW_COLUMNS, _projection()))
+    count = db.exec(select(func.count()).select_from(ReservationViewDB)).one()
+    db.commit()
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from modules.core.db_connection import engine
+
+    parser = argparse.ArgumentParser(description="Mantenimiento del modelo de lectura reservation_view")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="vuelve a proyectar todas las reservas")
+    parser.parse_args(argv)
+
+    with Session(engine) as db:
+        print(f"reservation_view: {rebuild(db)} rows")
+
+
+if __name__ == "__main__":
+    main()
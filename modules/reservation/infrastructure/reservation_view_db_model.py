@@ -0,0 +1,40 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+from modules.reservation.domain.reservation import ReservationDetail, ReservationStatus
+
+class ReservationViewDB(SQLModel, table=True):
+    """
+    Modelo de lectura desnormalizado: una fila por reserva con el restaurante, el número de mesa
+    y la cantidad de pre-órdenes ya resueltos. Lo mantienen los repositorios al escribir
+    (ver reservation_view) y se puede reconstruir por completo desde las tablas de origen.
+    """
+    __tablename__ = "reservation_view"
+    __table_args__ = (
+        # Cada lectura es un rango sobre un solo índice, ordenado como el keyset (start_time, uuid)
+        Index("ix_reservation_view_user_start", "user_id", "start_time", "uuid"),
+        Index("ix_reservation_view_restaurant_start", "restaurant_id", "start_time", "uuid"),
+        Index("ix_reservation_view_start", "start_time", "uuid"),
+        # Propagación de cambios de mesa
+        Index("ix_reservation_view_table", "table_id"),
+    )
+
+    uuid: UUID = Field(primary_key=True)
+    user_id: UUID
+    table_id: UUID
+    # Nulos si la mesa de la reserva ya no existe
+    restaurant_id: Optional[UUID] = None
+    restaurant_name: Optional[str] = None
+    table_number: Optional[int] = None
+    start_time: datetime
+    end_time: datetime
+    num_people: int
+    special_instructions: Optional[str] = None
+    status: ReservationStatus
+    pre_order_count: int = 0
+
+# Convertir de ReservationViewDB (infraestructura) a ReservationDetail (dominio)
+def to_detail(view: ReservationViewDB) -> ReservationDetail:
+    return ReservationDetail(**view.model_dump())
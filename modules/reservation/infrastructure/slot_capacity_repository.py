@@ -0,0 +1,85 @@
+from sqlmodel import Session, select, update
+from sqlalchemy import DateTime, Integer, column, literal, union_all, values
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from datetime import datetime
+from modules.core.unit_of_work import commit
+from modules.reservation.domain.slot_capacity_repository_interface import ISlotCapacityRepository
+from modules.reservation.infrastructure.slot_covers_db_model import SlotCoversDB
+
+class SlotCapacityRepository(ISlotCapacityRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _insert(self):
+        dialect = self.db.get_bind().dialect.name
+        return (postgresql.insert if dialect == "postgresql" else sqlite.insert)(SlotCoversDB)
+
+    def add_covers(self, restaurant_id: UUID, slots: List[datetime], covers: int, capacity: Optional[int]) -> bool:
+        if not slots:
+            return True
+        # Una fila nueva no pasa por el WHERE del ON CONFLICT: un grupo mayor al tope nunca entra
+        if capacity is not None and covers > capacity:
+            return False
+
+        # Un solo INSERT ... ON CONFLICT DO UPDATE ... WHERE: la fila queda bloqueada durante la
+        # comparación, así dos reservas concurrentes no pueden pasar ambas del tope
+        stmt = self._insert().values([
+            {"restaurant_id": restaurant_id, "slot_start": slot, "covers": covers} for slot in slots
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["restaurant_id", "slot_start"],
+            set_={"covers": SlotCoversDB.covers + stmt.excluded.covers},
+            where=(SlotCoversDB.covers + stmt.excluded.covers <= capacity) if capacity is not None else None,
+        ).returning(SlotCoversDB.slot_start)
+        admitted = self.db.exec(stmt).scalars().all()
+        if len(admitted) < len(slots):
+            # Alguna franja estaba llena: se devuelven las que sí se sumaron
+            self._subtract(restaurant_id, admitted, covers)
+            commit(self.db)
+            return False
+        commit(self.db)
+        return True
+
+    def remove_covers(self, restaurant_id: UUID, slots: List[datetime], covers: int) -> None:
+        if slots:
+            self._subtract(restaurant_id, slots, covers)
+            commit(self.db)
+
+    def remove_covers_by_slot(self, restaurant_id: UUID, covers_by_slot: Dict[datetime, int]) -> None:
+        if not covers_by_slot:
+            return
+        # Un solo UPDATE ... FROM con los cubiertos liberados de cada franja, en vez de uno por reserva
+        freed = self._freed(sorted(covers_by_slot.items()))
+        self.db.exec(
+            update(SlotCoversDB)
+            .where(SlotCoversDB.restaurant_id == restaurant_id, SlotCoversDB.slot_start == freed.c.slot_start)
+            .values(covers=SlotCoversDB.covers - freed.c.covers)
+        )
+        commit(self.db)
+
+    def _freed(self, rows: List[Tuple[datetime, int]]):
+        if self.db.get_bind().dialect.name == "postgresql":
+            return values(column("slot_start", DateTime), column("covers", Integer), name="freed").data(rows)
+        # SQLite no admite nombres de columna sobre un VALUES en el FROM: las mismas filas con UNION ALL
+        return union_all(*[
+            select(literal(slot, DateTime).label("slot_start"), literal(covers, Integer).label("covers"))
+            for slot, covers in rows
+        ]).subquery("freed")
+
+    def _subtract(self, restaurant_id: UUID, slots: List[datetime], covers: int) -> None:
+        if slots:
+            self.db.exec(
+                update(SlotCoversDB)
+                .where(SlotCoversDB.restaurant_id == restaurant_id, SlotCoversDB.slot_start.in_(slots))
+                .values(covers=SlotCoversDB.covers - covers)
+            )
+
+    def get_covers(self, restaurant_id: UUID, start: datetime, end: datetime) -> Dict[datetime, int]:
+        stmt = select(SlotCoversDB.slot_start, SlotCoversDB.covers).where(
+            SlotCoversDB.restaurant_id == restaurant_id,
+            SlotCoversDB.slot_start >= start,
+            SlotCoversDB.slot_start < end,
+        )
+        return {slot: covers for slot, covers in self.db.exec(stmt).all()}
@@ -0,0 +1,15 @@
+from sqlmodel import SQLModel, Field
+from uuid import UUID
+from datetime import datetime
+
+class SlotCoversDB(SQLModel, table=True):
+    """
+    Cubiertos ya reservados por restaurante y franja de 15 minutos. Lo actualizan el servicio de
+    reservas (alta, cancelación, reprogramación) en la misma transacción que la reserva, así la
+    admisión es una lectura/escritura condicional de pocas filas por clave primaria.
+    """
+    __tablename__ = "restaurant_slot_covers"
+
+    restaurant_id: UUID = Field(primary_key=True)
+    slot_start: datetime = Field(primary_key=True)
+    covers: int = 0
@@ -0,0 +1,46 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import DDL, Index, event
+from uuid import UUID
+from datetime import datetime
+from modules.reservation.domain.slot_hold import SlotHold
+
+# Restricción de exclusión de Postgres: dos retenciones no pueden solapar en la misma mesa
+SLOT_HOLD_NO_OVERLAP_CONSTRAINT = "slot_hold_table_no_overlap"
+
+class SlotHoldDB(SQLModel, table=True):
+    __tablename__ = "slot_holds"
+    __table_args__ = (
+        # Chequeo de solapamiento de create_reservation y de nuevas retenciones
+        Index("ix_slot_holds_table_time", "table_id", "start_time", "end_time"),
+        # Asignación automática de mesa (retenciones del restaurante)
+        Index("ix_slot_holds_restaurant_time", "restaurant_id", "start_time"),
+    )
+
+    id: UUID = Field(primary_key=True)
+    user_id: UUID
+    table_id: UUID
+    restaurant_id: UUID
+    start_time: datetime
+    end_time: datetime
+    num_people: int
+    # Barrido de vencidas
+    expires_at: datetime = Field(index=True)
+
+# Con create_all sobre Postgres también se crea la restricción (en producción la agrega la migración)
+event.listen(
+    SlotHoldDB.__table__,
+    "after_create",
+    DDL(
+        "CREATE EXTENSION IF NOT EXISTS btree_gist; "
+        f"ALTER TABLE slot_holds ADD CONSTRAINT {SLOT_HOLD_NO_OVERLAP_CONSTRAINT} "
+        "EXCLUDE USING gist (table_id WITH =, tsrange(start_time, end_time, '[)') WITH &&)"
+    ).execute_if(dialect="postgresql"),
+)
+
+# Convertir de SlotHoldDB (infraestructura) a SlotHold (dominio)
+def to_domain(hold_db: SlotHoldDB) -> SlotHold:
+    return SlotHold(**hold_db.model_dump())
+
+# Convertir de SlotHold (dominio) a SlotHoldDB (infraestructura)
+def to_db(hold: SlotHold) -> SlotHoldDB:
+    return SlotHoldDB(**hold.model_dump())
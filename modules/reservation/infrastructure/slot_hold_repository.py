@@ -0,0 +1,72 @@
+from sqlmodel import Session, select, delete
+from sqlalchemy import exists
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from modules.core.unit_of_work import commit
+from modules.reservation.domain.slot_hold import SlotHold
+from modules.reservation.domain.slot_hold_repository_interface import ISlotHoldRepository
+from modules.reservation.domain.reservation_exceptions import SlotHoldConflictError
+from modules.reservation.infrastructure.slot_hold_db_model import (
+    SlotHoldDB, SLOT_HOLD_NO_OVERLAP_CONSTRAINT, to_domain, to_db
+)
+
+def _active_overlapping(start_time: datetime, end_time: datetime, now: datetime):
+    return (
+        (SlotHoldDB.start_time < end_time) &
+        (SlotHoldDB.end_time > start_time) &
+        (SlotHoldDB.expires_at > now)
+    )
+
+class SlotHoldRepository(ISlotHoldRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create(self, hold: SlotHold, now: datetime) -> SlotHold:
+        # Las vencidas de la mesa se borran antes: la restricción de exclusión no sabe de expires_at
+        self.db.exec(delete(SlotHoldDB).where(SlotHoldDB.table_id == hold.table_id, SlotHoldDB.expires_at <= now))
+        if self.exists_active_by_table_and_time(hold.table_id, hold.start_time, hold.end_time, now):
+            raise SlotHoldConflictError(str(hold.table_id))
+        self.db.add(to_db(hold))
+        try:
+            commit(self.db)
+        except IntegrityError as e:
+            self.db.rollback()
+            if SLOT_HOLD_NO_OVERLAP_CONSTRAINT in str(e.orig):
+                raise SlotHoldConflictError(str(hold.table_id)) from e
+            raise
+        return hold
+
+    def get(self, hold_id: UUID, now: datetime) -> Optional[SlotHold]:
+        hold = self.db.get(SlotHoldDB, hold_id)
+        if not hold or hold.expires_at <= now:
+            return None
+        return to_domain(hold)
+
+    def exists_active_by_table_and_time(self, table_id: UUID, start_time: datetime, end_time: datetime,
+                                        now: datetime, exclude_user: Optional[UUID] = None) -> bool:
+        conditions = [SlotHoldDB.table_id == table_id, _active_overlapping(start_time, end_time, now)]
+        if exclude_user is not None:
+            conditions.append(SlotHoldDB.user_id != exclude_user)
+        return self.db.exec(select(exists().where(*conditions))).one()
+
+    def get_active_by_restaurant(self, restaurant_id: UUID, start_time: datetime, end_time: datetime,
+                                 now: datetime, exclude_user: Optional[UUID] = None) -> List[SlotHold]:
+        stmt = select(SlotHoldDB).where(
+            SlotHoldDB.restaurant_id == restaurant_id, _active_overlapping(start_time, end_time, now)
+        )
+        if exclude_user is not None:
+            stmt = stmt.where(SlotHoldDB.user_id != exclude_user)
+        return [to_domain(h) for h in self.db.exec(stmt).all()]
+
+    def delete(self, hold_id: UUID) -> bool:
+        result = self.db.exec(delete(SlotHoldDB).where(SlotHoldDB.id == hold_id))
+        commit(self.db)
+        return result.rowcount > 0
+
+    def delete_expired(self, now: datetime, limit: int) -> int:
+        expired = select(SlotHoldDB.id).where(SlotHoldDB.expires_at <= now).limit(limit)
+        result = self.db.exec(delete(SlotHoldDB).where(SlotHoldDB.id.in_(expired)))
+        commit(self.db)
+        return result.rowcount
@@ -0,0 +1,36 @@
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, text
+from uuid import UUID, uuid4
+from datetime import date, datetime
+from typing import Optional
+from modules.reservation.domain.waitlist_entry import WaitlistEntry, WaitlistStatus
+
+WAITING_FILTER = text("status = 'WAITING'")
+
+class WaitlistEntryDB(SQLModel, table=True):
+    __tablename__ = "waitlist_entries"
+    __table_args__ = (
+        # Cola por (restaurante, día) en orden de llegada; solo las entradas en espera
+        Index("ix_waitlist_waiting_restaurant_bucket", "restaurant_id", "time_bucket", "created_at",
+              postgresql_where=WAITING_FILTER, sqlite_where=WAITING_FILTER),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: UUID = Field(index=True)
+    restaurant_id: UUID = Field(foreign_key="restaurantdbmodel.id")
+    party_size: int
+    window_start: datetime
+    window_end: datetime
+    duration_minutes: int
+    time_bucket: date
+    status: WaitlistStatus = Field(default=WaitlistStatus.WAITING)
+    created_at: datetime
+    reservation_id: Optional[UUID] = None
+
+# Convertir de WaitlistEntryDB (infraestructura) a WaitlistEntry (dominio)
+def to_domain(entry_db: WaitlistEntryDB) -> WaitlistEntry:
+    return WaitlistEntry(**entry_db.model_dump())
+
+# Convertir de WaitlistEntry (dominio) a WaitlistEntryDB (infraestructura)
+def to_db(entry: WaitlistEntry) -> WaitlistEntryDB:
+    return WaitlistEntryDB(**entry.model_dump())
@@ -0,0 +1,62 @@
+from sqlmodel import Session, select, update
+from typing import List, Optional
+from uuid import UUID
+from datetime import date, datetime
+from modules.core.unit_of_work import commit
+from modules.reservation.domain.waitlist_entry import WaitlistEntry, WaitlistStatus
+from modules.reservation.domain.waitlist_repository_interface import IWaitlistRepository
+from modules.reservation.domain.reservation import MAX_RESERVATION_DURATION
+from modules.reservation.infrastructure.waitlist_db_model import WaitlistEntryDB, to_domain, to_db
+
+class WaitlistRepository(IWaitlistRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def save(self, entry: WaitlistEntry) -> WaitlistEntry:
+        self.db.add(to_db(entry))
+        commit(self.db)
+        return entry
+
+    def get_by_id(self, entry_id: UUID) -> Optional[WaitlistEntry]:
+        entry = self.db.get(WaitlistEntryDB, entry_id)
+        return to_domain(entry) if entry else None
+
+    def get_by_user(self, user_id: UUID) -> List[WaitlistEntry]:
+        stmt = select(WaitlistEntryDB).where(WaitlistEntryDB.user_id == user_id).order_by(WaitlistEntryDB.created_at)
+        return [to_domain(e) for e in self.db.exec(stmt).all()]
+
+    def find_candidates(self, restaurant_id: UUID, buckets: List[date], max_party_size: int,
+                        start: datetime, end: datetime, limit: int) -> List[WaitlistEntry]:
+        # Recorre el índice parcial (restaurant_id, time_bucket, created_at) solo en los días indicados
+        stmt = (
+            select(WaitlistEntryDB)
+            .where(
+                (WaitlistEntryDB.restaurant_id == restaurant_id) &
+                (WaitlistEntryDB.time_bucket.in_(buckets)) &
+                (WaitlistEntryDB.status == WaitlistStatus.WAITING) &
+                (WaitlistEntryDB.party_size <= max_party_size) &
+                (WaitlistEntryDB.window_start < end) &
+                (WaitlistEntryDB.window_end > start - MAX_RESERVATION_DURATION)
+            )
+            .order_by(WaitlistEntryDB.created_at)
+            .limit(limit)
+        )
+        return [to_domain(e) for e in self.db.exec(stmt).all()]
+
+    def mark_promoted(self, entry_id: UUID, reservation_id: UUID) -> bool:
+        return self._transition(entry_id, WaitlistStatus.PROMOTED, reservation_id=reservation_id)
+
+    def cancel(self, entry_id: UUID, user_id: UUID) -> bool:
+        return self._transition(entry_id, WaitlistStatus.CANCELLED, WaitlistEntryDB.user_id == user_id)
+
+    def _transition(self, entry_id: UUID, new_status: WaitlistStatus, *conditions, **values) -> bool:
+        # Condicional sobre WAITING: dos cancelaciones concurrentes no promueven la misma entrada
+        stmt = (
+            update(WaitlistEntryDB)
+            .where(WaitlistEntryDB.id == entry_id, WaitlistEntryDB.status == WaitlistStatus.WAITING, *conditions)
+            .values(status=new_status, **values)
+            .execution_options(synchronize_session=False)
+        )
+        updated = self.db.exec(stmt).rowcount
+        commit(self.db)
+        return updated == 1
@@ -0,0 +1,21 @@
+import pytest
+from datetime import datetime, timedelta
+
+from modules.reservation.application.recurrence import SeriesFrequency, MAX_SERIES_OCCURRENCES, expand_occurrences
+
+START = datetime(2030, 7, 10, 13, 0)
+END = START + timedelta(hours=2)
+
+def test_weekly_by_count():
+    occurrences = expand_occurrences(START, END, SeriesFrequency.WEEKLY, count=3)
+
+    assert occurrences == [(START + timedelta(weeks=w), END + timedelta(weeks=w)) for w in range(3)]
+
+def test_biweekly_until_is_inclusive():
+    occurrences = expand_occurrences(START, END, SeriesFrequency.BIWEEKLY, until=START + timedelta(weeks=4))
+
+    assert [start for start, _ in occurrences] == [START, START + timedelta(weeks=2), START + timedelta(weeks=4)]
+
+def test_too_many_occurrences_rejected():
+    with pytest.raises(ValueError):
+        expand_occurrences(START, END, SeriesFrequency.WEEKLY, until=START + timedelta(weeks=MAX_SERIES_OCCURRENCES))
@@ -1,18 +1,27 @@
 import pytest
 from unittest.mock import Mock
 from uuid import uuid4
-from datetime import datetime, timedelta, UTC
+from datetime import datetime, timedelta, time, UTC
 from fastapi import HTTPException
 
 from modules.reservation.application.reservation_services import ReservationService
 from modules.reservation.application.dtos.reservation_create_dto import ReservationCreateDto
 from modules.reservation.application.dtos.reservation_response_dto import ReservationResponseDto
-from modules.reservation.domain.reservation import Reservation, ReservationStatus
+from modules.reservation.application.dtos.reservation_reschedule_dto import ReservationRescheduleDto
+from modules.reservation.application.dtos.slot_check_dto import SlotCandidateDto
+from modules.reservation.application.dtos.reservation_series_dto import ReservationSeriesCreateDto
+from modules.reservation.application.cursor import decode_cursor
+from modules.reservation.domain.reservation import Reservation, ReservationDetail, ReservationStatus
 from modules.reservation.domain.reservation_repository_interface import IReservationRepository
+from modules.reservation.domain.reservation_exceptions import ReservationConflictError, IdempotencyKeyConflictError
+from modules.reservation.domain.idempotency_repository_interface import IIdempotencyRepository
+from modules.reservation.domain.slot_capacity_repository_interface import ISlotCapacityRepository
 from modules.menu.domain.menu_repository_interface import MenuRepositoryInterface
 from modules.restaurant.domain.table_repository_interface import ITableRepository
 from modules.restaurant.domain.restaurant_repository_interface import IRestaurantRepository
-from modules.menu.domain.menu_item import MenuItem
+from modules.restaurant.domain.restaurant import Restaurant
+from modules.reservation.domain.table_occupancy import TableOccupancy
+from modules.reservation.domain.day_sheet import DaySheetEntry, DaySheetPreOrder
 
 @pytest.fixture
 def mock_reservation_repo():
@@ -73,17 +82,8 @@ def test_create_reservation_overlapping_table_rejected(reservation_service, mock
     )
 
     mock_table_repo.get_by_id.return_value = sample_table
-    mock_reservation_repo.get_active_by_user_and_time.return_value = None
-    mock_reservation_repo.get_active_by_table_and_time.return_value = Reservation(
-        uuid=uuid4(),
-        user_id=uuid4(),
-        table_id=sample_table.id,
-        start_time=start_time,
-        end_time=end_time,
-        num_people=2,
-        special_instructions=None,
-        status=ReservationStatus.PENDING
-    )
+    mock_reservation_repo.exists_active_by_user_and_time.return_value = False
+    mock_reservation_repo.exists_active_by_table_and_time.return_value = True
 
     # Act & Assert
     with pytest.raises(HTTPException) as exc_info:
@@ -91,7 +91,7 @@ def test_create_reservation_overlapping_table_rejected(reservation_service, mock
     
     assert exc_info.value.status_code == 409
     assert exc_info.value.detail == "This table is already reserved at that time."
-    mock_reservation_repo.get_active_by_table_and_time.assert_called_once_with(dto.table_id, dto.start_time, dto.end_time)
+    mock_reservation_repo.exists_active_by_table_and_time.assert_called_once_with(dto.table_id, dto.start_time, dto.end_time)
 
 # Test de Pre-orden Inválido
 def test_create_reservation_invalid_preordered_dish_rejected(reservation_service, mock_reservation_repo, mock_table_repo, mock_menu_repo, sample_table, sample_user_id):
@@ -110,9 +110,9 @@ def test_create_reservation_invalid_preordered_dish_rejected(reservation_service
     )
 
     mock_table_repo.get_by_id.return_value = sample_table
-    mock_reservation_repo.get_active_by_user_and_time.return_value = None
-    mock_reservation_repo.get_active_by_table_and_time.return_value = None
-    mock_menu_repo.get_all_by_restaurant.return_value = [] # No dishes available
+    mock_reservation_repo.exists_active_by_user_and_time.return_value = False
+    mock_reservation_repo.exists_active_by_table_and_time.return_value = False
+    mock_menu_repo.get_available_dish_ids.return_value = set() # No dishes available
 
     # Act & Assert
     with pytest.raises(HTTPException) as exc_info:
@@ -120,7 +120,7 @@ def test_create_reservation_invalid_preordered_dish_rejected(reservation_service
     
     assert exc_info.value.status_code == 400
     assert exc_info.value.detail == f"Dish {invalid_dish_id} is not available for this restaurant."
-    mock_menu_repo.get_all_by_restaurant.assert_called_once_with(sample_table.restaurant_id)
+    mock_menu_repo.get_available_dish_ids.assert_called_once_with(sample_table.restaurant_id, [invalid_dish_id])
 
 def test_create_reservation_too_many_preordered_dishes_rejected(reservation_service, mock_reservation_repo, mock_table_repo, mock_menu_repo, sample_table, sample_user_id):
     # Arrange
@@ -140,17 +140,11 @@ def test_create_reservation_too_many_preordered_dishes_rejected(reservation_serv
     )
 
     mock_table_repo.get_by_id.return_value = sample_table
-    mock_reservation_repo.get_active_by_user_and_time.return_value = None
-    mock_reservation_repo.get_active_by_table_and_time.return_value = None
+    mock_reservation_repo.exists_active_by_user_and_time.return_value = False
+    mock_reservation_repo.exists_active_by_table_and_time.return_value = False
     
     # Mock some available dishes, but not enough to cover the too_many_dishes list
-    mock_menu_repo.get_all_by_restaurant.return_value = [
-        MenuItem(id=too_many_dishes[0], name="Dish 1", description="", category="", price=10.0, available_stock=10, image_url="http://example.com/1", restaurant_id=sample_table.restaurant_id),
-        MenuItem(id=too_many_dishes[1], name="Dish 2", description="", category="", price=10.0, available_stock=10, image_url="http://example.com/2", restaurant_id=sample_table.restaurant_id),
-        MenuItem(id=too_many_dishes[2], name="Dish 3", description="", category="", price=10.0, available_stock=10, image_url="http://example.com/3", restaurant_id=sample_table.restaurant_id),
-        MenuItem(id=too_many_dishes[3], name="Dish 4", description="", category="", price=10.0, available_stock=10, image_url="http://example.com/4", restaurant_id=sample_table.restaurant_id),
-        MenuItem(id=too_many_dishes[4], name="Dish 5", description="", category="", price=10.0, available_stock=10, image_url="http://example.com/5", restaurant_id=sample_table.restaurant_id),
-    ]
+    mock_menu_repo.get_available_dish_ids.return_value = set(too_many_dishes[:5])
 
     # Act & Assert
     with pytest.raises(HTTPException) as exc_info:
@@ -158,7 +152,7 @@ def test_create_reservation_too_many_preordered_dishes_rejected(reservation_serv
     
     assert exc_info.value.status_code == 400
     assert exc_info.value.detail == "Cannot pre-order more than 5 dishes."
-    mock_menu_repo.get_all_by_restaurant.assert_not_called()
+    mock_menu_repo.get_available_dish_ids.assert_not_called()
 
 
 def test_create_reservation_success_with_preordered_dishes(reservation_service, mock_reservation_repo, mock_table_repo, mock_menu_repo, mock_restaurant_repo, sample_table, sample_user_id, sample_restaurant):
@@ -179,14 +173,11 @@ def test_create_reservation_success_with_preordered_dishes(reservation_service,
     )
 
     mock_table_repo.get_by_id.return_value = sample_table
-    mock_reservation_repo.get_active_by_user_and_time.return_value = None
-    mock_reservation_repo.get_active_by_table_and_time.return_value = None
+    mock_reservation_repo.exists_active_by_user_and_time.return_value = False
+    mock_reservation_repo.exists_active_by_table_and_time.return_value = False
     mock_restaurant_repo.get_by_id.return_value = sample_restaurant
     
-    mock_menu_repo.get_all_by_restaurant.return_value = [
-        MenuItem(id=dish_id_1, name="Dish 1", description="", category="", price=10.0, available_stock=10, image_url="http://example.com/1", restaurant_id=sample_table.restaurant_id),   
-        MenuItem(id=dish_id_2, name="Dish 2", description="", category="", price=10.0, available_stock=10, image_url="http://example.com/2", restaurant_id=sample_table.restaurant_id),
-    ]
+    mock_menu_repo.get_available_dish_ids.return_value = {dish_id_1, dish_id_2}
 
     mock_reservation_repo.save.return_value = ReservationResponseDto(
         uuid=uuid4(),
@@ -200,7 +191,6 @@ def test_create_reservation_success_with_preordered_dishes(reservation_service,
         preordered_dishes=dto.preordered_dishes,
         restaurant_name=sample_restaurant.name
     )
-    mock_menu_repo.save_pre_order_item.return_value = None # Mock the save operation
 
     # Act
     response_dto = reservation_service.create_reservation(sample_user_id, dto)
@@ -209,5 +199,450 @@ def test_create_reservation_success_with_preordered_dishes(reservation_service,
     assert response_dto.table_id == dto.table_id
     assert response_dto.preordered_dishes == dto.preordered_dishes
     mock_reservation_repo.save.assert_called_once()
-    mock_menu_repo.get_all_by_restaurant.assert_called_once_with(sample_table.restaurant_id)
-    assert mock_menu_repo.save_pre_order_item.call_count == len(dto.preordered_dishes)
\ No newline at end of file
+    mock_menu_repo.get_available_dish_ids.assert_called_once_with(sample_table.restaurant_id, dto.preordered_dishes)
+    mock_menu_repo.reserve_stock.assert_called_once_with({dish_id_1: 1, dish_id_2: 1})
+    mock_menu_repo.bulk_save_pre_order_items.assert_called_once()
+    saved_items = mock_menu_repo.bulk_save_pre_order_items.call_args.args[0]
+    assert [item.menu_item_id for item in saved_items] == dto.preordered_dishes
+
+
+def test_get_by_date_range_uses_joined_read_path(reservation_service, mock_reservation_repo, mock_table_repo, mock_restaurant_repo, sample_user_id):
+    start_time = datetime.now(UTC) + timedelta(days=1)
+    details = [
+        ReservationDetail(
+            uuid=uuid4(),
+            user_id=sample_user_id,
+            table_id=uuid4(),
+            start_time=start_time + timedelta(hours=i),
+            end_time=start_time + timedelta(hours=i + 1),
+            num_people=2,
+            special_instructions=None,
+            status=ReservationStatus.PENDING,
+            restaurant_name="Test Restaurant Name"
+        )
+        for i in range(3)
+    ]
+    mock_reservation_repo.get_details_by_date_range.return_value = details
+
+    result = reservation_service.get_by_date_range(start_time, start_time + timedelta(days=1))
+
+    assert [r.uuid for r in result] == [d.uuid for d in details]
+    assert all(r.restaurant_name == "Test Restaurant Name" for r in result)
+    mock_table_repo.get_by_id.assert_not_called()
+    mock_restaurant_repo.get_by_id.assert_not_called()
+
+def test_get_by_date_range_page_returns_next_cursor(reservation_service, mock_reservation_repo, sample_user_id):
+    start_time = datetime(2025, 7, 10, 18, 0)
+    details = [
+        ReservationDetail(
+            uuid=uuid4(),
+            user_id=sample_user_id,
+            table_id=uuid4(),
+            start_time=start_time + timedelta(minutes=30 * i),
+            end_time=start_time + timedelta(minutes=30 * i + 60),
+            num_people=2,
+            special_instructions=None,
+            status=ReservationStatus.PENDING,
+            restaurant_name="Test Restaurant Name"
+        )
+        for i in range(3)
+    ]
+    mock_reservation_repo.get_details_by_date_range.return_value = details
+
+    page = reservation_service.get_by_date_range_page(start_time, start_time + timedelta(days=1), limit=2)
+
+    assert len(page.items) == 2
+    assert decode_cursor(page.next_cursor) == (details[1].start_time, details[1].uuid)
+    mock_reservation_repo.get_details_by_date_range.assert_called_once_with(
+        start_time, start_time + timedelta(days=1), after=None, limit=3
+    )
+
+def test_search_availability_respects_opening_hours(reservation_service, mock_reservation_repo, mock_restaurant_repo):
+    restaurant_id = uuid4()
+    mock_restaurant_repo.get_by_id.return_value = Restaurant(
+        id=restaurant_id, name="Test", address="Calle 1", opening_time=time(12, 0), closing_time=time(15, 0)
+    )
+    mock_reservation_repo.find_free_table_slots.return_value = []
+    day = datetime(2025, 7, 10)
+
+    reservation_service.search_availability(restaurant_id, 2, day + timedelta(hours=10), day + timedelta(hours=20),
+                                            duration_minutes=120, slot_minutes=30)
+
+    _, party_size, slots = mock_reservation_repo.find_free_table_slots.call_args.args
+    assert party_size == 2
+    assert [s for s, _ in slots] == [day + timedelta(hours=12), day + timedelta(hours=12, minutes=30), day + timedelta(hours=13)]
+    assert all(e - s == timedelta(hours=2) for s, e in slots)
+
+def test_create_reservation_concurrent_double_booking_rejected(reservation_service, mock_reservation_repo, mock_table_repo, mock_restaurant_repo, sample_table, sample_restaurant, sample_user_id):
+    # Otro worker reservó la mesa entre el chequeo y el insert: la restricción de exclusión lo rechaza
+    start_time = datetime.now(UTC) + timedelta(hours=1)
+    dto = ReservationCreateDto(
+        table_id=sample_table.id,
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=1),
+        num_people=2,
+        special_instructions=None,
+        preordered_dishes=[]
+    )
+    mock_table_repo.get_by_id.return_value = sample_table
+    mock_restaurant_repo.get_by_id.return_value = sample_restaurant
+    mock_reservation_repo.exists_active_by_user_and_time.return_value = False
+    mock_reservation_repo.exists_active_by_table_and_time.return_value = False
+    mock_reservation_repo.save.side_effect = ReservationConflictError(str(sample_table.id))
+
+    with pytest.raises(HTTPException) as exc_info:
+        reservation_service.create_reservation(sample_user_id, dto)
+
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail == "This table is already reserved at that time."
+
+def make_reservation(user_id, start_time, status=ReservationStatus.PENDING):
+    return Reservation(
+        uuid=uuid4(), user_id=user_id, table_id=uuid4(), start_time=start_time,
+        end_time=start_time + timedelta(hours=2), num_people=2, special_instructions=None, status=status
+    )
+
+def test_cancel_reservation_single_conditional_update(reservation_service, mock_reservation_repo, sample_user_id):
+    reservation = make_reservation(sample_user_id, datetime.utcnow() + timedelta(days=1), ReservationStatus.CANCELLED)
+    mock_reservation_repo.transition_status.return_value = reservation
+
+    assert reservation_service.cancel_reservation(reservation.uuid, sample_user_id) == reservation
+
+    args, kwargs = mock_reservation_repo.transition_status.call_args
+    assert args[:2] == (reservation.uuid, ReservationStatus.CANCELLED)
+    assert kwargs["user_id"] == sample_user_id
+    assert kwargs["starts_after"] > datetime.utcnow() + timedelta(minutes=59)
+    # El camino feliz no lee la reserva
+    mock_reservation_repo.get_by_id.assert_not_called()
+    mock_reservation_repo.update.assert_not_called()
+
+def test_cancel_reservation_too_late_rejected(reservation_service, mock_reservation_repo, sample_user_id):
+    reservation = make_reservation(sample_user_id, datetime.utcnow() + timedelta(minutes=30))
+    mock_reservation_repo.transition_status.return_value = None
+    mock_reservation_repo.get_by_id.return_value = reservation
+
+    with pytest.raises(HTTPException) as exc_info:
+        reservation_service.cancel_reservation(reservation.uuid, sample_user_id)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "You can only cancel at least 1 hour in advance."
+
+def test_cancel_reservation_of_another_user_forbidden(reservation_service, mock_reservation_repo, sample_user_id):
+    reservation = make_reservation(uuid4(), datetime.utcnow() + timedelta(days=1))
+    mock_reservation_repo.transition_status.return_value = None
+    mock_reservation_repo.get_by_id.return_value = reservation
+
+    with pytest.raises(HTTPException) as exc_info:
+        reservation_service.cancel_reservation(reservation.uuid, sample_user_id)
+
+    assert exc_info.value.status_code == 403
+
+def test_reschedule_reservation_single_conditional_update(reservation_service, mock_reservation_repo, sample_user_id):
+    reservation = make_reservation(sample_user_id, datetime.utcnow() + timedelta(days=1))
+    new_start = reservation.start_time + timedelta(hours=3)
+    mock_reservation_repo.get_by_id.return_value = reservation
+    mock_reservation_repo.exists_active_by_user_and_time.return_value = False
+    mock_reservation_repo.exists_active_by_table_and_time.return_value = False
+    mock_reservation_repo.reschedule.return_value = reservation.model_copy(update={"start_time": new_start})
+    mock_reservation_repo.get_detail_by_id.return_value = ReservationDetail(
+        **reservation.model_copy(update={"start_time": new_start, "end_time": new_start + timedelta(hours=2)}).model_dump(),
+        restaurant_name="Goyo"
+    )
+
+    result = reservation_service.reschedule_reservation(
+        reservation.uuid, sample_user_id,
+        ReservationRescheduleDto(start_time=new_start, end_time=new_start + timedelta(hours=2))
+    )
+
+    assert result.start_time == new_start
+    # El solapamiento ignora la propia reserva y la escritura es un único UPDATE condicional
+    assert mock_reservation_repo.exists_active_by_table_and_time.call_args.kwargs["exclude"] == reservation.uuid
+    args, kwargs = mock_reservation_repo.reschedule.call_args
+    assert args[:4] == (reservation.uuid, new_start, new_start + timedelta(hours=2), reservation.table_id)
+    assert kwargs["user_id"] == sample_user_id
+    mock_reservation_repo.save.assert_not_called()
+    mock_reservation_repo.transition_status.assert_not_called()
+
+def test_reschedule_reservation_into_taken_slot_rejected(reservation_service, mock_reservation_repo, sample_user_id):
+    reservation = make_reservation(sample_user_id, datetime.utcnow() + timedelta(days=1))
+    mock_reservation_repo.get_by_id.return_value = reservation
+    mock_reservation_repo.exists_active_by_user_and_time.return_value = False
+    mock_reservation_repo.exists_active_by_table_and_time.return_value = False
+    mock_reservation_repo.reschedule.side_effect = ReservationConflictError(str(reservation.table_id))
+
+    with pytest.raises(HTTPException) as exc_info:
+        reservation_service.reschedule_reservation(
+            reservation.uuid, sample_user_id,
+            ReservationRescheduleDto(start_time=reservation.start_time + timedelta(hours=1),
+                                     end_time=reservation.end_time + timedelta(hours=1))
+        )
+
+    assert exc_info.value.status_code == 409
+
+def test_reschedule_reservation_invalid_duration_rejected(reservation_service, mock_reservation_repo, sample_user_id):
+    start = datetime.utcnow() + timedelta(days=1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        reservation_service.reschedule_reservation(
+            uuid4(), sample_user_id, ReservationRescheduleDto(start_time=start, end_time=start + timedelta(hours=5))
+        )
+
+    assert exc_info.value.status_code == 400
+    mock_reservation_repo.get_by_id.assert_not_called()
+
+def test_reschedule_reservation_requires_one_hour_notice_for_the_new_time(reservation_service, mock_reservation_repo,
+                                                                         sample_user_id):
+    reservation = make_reservation(sample_user_id, datetime.utcnow() + timedelta(days=1))
+    soon = datetime.utcnow() + timedelta(minutes=30)
+    mock_reservation_repo.get_by_id.return_value = reservation
+
+    with pytest.raises(HTTPException) as exc_info:
+        reservation_service.reschedule_reservation(
+            reservation.uuid, sample_user_id, ReservationRescheduleDto(start_time=soon, end_time=soon + timedelta(hours=2))
+        )
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "The new time must be at least 1 hour in advance."
+    mock_reservation_repo.reschedule.assert_not_called()
+
+    # El admin sí puede moverla a una hora cercana
+    mock_reservation_repo.exists_active_by_user_and_time.return_value = False
+    mock_reservation_repo.exists_active_by_table_and_time.return_value = False
+    mock_reservation_repo.reschedule.return_value = reservation.model_copy(update={"start_time": soon})
+    mock_reservation_repo.get_detail_by_id.return_value = ReservationDetail(
+        **reservation.model_copy(update={"start_time": soon, "end_time": soon + timedelta(hours=2)}).model_dump(),
+        restaurant_name="Goyo"
+    )
+    reservation_service.reschedule_reservation(
+        reservation.uuid, uuid4(), ReservationRescheduleDto(start_time=soon, end_time=soon + timedelta(hours=2)),
+        is_admin=True
+    )
+    mock_reservation_repo.reschedule.assert_called_once()
+
+def test_cancel_by_restaurant_runs_one_bulk_update(reservation_service, mock_reservation_repo, mock_restaurant_repo, sample_restaurant):
+    restaurant_id = uuid4()
+    start = datetime(2025, 7, 10)
+    cancelled = [make_reservation(uuid4(), start + timedelta(hours=h), ReservationStatus.CANCELLED) for h in (12, 13)]
+    mock_restaurant_repo.get_by_id.return_value = sample_restaurant
+    mock_reservation_repo.bulk_transition_status_by_restaurant.return_value = cancelled
+    reservation_service.capacity_repo = Mock(spec=ISlotCapacityRepository)
+
+    result = reservation_service.cancel_by_restaurant(restaurant_id, start, start + timedelta(days=1))
+
+    assert result.cancelled == 2
+    assert result.reservation_ids == [r.uuid for r in cancelled]
+    args = mock_reservation_repo.bulk_transition_status_by_restaurant.call_args.args
+    assert args[:4] == (restaurant_id, start, start + timedelta(days=1), ReservationStatus.CANCELLED)
+    # Los cubiertos se devuelven sumados por franja en una sola llamada (13:00-14:00 la comparten las dos)
+    reservation_service.capacity_repo.remove_covers.assert_not_called()
+    freed = reservation_service.capacity_repo.remove_covers_by_slot.call_args.args[1]
+    assert freed[start + timedelta(hours=12)] == 2
+    assert freed[start + timedelta(hours=13)] == 4
+    assert freed[start + timedelta(hours=14, minutes=45)] == 2
+    assert len(freed) == 12
+
+@pytest.fixture
+def mock_idempotency_repo():
+    return Mock(spec=IIdempotencyRepository)
+
+@pytest.fixture
+def idempotent_service(mock_reservation_repo, mock_table_repo, mock_menu_repo, mock_restaurant_repo, mock_idempotency_repo):
+    return ReservationService(mock_reservation_repo, mock_table_repo, mock_menu_repo, mock_restaurant_repo,
+                              idempotency_repo=mock_idempotency_repo)
+
+def prepare_create(mock_reservation_repo, mock_table_repo, mock_restaurant_repo, sample_table, sample_restaurant, sample_user_id):
+    start_time = datetime.now(UTC) + timedelta(hours=2)
+    dto = ReservationCreateDto(
+        table_id=sample_table.id,
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=1),
+        num_people=2,
+        special_instructions=None,
+        preordered_dishes=[]
+    )
+    mock_table_repo.get_by_id.return_value = sample_table
+    mock_restaurant_repo.get_by_id.return_value = sample_restaurant
+    mock_reservation_repo.exists_active_by_user_and_time.return_value = False
+    mock_reservation_repo.exists_active_by_table_and_time.return_value = False
+    mock_reservation_repo.save.side_effect = lambda reservation: reservation
+    return dto
+
+def test_create_reservation_stores_idempotent_response(idempotent_service, mock_reservation_repo, mock_table_repo, mock_restaurant_repo, mock_idempotency_repo, sample_table, sample_restaurant, sample_user_id):
+    dto = prepare_create(mock_reservation_repo, mock_table_repo, mock_restaurant_repo, sample_table, sample_restaurant, sample_user_id)
+
+    response = idempotent_service.create_reservation(sample_user_id, dto, "retry-1")
+
+    record = mock_idempotency_repo.save.call_args.args[0]
+    assert record.user_id == sample_user_id
+    assert record.key == "retry-1"
+    assert record.expires_at > record.created_at
+    assert ReservationResponseDto.model_validate_json(record.response_body) == response
+
+def test_idempotent_replay_returns_stored_response(idempotent_service, mock_reservation_repo, mock_table_repo, mock_restaurant_repo, mock_idempotency_repo, sample_table, sample_restaurant, sample_user_id):
+    dto = prepare_create(mock_reservation_repo, mock_table_repo, mock_restaurant_repo, sample_table, sample_restaurant, sample_user_id)
+    response = idempotent_service.create_reservation(sample_user_id, dto, "retry-1")
+    mock_idempotency_repo.get.return_value = mock_idempotency_repo.save.call_args.args[0]
+
+    assert idempotent_service.get_idempotent_response(sample_user_id, "retry-1", dto) == response
+
+    other = dto.model_copy(update={"num_people": 4})
+    with pytest.raises(HTTPException) as exc_info:
+        idempotent_service.get_idempotent_response(sample_user_id, "retry-1", other)
+    assert exc_info.value.status_code == 422
+
+def test_concurrent_retry_with_same_key_returns_winner_response(idempotent_service, mock_reservation_repo, mock_table_repo, mock_restaurant_repo, mock_idempotency_repo, sample_table, sample_restaurant, sample_user_id):
+    dto = prepare_create(mock_reservation_repo, mock_table_repo, mock_restaurant_repo, sample_table, sample_restaurant, sample_user_id)
+    winner = idempotent_service.create_reservation(sample_user_id, dto, "retry-1")
+    stored = mock_idempotency_repo.save.call_args.args[0]
+
+    # El segundo intento choca con la mesa que reservó el primero: recibe la respuesta guardada, no un 409
+    mock_reservation_repo.save.side_effect = ReservationConflictError(str(sample_table.id))
+    mock_idempotency_repo.get.return_value = stored
+
+    assert idempotent_service.create_reservation(sample_user_id, dto, "retry-1") == winner
+
+    mock_reservation_repo.save.side_effect = lambda reservation: reservation
+    mock_idempotency_repo.save.side_effect = IdempotencyKeyConflictError("retry-1")
+    assert idempotent_service.create_reservation(sample_user_id, dto, "retry-1") == winner
+
+def test_create_reservation_auto_assigns_best_fit_table(reservation_service, mock_reservation_repo, mock_table_repo, mock_restaurant_repo, sample_restaurant, sample_user_id):
+    restaurant_id = uuid4()
+    start_time = datetime(2030, 7, 10, 20, 0)
+    tables = [
+        TableOccupancy(table_id=uuid4(), table_number=n, capacity=c, location="Indoor")
+        for n, c in ((1, 8), (2, 2), (3, 4))
+    ]
+    dto = ReservationCreateDto(
+        restaurant_id=restaurant_id,
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        num_people=3,
+        special_instructions=None,
+        preordered_dishes=[]
+    )
+    mock_restaurant_repo.get_by_id.return_value = sample_restaurant
+    mock_reservation_repo.get_table_occupancy.return_value = tables
+    mock_reservation_repo.exists_active_by_user_and_time.return_value = False
+    mock_reservation_repo.save.side_effect = lambda reservation: reservation
+
+    response = reservation_service.create_reservation(sample_user_id, dto)
+
+    assert response.table_id == tables[2].table_id
+    mock_reservation_repo.exists_active_by_table_and_time.assert_not_called()
+    mock_reservation_repo.get_table_occupancy.assert_called_once_with(
+        restaurant_id, datetime(2030, 7, 10), datetime(2030, 7, 11)
+    )
+
+def test_create_reservation_requires_table_or_restaurant():
+    with pytest.raises(ValueError):
+        ReservationCreateDto(start_time=datetime(2030, 7, 10, 20), end_time=datetime(2030, 7, 10, 22),
+                             num_people=2, special_instructions=None)
+
+def test_get_day_sheet_totals_dishes_of_active_reservations(reservation_service, mock_reservation_repo, mock_restaurant_repo, sample_restaurant, sample_user_id):
+    mock_restaurant_repo.get_by_id.return_value = sample_restaurant
+    restaurant_id, arepa = uuid4(), uuid4()
+    evening = datetime(2030, 7, 10, 20, 0)
+
+    def entry(status, quantity):
+        reservation = make_reservation(sample_user_id, evening, status)
+        return DaySheetEntry(
+            **reservation.model_dump(), restaurant_name="Goyo",
+            pre_orders=[DaySheetPreOrder(id=uuid4(), menu_item_id=arepa, menu_item_name="Arepa", quantity=quantity)]
+        )
+    mock_reservation_repo.get_day_sheet.return_value = [
+        entry(ReservationStatus.PENDING, 2), entry(ReservationStatus.CONFIRMED, 3), entry(ReservationStatus.CANCELLED, 5)
+    ]
+
+    sheet = reservation_service.get_day_sheet(restaurant_id, evening.date(), include_cancelled=True)
+
+    mock_reservation_repo.get_day_sheet.assert_called_once_with(
+        restaurant_id, datetime(2030, 7, 10), datetime(2030, 7, 11), True
+    )
+    assert len(sheet.reservations) == 3
+    assert [(t.menu_item_name, t.quantity) for t in sheet.dish_totals] == [("Arepa", 5)]
+
+def test_check_slots_uses_one_range_query(reservation_service, mock_reservation_repo):
+    table_a, table_b = uuid4(), uuid4()
+    evening = datetime(2030, 7, 10, 20, 0)
+    mock_reservation_repo.get_active_intervals_by_tables.return_value = {
+        table_a: [(evening, evening + timedelta(hours=2))]
+    }
+    candidates = [
+        SlotCandidateDto(table_id=table, start_time=evening + timedelta(minutes=m), end_time=evening + timedelta(minutes=m + 30))
+        for table in (table_a, table_b) for m in (-30, 90, 120)
+    ]
+
+    results = reservation_service.check_slots(candidates)
+
+    assert [r.available for r in results] == [True, False, True, True, True, True]
+    mock_reservation_repo.get_active_intervals_by_tables.assert_called_once()
+    table_ids, start, end = mock_reservation_repo.get_active_intervals_by_tables.call_args.args
+    assert set(table_ids) == {table_a, table_b}
+    assert (start, end) == (evening - timedelta(minutes=30), evening + timedelta(minutes=150))
+
+def test_check_slots_rejects_inverted_candidate(reservation_service, mock_reservation_repo):
+    evening = datetime(2030, 7, 10, 20, 0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        reservation_service.check_slots([SlotCandidateDto(table_id=uuid4(), start_time=evening, end_time=evening)])
+
+    assert exc_info.value.status_code == 400
+    mock_reservation_repo.get_active_intervals_by_tables.assert_not_called()
+
+def test_create_series_books_free_occurrences_and_reports_conflicts(reservation_service, mock_reservation_repo, mock_table_repo, mock_restaurant_repo, sample_table, sample_restaurant, sample_user_id):
+    sample_table.number = 7
+    mock_table_repo.get_by_id.return_value = sample_table
+    mock_restaurant_repo.get_by_id.return_value = sample_restaurant
+    first = (datetime.utcnow() + timedelta(days=1)).replace(microsecond=0)
+    # La segunda semana la mesa está tomada; la cuarta, el cliente ya tiene otra reserva
+    taken_table = make_reservation(uuid4(), first + timedelta(weeks=1, hours=1))
+    taken_table.table_id = sample_table.id
+    taken_user = make_reservation(sample_user_id, first + timedelta(weeks=3))
+    mock_reservation_repo.get_active_overlapping.return_value = [taken_table, taken_user]
+    mock_reservation_repo.bulk_save.side_effect = lambda reservations: reservations
+
+    result = reservation_service.create_series(sample_user_id, ReservationSeriesCreateDto(
+        table_id=sample_table.id, start_time=first, end_time=first + timedelta(hours=2), num_people=4,
+        frequency="WEEKLY", count=5
+    ))
+
+    mock_reservation_repo.get_active_overlapping.assert_called_once()
+    mock_reservation_repo.bulk_save.assert_called_once()
+    mock_reservation_repo.save.assert_not_called()
+    assert [r.start_time for r in result.created] == [first + timedelta(weeks=w) for w in (0, 2, 4)]
+    assert [(c.start_time, c.reason) for c in result.conflicts] == [
+        (first + timedelta(weeks=1), "This table is already reserved at that time."),
+        (first + timedelta(weeks=3), "You already have a reservation in this time slot."),
+    ]
+
+def test_create_series_accepts_timezone_aware_times(reservation_service, mock_reservation_repo, mock_table_repo,
+                                                    mock_restaurant_repo, sample_table, sample_restaurant,
+                                                    sample_user_id):
+    sample_table.number = 7
+    mock_table_repo.get_by_id.return_value = sample_table
+    mock_restaurant_repo.get_by_id.return_value = sample_restaurant
+    mock_reservation_repo.get_active_overlapping.return_value = []
+    mock_reservation_repo.bulk_save.side_effect = lambda reservations: reservations
+    first = (datetime.now(UTC) + timedelta(days=1)).replace(microsecond=0)
+
+    result = reservation_service.create_series(sample_user_id, ReservationSeriesCreateDto(
+        table_id=sample_table.id, start_time=first, end_time=first + timedelta(hours=2), num_people=4,
+        frequency="WEEKLY", until=first + timedelta(weeks=1)
+    ))
+
+    assert [r.start_time for r in result.created] == [first.replace(tzinfo=None) + timedelta(weeks=w) for w in (0, 1)]
+
+def test_create_series_race_on_insert_returns_409(reservation_service, mock_reservation_repo, mock_table_repo, mock_restaurant_repo, sample_table, sample_restaurant, sample_user_id):
+    mock_table_repo.get_by_id.return_value = sample_table
+    mock_restaurant_repo.get_by_id.return_value = sample_restaurant
+    mock_reservation_repo.get_active_overlapping.return_value = []
+    mock_reservation_repo.bulk_save.side_effect = ReservationConflictError(str(sample_table.id))
+    first = datetime.utcnow() + timedelta(days=1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        reservation_service.create_series(sample_user_id, ReservationSeriesCreateDto(
+            table_id=sample_table.id, start_time=first, end_time=first + timedelta(hours=2), num_people=4,
+            frequency="BIWEEKLY", until=first + timedelta(weeks=8)
+        ))
+
+    assert exc_info.value.status_code == 409
@@ -0,0 +1,38 @@
+import random
+from uuid import uuid4
+from datetime import datetime, timedelta
+
+from modules.reservation.application.slot_sweep import taken_slots
+
+DAY = datetime(2025, 7, 10)
+
+def at(hour, minutes=0):
+    return DAY + timedelta(hours=hour, minutes=minutes)
+
+def test_marks_overlaps_and_leaves_touching_slots_free():
+    table, other = uuid4(), uuid4()
+    booked = {table: [(at(20), at(22)), (at(13), at(14))]}
+    candidates = [
+        (table, at(19), at(20)),       # termina justo cuando empieza la reserva
+        (table, at(21, 30), at(22)),   # dentro
+        (table, at(22), at(23)),       # empieza justo cuando termina
+        (table, at(12), at(20, 30)),   # envuelve las dos
+        (other, at(20), at(22)),       # otra mesa sin reservas
+    ]
+
+    assert taken_slots(booked, candidates) == [False, True, False, True, False]
+
+def test_matches_pairwise_check_on_random_grid():
+    rng = random.Random(3)
+    tables = [uuid4() for _ in range(8)]
+    booked = {}
+    for table in tables:
+        for _ in range(6):
+            start = at(rng.randint(10, 22), rng.choice((0, 15, 30, 45)))
+            booked.setdefault(table, []).append((start, start + timedelta(minutes=rng.choice((30, 90, 240)))))
+    candidates = [(table, at(h, m), at(h, m) + timedelta(minutes=30))
+                  for table in tables for h in range(10, 24) for m in (0, 30)]
+
+    expected = [any(s < end and e > start for s, e in booked[table]) for table, start, end in candidates]
+
+    assert taken_slots(booked, candidates) == expected
@@ -0,0 +1,29 @@
+from uuid import uuid4
+from datetime import datetime, timedelta
+
+from modules.reservation.application.table_allocator import best_fit_table
+from modules.reservation.domain.table_occupancy import TableOccupancy
+
+DAY = datetime(2025, 7, 10)
+WINDOW = (DAY, DAY + timedelta(days=1))
+
+def make_table(number, capacity, *bookings):
+    booked = [(DAY + timedelta(hours=h), DAY + timedelta(hours=h + 2)) for h in bookings]
+    return TableOccupancy(table_id=uuid4(), table_number=number, capacity=capacity, location="Indoor", booked=booked)
+
+def test_picks_smallest_free_table_that_fits():
+    start, end = DAY + timedelta(hours=20), DAY + timedelta(hours=22)
+    two, four, eight = make_table(1, 2), make_table(2, 4), make_table(3, 8)
+
+    assert best_fit_table([eight, four, two], 2, start, end, *WINDOW) == two
+    assert best_fit_table([eight, four, make_table(1, 2, 19)], 2, start, end, *WINDOW) == four
+    assert best_fit_table([eight, four, two], 5, start, end, *WINDOW) == eight
+    assert best_fit_table([make_table(2, 4, 21), two], 3, start, end, *WINDOW) is None
+
+def test_among_equal_tables_prefers_the_tightest_gap():
+    # La mesa 2 termina una reserva justo cuando empieza la nueva: no deja tiempo muerto
+    first, second = make_table(1, 4, 16), make_table(2, 4, 18)
+
+    chosen = best_fit_table([first, second], 4, DAY + timedelta(hours=20), DAY + timedelta(hours=22), *WINDOW)
+
+    assert chosen == second
@@ -0,0 +1,115 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta, date
+
+from modules.reservation.domain.reservation import Reservation, ReservationStatus
+from modules.reservation.infrastructure.availability_index import (
+    AvailabilityIndex, BookedInterval, IntervalSet, days_touched
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def index(clock):
+    return AvailabilityIndex(ttl_seconds=60, clock=clock)
+
+def make_reservation(table_id, start, hours=2, user_id=None, status=ReservationStatus.PENDING):
+    return Reservation(
+        uuid=uuid4(),
+        user_id=user_id or uuid4(),
+        table_id=table_id,
+        start_time=start,
+        end_time=start + timedelta(hours=hours),
+        num_people=2,
+        special_instructions=None,
+        status=status
+    )
+
+def test_interval_set_detects_overlaps_and_touching_intervals():
+    intervals = IntervalSet()
+    base = datetime(2025, 7, 10, 18, 0)
+    first, second = uuid4(), uuid4()
+    intervals.add(first, base, base + timedelta(hours=2))
+    intervals.add(second, base + timedelta(hours=3), base + timedelta(hours=4))
+
+    assert intervals.overlaps(base + timedelta(hours=1), base + timedelta(hours=3))
+    assert intervals.overlaps(base - timedelta(hours=1), base + timedelta(minutes=1))
+    # Intervalos contiguos no se solapan: [18, 20) y [20, 21)
+    assert not intervals.overlaps(base + timedelta(hours=2), base + timedelta(hours=3))
+    assert not intervals.overlaps(base, base + timedelta(hours=2), exclude=first)
+
+    intervals.discard(first)
+    assert not intervals.overlaps(base, base + timedelta(hours=2))
+
+def test_days_touched_spans_midnight():
+    start = datetime(2025, 7, 10, 23, 0)
+    assert days_touched(start, start + timedelta(hours=2)) == [date(2025, 7, 10), date(2025, 7, 11)]
+    assert days_touched(start, datetime(2025, 7, 11)) == [date(2025, 7, 10)]
+
+def test_index_only_answers_for_loaded_buckets(index, clock):
+    table_id = uuid4()
+    start = datetime(2025, 7, 10, 20, 0)
+    day = start.date()
+
+    assert not index.is_loaded(AvailabilityIndex.TABLE, table_id, day)
+    reservation = make_reservation(table_id, start)
+    index.load(AvailabilityIndex.TABLE, [table_id], day, [BookedInterval.from_reservation(reservation)])
+
+    assert index.is_loaded(AvailabilityIndex.TABLE, table_id, day)
+    assert index.overlaps(AvailabilityIndex.TABLE, table_id, start + timedelta(hours=1), start + timedelta(hours=3))
+    assert index.overlaps(AvailabilityIndex.USER, reservation.user_id, start, start + timedelta(hours=1))
+
+    clock.now += 61
+    assert not index.is_loaded(AvailabilityIndex.TABLE, table_id, day)
+
+def test_index_stays_coherent_on_save_update_and_cancel(index):
+    table_id = uuid4()
+    start = datetime(2025, 7, 10, 20, 0)
+    index.load(AvailabilityIndex.TABLE, [table_id], start.date(), [])
+
+    reservation = make_reservation(table_id, start)
+    index.add(reservation)
+    assert index.overlaps(AvailabilityIndex.TABLE, table_id, start, start + timedelta(hours=1))
+
+    # Reprogramada: el intervalo viejo queda libre
+    reservation.start_time = start + timedelta(hours=3)
+    reservation.end_time = start + timedelta(hours=4)
+    index.add(reservation)
+    assert not index.overlaps(AvailabilityIndex.TABLE, table_id, start, start + timedelta(hours=1))
+    assert index.overlaps(AvailabilityIndex.TABLE, table_id, start + timedelta(hours=3), start + timedelta(hours=5))
+
+    reservation.status = ReservationStatus.CANCELLED
+    index.add(reservation)
+    assert not index.overlaps(AvailabilityIndex.TABLE, table_id, start + timedelta(hours=3), start + timedelta(hours=5))
+
+def test_load_does_not_resurrect_cancelled_reservation(index):
+    table_id = uuid4()
+    reservation = make_reservation(table_id, datetime(2025, 7, 10, 20, 0))
+    index.discard(reservation.uuid)
+
+    index.load(AvailabilityIndex.TABLE, [table_id], reservation.start_time.date(), [BookedInterval.from_reservation(reservation)])
+
+    assert not index.overlaps(AvailabilityIndex.TABLE, table_id, reservation.start_time, reservation.end_time)
+
+def test_forgotten_reservation_can_be_loaded_again(index):
+    table_id = uuid4()
+    reservation = make_reservation(table_id, datetime(2025, 7, 10, 20, 0))
+    day = reservation.start_time.date()
+    index.load(AvailabilityIndex.TABLE, [table_id], day, [BookedInterval.from_reservation(reservation)])
+    assert index.overlapping(AvailabilityIndex.TABLE, table_id, reservation.start_time,
+                             reservation.end_time) == [reservation.uuid]
+
+    # Otro worker la movió: se olvida sin lápida y una carga posterior la vuelve a traer
+    index.forget([reservation.uuid])
+    assert not index.overlaps(AvailabilityIndex.TABLE, table_id, reservation.start_time, reservation.end_time)
+    index.load(AvailabilityIndex.TABLE, [table_id], day, [BookedInterval.from_reservation(reservation)])
+    assert index.overlaps(AvailabilityIndex.TABLE, table_id, reservation.start_time, reservation.end_time)
@@ -0,0 +1,66 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from modules.menu.domain.pre_order_item import PreOrderItem
+from modules.menu.infrastructure.menu_item_db_model import MenuItemDB
+from modules.menu.infrastructure.menu_repository import MenuRepository
+from modules.reservation.domain.reservation import Reservation, ReservationStatus, ACTIVE_STATUSES
+from modules.reservation.infrastructure.availability_index import AvailabilityIndex
+from modules.reservation.infrastructure.reservation_repository import ReservationRepository
+
+DAY = datetime(2030, 7, 10)
+
+@pytest.fixture
+def tables(seed_restaurant, seed_tables):
+    return seed_tables(seed_restaurant().id, range(1, 21))
+
+def seed_day(db, tables):
+    dishes = [MenuItemDB(id=uuid4(), name=name, description="", category="Main", price=5.0,
+                         available_stock=100, restaurant_id=tables[0].restaurant_id, image_url=None)
+              for name in ("Cachapa", "Arepa", "Tequeños")]
+    db.add_all(dishes)
+    db.commit()
+
+    repo = ReservationRepository(db, index=AvailabilityIndex())
+    reservations = [
+        repo.save(Reservation(
+            uuid=uuid4(), user_id=uuid4(), table_id=table.id, start_time=DAY + timedelta(hours=12 + n % 10),
+            end_time=DAY + timedelta(hours=14 + n % 10), num_people=2, special_instructions=None,
+            status=ReservationStatus.PENDING
+        ))
+        for n, table in enumerate(tables)
+    ]
+    MenuRepository(db).bulk_save_pre_order_items([
+        PreOrderItem(id=uuid4(), menu_item_id=dish.id, reservation_id=r.uuid, quantity=2, special_instructions=None)
+        for r in reservations for dish in dishes[:2]
+    ])
+    return repo, reservations
+
+def test_day_sheet_loads_pre_orders_and_dishes_in_fixed_queries(engine, db, tables):
+    repo, reservations = seed_day(db, tables)
+    repo.transition_status(reservations[0].uuid, ReservationStatus.CANCELLED, ACTIVE_STATUSES)
+    restaurant_id = tables[0].restaurant_id
+    db.expire_all()
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        sheet = repo.get_day_sheet(restaurant_id, DAY, DAY + timedelta(days=1))
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    # Reservas + pre-órdenes + platos, sin importar la cantidad de reservas
+    assert len(statements) == 3
+    assert len(sheet) == len(reservations) - 1
+    assert [e.start_time for e in sheet] == sorted(e.start_time for e in sheet)
+    entry = sheet[0]
+    assert entry.restaurant_name == "Goyo"
+    assert entry.pre_order_count == 2
+    assert [p.menu_item_name for p in entry.pre_orders] == ["Arepa", "Cachapa"]
+
+    with_cancelled = repo.get_day_sheet(restaurant_id, DAY, DAY + timedelta(days=1), include_cancelled=True)
+    assert len(with_cancelled) == len(reservations)
+    assert repo.get_day_sheet(restaurant_id, DAY + timedelta(days=1), DAY + timedelta(days=2)) == []
@@ -0,0 +1,63 @@
+import pytest
+from fastapi.testclient import TestClient
+from datetime import date
+from uuid import uuid4
+from fastapi import FastAPI
+from unittest.mock import Mock
+from modules.reservation.infrastructure.reservation_controller import router, get_reservation_service
+from modules.reservation.application.reservation_services import ReservationService
+from modules.reservation.application.dtos.day_sheet_dto import DaySheetDto
+from modules.auth.infrastructure.auth_controller import get_current_user
+from modules.auth.domain.user import User, UserRole
+
+app = FastAPI()
+app.include_router(router, prefix="/reservations")
+
+@pytest.fixture
+def admin_user():
+    return User(uuid=uuid4(), name="Admin", email="admin@example.com", hashed_password="hashed", role=UserRole.ADMIN)
+
+@pytest.fixture
+def mock_service():
+    return Mock(spec=ReservationService)
+
+@pytest.fixture
+def client(admin_user, mock_service):
+    app.dependency_overrides[get_reservation_service] = lambda: mock_service
+    app.dependency_overrides[get_current_user] = lambda: admin_user
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides = {}
+
+def test_day_sheet_returns_304_while_unchanged(client, mock_service):
+    restaurant_id = uuid4()
+    url = f"/reservations/restaurant/{restaurant_id}/day-sheet?date=2030-07-10"
+    mock_service.get_day_sheet.return_value = DaySheetDto(
+        restaurant_id=restaurant_id, date=date(2030, 7, 10), reservations=[], dish_totals=[]
+    )
+
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert first.json()["date"] == "2030-07-10"
+
+    unchanged = client.get(url, headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+
+    mock_service.get_day_sheet.return_value = DaySheetDto(
+        restaurant_id=restaurant_id, date=date(2030, 7, 10), reservations=[],
+        dish_totals=[{"menu_item_id": uuid4(), "menu_item_name": "Arepa", "quantity": 2}]
+    )
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    mock_service.get_day_sheet.assert_called_with(restaurant_id, date(2030, 7, 10), False)
+
+def test_day_sheet_requires_admin(client, admin_user):
+    admin_user.role = UserRole.CLIENT
+
+    response = client.get(f"/reservations/restaurant/{uuid4()}/day-sheet?date=2030-07-10")
+
+    assert response.status_code == 403
@@ -0,0 +1,64 @@
+from uuid import uuid4
+from datetime import date, datetime, timedelta
+
+from modules.reservation.domain.reservation import ReservationStatus, MAX_RESERVATION_DURATION
+from modules.reservation.infrastructure.reservation_db_model import ReservationDBModel
+from modules.reservation.infrastructure.reservation_repository import ReservationRepository
+from modules.reservation.infrastructure.availability_index import AvailabilityIndex
+from modules.reservation.infrastructure.reservation_partitions import (
+    add_months, archivable_partitions, crosses_month_boundary, ensure_partitions, missing_partitions, partition_month, partition_name,
+    DEFAULT_PARTITION,
+)
+
+def test_partition_names_round_trip():
+    assert partition_name(date(2025, 7, 1)) == "reservationdbmodel_y2025m07"
+    assert partition_month("reservationdbmodel_y2025m07") == date(2025, 7, 1)
+    assert partition_month(DEFAULT_PARTITION) is None
+
+def test_add_months_crosses_years():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+def test_crosses_month_boundary_covers_both_sides_of_the_change_of_month():
+    # 23:00-01:00 del 31 y 00:30 del 1 se solapan en particiones distintas: las dos lo detectan
+    assert crosses_month_boundary(datetime(2025, 7, 31, 23), datetime(2025, 8, 1, 1))
+    assert crosses_month_boundary(datetime(2025, 8, 1, 0, 30), datetime(2025, 8, 1, 2, 30))
+    assert crosses_month_boundary(datetime(2025, 8, 1, 3, 59), datetime(2025, 8, 1, 5))
+    assert not crosses_month_boundary(datetime(2025, 8, 1, 4), datetime(2025, 8, 1, 6))
+    assert not crosses_month_boundary(datetime(2025, 7, 31, 20), datetime(2025, 7, 31, 22))
+
+def test_missing_partitions_skips_existing_months():
+    existing = [DEFAULT_PARTITION, "reservationdbmodel_y2025m12", "reservationdbmodel_y2026m02"]
+
+    missing = missing_partitions(existing, date(2025, 12, 1), 3)
+
+    assert missing == [date(2026, 1, 1), date(2026, 3, 1)]
+
+def test_archivable_partitions_keeps_default_and_recent_months():
+    existing = [DEFAULT_PARTITION, "reservationdbmodel_y2025m05", "reservationdbmodel_y2025m06",
+                "reservationdbmodel_y2025m07"]
+
+    assert archivable_partitions(existing, date(2025, 7, 1)) == [
+        "reservationdbmodel_y2025m05", "reservationdbmodel_y2025m06"
+    ]
+
+def test_ensure_partitions_is_a_no_op_outside_postgres(engine):
+    with engine.connect() as conn:
+        assert ensure_partitions(conn, datetime(2025, 7, 10)) == []
+
+def test_overlap_bound_for_partition_pruning_still_finds_longest_reservation(db):
+    # La cota inferior de start_time (fin de la ventana - duración máxima) no debe perder reservas
+    table_id, user_id = uuid4(), uuid4()
+    start = datetime(2025, 7, 1, 1, 0)
+    db.add(ReservationDBModel(
+        uuid=uuid4(), user_id=user_id, table_id=table_id, start_time=start - MAX_RESERVATION_DURATION + timedelta(minutes=1),
+        end_time=start + timedelta(minutes=1), num_people=2, special_instructions=None,
+        status=ReservationStatus.CONFIRMED
+    ))
+    db.commit()
+
+    repo = ReservationRepository(db, index=AvailabilityIndex())
+
+    assert len(repo.get_active_by_table_and_time(table_id, start, start + timedelta(hours=2))) == 1
+    assert len(repo.get_active_by_user_and_time(user_id, start, start + timedelta(hours=2))) == 1
+    assert repo.exists_active_by_user_and_time(user_id, start, start + timedelta(hours=2))
@@ -0,0 +1,74 @@
+import asyncio
+from uuid import uuid4
+from datetime import datetime, timedelta
+from sqlmodel import Session, select
+
+from modules.reservation.domain.reservation import ReservationStatus
+from modules.reservation.infrastructure.reservation_db_model import ReservationDBModel
+from modules.reservation.infrastructure.reservation_sweeper import ReservationSweeper
+
+NOW = datetime(2025, 7, 10, 22, 0)
+
+def add_reservation(db, end_time, status):
+    db.add(ReservationDBModel(
+        uuid=uuid4(), user_id=uuid4(), table_id=uuid4(), start_time=end_time - timedelta(hours=2),
+        end_time=end_time, num_people=2, special_instructions=None, status=status
+    ))
+
+def statuses(engine):
+    with Session(engine) as db:
+        return sorted(r.status.value for r in db.exec(select(ReservationDBModel)).all())
+
+def test_sweep_completes_finished_active_reservations_in_batches(engine):
+    with Session(engine) as db:
+        for i in range(5):
+            add_reservation(db, NOW - timedelta(hours=i), ReservationStatus.PENDING)
+        add_reservation(db, NOW - timedelta(hours=1), ReservationStatus.CONFIRMED)
+        add_reservation(db, NOW - timedelta(hours=1), ReservationStatus.CANCELLED)
+        add_reservation(db, NOW + timedelta(hours=1), ReservationStatus.CONFIRMED)
+        db.commit()
+
+    sweeper = ReservationSweeper(lambda: Session(engine), batch_size=2, clock=lambda: NOW)
+
+    assert sweeper.sweep_once() == 6
+    assert statuses(engine) == ["CANCELLED"] + ["COMPLETED"] * 6 + ["CONFIRMED"]
+    assert sweeper.metrics.batches == 3
+    assert sweeper.metrics.rows_processed == 6
+
+    assert sweeper.sweep_once() == 0
+    assert sweeper.metrics.runs == 2
+
+def test_run_records_errors_and_keeps_going(engine):
+    def broken_session():
+        raise RuntimeError("db down")
+
+    sweeper = ReservationSweeper(broken_session, interval_seconds=0)
+
+    async def run_briefly():
+        sweeper.start()
+        await asyncio.sleep(0.05)
+        await sweeper.stop()
+
+    asyncio.run(run_briefly())
+    assert sweeper.metrics.errors >= 2
+    assert sweeper.metrics.last_error == "db down"
+
+def test_failed_stage_does_not_stop_the_others(engine, monkeypatch):
+    def locked_catalog(conn, now, months_ahead):
+        raise RuntimeError("catalog locked")
+
+    monkeypatch.setattr(
+        "modules.reservation.infrastructure.reservation_sweeper.ensure_partitions", locked_catalog
+    )
+    with Session(engine) as db:
+        add_reservation(db, NOW - timedelta(hours=1), ReservationStatus.CONFIRMED)
+        db.commit()
+
+    sweeper = ReservationSweeper(lambda: Session(engine), clock=lambda: NOW)
+
+    assert sweeper.sweep_once() == 1
+    assert statuses(engine) == ["COMPLETED"]
+    assert sweeper.metrics.stage_errors == {"partitions": 1}
+    assert sweeper.metrics.last_error_stage == "partitions"
+    assert sweeper.metrics.last_error == "catalog locked"
+    assert sweeper.metrics.runs == 1
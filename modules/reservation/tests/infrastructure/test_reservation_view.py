@@ -0,0 +1,139 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, time, timedelta
+from sqlmodel import select
+
+from modules.menu.domain.pre_order_item import PreOrderItem
+from modules.menu.infrastructure.menu_item_db_model import MenuItemDB
+from modules.menu.infrastructure.menu_repository import MenuRepository
+from modules.reservation.domain.reservation import Reservation, ReservationStatus, ACTIVE_STATUSES
+from modules.reservation.infrastructure import reservation_view
+from modules.reservation.infrastructure.availability_index import AvailabilityIndex
+from modules.reservation.infrastructure.reservation_repository import ReservationRepository
+from modules.reservation.infrastructure.reservation_view_db_model import ReservationViewDB
+from modules.restaurant.domain.restaurant import Restaurant
+from modules.restaurant.domain.table import Table
+from modules.restaurant.infrastructure.restaurant_repository import RestaurantRepository
+from modules.restaurant.infrastructure.table_repository import TableRepository
+
+EVENING = datetime(2030, 7, 10, 20, 0)
+
+@pytest.fixture
+def table(seed_restaurant, seed_tables):
+    table = seed_tables(seed_restaurant().id, [7])[0]
+    return Table(id=table.id, restaurant_id=table.restaurant_id, number=7, capacity=4, location="Indoor")
+
+@pytest.fixture
+def repo(db):
+    return ReservationRepository(db, index=AvailabilityIndex())
+
+def book(repo, table, start):
+    return repo.save(Reservation(
+        uuid=uuid4(), user_id=uuid4(), table_id=table.id, start_time=start, end_time=start + timedelta(hours=2),
+        num_people=2, special_instructions=None, status=ReservationStatus.PENDING
+    ))
+
+def add_pre_orders(db, table, reservation, count):
+    dish = MenuItemDB(id=uuid4(), name="Arepa", description="", category="Main", price=5.0,
+                      available_stock=10, restaurant_id=table.restaurant_id, image_url=None)
+    db.add(dish)
+    db.commit()
+    MenuRepository(db).bulk_save_pre_order_items([
+        PreOrderItem(id=uuid4(), menu_item_id=dish.id, reservation_id=reservation.uuid, quantity=1,
+                     special_instructions=None)
+        for _ in range(count)
+    ])
+
+def test_save_projects_restaurant_table_and_pre_orders(db, repo, table):
+    reservation = book(repo, table, EVENING)
+    add_pre_orders(db, table, reservation, 2)
+
+    detail = repo.get_detail_by_id(reservation.uuid)
+
+    assert detail.restaurant_name == "Goyo"
+    assert detail.restaurant_id == table.restaurant_id
+    assert detail.table_number == 7
+    assert detail.pre_order_count == 2
+    assert [d.uuid for d in repo.get_details_by_restaurant(table.restaurant_id)] == [reservation.uuid]
+
+def test_writes_to_tables_and_restaurants_propagate(db, repo, table):
+    reservation = book(repo, table, EVENING)
+
+    RestaurantRepository(db).modify_restaurant(Restaurant(
+        id=table.restaurant_id, name="Goyo Centro", address="Calle 1", opening_time=time(12), closing_time=time(23, 59)
+    ))
+    TableRepository(db).modify(table.model_copy(update={"number": 12}))
+
+    detail = repo.get_detail_by_id(reservation.uuid)
+    assert (detail.restaurant_name, detail.table_number) == ("Goyo Centro", 12)
+
+def test_status_transitions_and_deletes_propagate(repo, table):
+    cancelled = book(repo, table, EVENING)
+    deleted = book(repo, table, EVENING + timedelta(hours=3))
+
+    repo.transition_status(cancelled.uuid, ReservationStatus.CANCELLED, ACTIVE_STATUSES)
+    repo.delete(deleted.uuid)
+
+    assert repo.get_detail_by_id(cancelled.uuid).status == ReservationStatus.CANCELLED
+    assert repo.get_detail_by_id(deleted.uuid) is None
+
+def test_reservations_of_a_deleted_table_stay_readable(db, repo, table):
+    reservation = book(repo, table, EVENING)
+
+    TableRepository(db).delete(table.id)
+
+    detail = repo.get_detail_by_id(reservation.uuid)
+    assert (detail.restaurant_id, detail.restaurant_name, detail.table_number) == (None, None, None)
+    assert [d.uuid for d in repo.get_details_by_user(reservation.user_id)] == [reservation.uuid]
+    assert repo.get_details_by_restaurant(table.restaurant_id) == []
+    # La reconstrucción desde las tablas de origen las proyecta igual
+    assert reservation_view.rebuild(db) == 1
+    assert repo.get_detail_by_id(reservation.uuid) == detail
+
+def test_rebuild_matches_incremental_maintenance(db, repo, table):
+    for hours in (0, 3, 6):
+        book(repo, table, EVENING + timedelta(hours=hours))
+    add_pre_orders(db, table, book(repo, table, EVENING + timedelta(days=1)), 3)
+    incremental = sorted(v.model_dump_json() for v in db.exec(select(ReservationViewDB)).all())
+
+    assert reservation_view.rebuild(db) == 4
+    db.expire_all()
+
+    assert sorted(v.model_dump_json() for v in db.exec(select(ReservationViewDB)).all()) == incremental
+
+def test_reschedule_moves_row_view_and_index(repo, table):
+    reservation = book(repo, table, EVENING)
+    blocker = book(repo, table, EVENING + timedelta(hours=4))
+    later = EVENING + timedelta(days=35)
+
+    moved = repo.reschedule(reservation.uuid, later, later + timedelta(hours=2), table.id, ACTIVE_STATUSES,
+                            user_id=reservation.user_id, starts_after=datetime(2030, 1, 1))
+
+    assert moved.start_time == later
+    assert repo.get_detail_by_id(reservation.uuid).start_time == later
+    assert not repo.exists_active_by_table_and_time(table.id, EVENING, EVENING + timedelta(hours=2))
+    assert repo.exists_active_by_table_and_time(table.id, later, later + timedelta(hours=1))
+    assert not repo.exists_active_by_table_and_time(table.id, later, later + timedelta(hours=1), exclude=reservation.uuid)
+    # Las condiciones del UPDATE no se cumplen: no se toca nada
+    assert repo.reschedule(blocker.uuid, later, later + timedelta(hours=2), table.id, ACTIVE_STATUSES,
+                           user_id=uuid4()) is None
+    assert repo.get_detail_by_id(blocker.uuid).start_time == EVENING + timedelta(hours=4)
+
+def test_bulk_save_inserts_projects_and_indexes(repo, table):
+    weekly = [
+        Reservation(uuid=uuid4(), user_id=uuid4(), table_id=table.id, start_time=EVENING + timedelta(weeks=w),
+                    end_time=EVENING + timedelta(weeks=w, hours=2), num_people=2, special_instructions=None,
+                    status=ReservationStatus.PENDING)
+        for w in range(4)
+    ]
+
+    repo.bulk_save(weekly)
+
+    assert [d.uuid for d in repo.get_details_by_restaurant(table.restaurant_id)] == [r.uuid for r in weekly]
+    assert repo.exists_active_by_table_and_time(table.id, EVENING + timedelta(weeks=3), EVENING + timedelta(weeks=3, hours=1))
+    overlapping = repo.get_active_overlapping(table.id, uuid4(), [
+        (EVENING + timedelta(hours=1), EVENING + timedelta(hours=3)),
+        (EVENING + timedelta(weeks=2, hours=2), EVENING + timedelta(weeks=2, hours=3)),
+        (EVENING + timedelta(weeks=3, minutes=30), EVENING + timedelta(weeks=3, hours=1)),
+    ])
+    assert {r.uuid for r in overlapping} == {weekly[0].uuid, weekly[3].uuid}
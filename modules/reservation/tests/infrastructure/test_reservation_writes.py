@@ -0,0 +1,86 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from modules.core.unit_of_work import UnitOfWork, in_unit_of_work
+from modules.reservation.application.slots import cover_slots
+from modules.reservation.domain.reservation import Reservation, ReservationStatus
+from modules.reservation.application.dtos.reservation_create_dto import ReservationCreateDto
+from modules.reservation.application.dtos.reservation_reschedule_dto import ReservationRescheduleDto
+from modules.reservation.infrastructure.availability_index import AvailabilityIndex
+from modules.reservation.infrastructure.reservation_repository import ReservationRepository
+from modules.reservation.infrastructure.slot_capacity_repository import SlotCapacityRepository
+from modules.restaurant.infrastructure.table_repository import TableRepository
+
+EVENING = (datetime.utcnow() + timedelta(days=2)).replace(hour=20, minute=0, second=0, microsecond=0)
+
+@pytest.fixture
+def table_ids(seed_restaurant, seed_tables):
+    return [table.id for table in seed_tables(seed_restaurant().id, (1, 2))]
+
+def book(service, user_id, table_id, start=EVENING):
+    return service.create_reservation(user_id, ReservationCreateDto(
+        table_id=table_id, start_time=start, end_time=start + timedelta(hours=2), num_people=2,
+        special_instructions=None
+    ))
+
+def test_user_overlap_is_rechecked_in_the_database_when_writing(make_reservation_service, table_ids):
+    # Cada worker tiene su propio índice en memoria, como procesos distintos sobre la misma base
+    first, second = make_reservation_service(), make_reservation_service()
+    user_id = uuid4()
+    # El segundo worker ya tiene el día cargado (vacío) en su índice cuando el primero reserva
+    assert not second.reservation_repo.exists_active_by_user_and_time(user_id, EVENING, EVENING + timedelta(hours=2))
+    book(first, user_id, table_ids[0])
+
+    with pytest.raises(HTTPException) as exc_info:
+        book(second, user_id, table_ids[1], EVENING + timedelta(hours=1))
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail == "You already have a reservation in this time slot."
+    assert len(first.get_reservations_by_user(user_id)) == 1
+
+    # Moverse dentro de su propia franja no choca consigo misma
+    later = second.reschedule_reservation(
+        first.get_reservations_by_user(user_id)[0].uuid, user_id,
+        ReservationRescheduleDto(start_time=EVENING + timedelta(hours=1), end_time=EVENING + timedelta(hours=3))
+    )
+    assert later.start_time == EVENING + timedelta(hours=1)
+
+def test_index_hits_are_confirmed_in_the_database(make_reservation_service, table_ids):
+    first, second = make_reservation_service(), make_reservation_service()
+    user_id = uuid4()
+    booked = book(first, user_id, table_ids[0])
+    # El segundo worker ya tiene la reserva en su índice cuando el primero la cancela
+    assert second.reservation_repo.exists_active_by_table_and_time(table_ids[0], EVENING, EVENING + timedelta(hours=2))
+    first.cancel_reservation(booked.uuid, user_id)
+
+    # Ni la mesa ni el cliente quedan ocupados por la copia vieja del índice
+    rebooked = book(second, user_id, table_ids[0])
+    assert rebooked.table_id == table_ids[0]
+    assert second.reservation_repo.index.overlapping(
+        AvailabilityIndex.TABLE, table_ids[0], EVENING, EVENING + timedelta(hours=2)) == [rebooked.uuid]
+
+def test_failed_write_inside_a_unit_of_work_is_rolled_back_by_the_unit_of_work(db, table_ids, monkeypatch):
+    index = AvailabilityIndex()
+    repo, capacity = ReservationRepository(db, index=index), SlotCapacityRepository(db)
+    restaurant_id = TableRepository(db).get_by_id(table_ids[0]).restaurant_id
+    existing = repo.save(Reservation(uuid=uuid4(), user_id=uuid4(), table_id=table_ids[0], start_time=EVENING,
+                                     end_time=EVENING + timedelta(hours=2), num_people=2,
+                                     special_instructions=None, status=ReservationStatus.PENDING))
+    rollbacks = []
+    session_rollback = db.rollback
+    monkeypatch.setattr(db, "rollback", lambda: rollbacks.append(in_unit_of_work(db)) or session_rollback())
+
+    # Misma PK: el INSERT falla después de que la unidad de trabajo ya admitió los cubiertos
+    duplicate = existing.model_copy(update={"user_id": uuid4(), "table_id": table_ids[1]})
+    with pytest.raises(IntegrityError):
+        with UnitOfWork(db):
+            assert capacity.add_covers(restaurant_id, cover_slots(duplicate.start_time, duplicate.end_time), 2, None)
+            repo.save(duplicate)
+
+    # El repositorio no revierte por su cuenta: lo hace una vez la unidad de trabajo, con todo adentro
+    assert rollbacks == [False]
+    assert capacity.get_covers(restaurant_id, EVENING, EVENING + timedelta(hours=2)) == {}
+    assert [r.table_id for r in repo.get_all_by_restaurant(restaurant_id)] == [table_ids[0]]
+    assert not index.overlaps(AvailabilityIndex.TABLE, table_ids[1], EVENING, EVENING + timedelta(hours=2))
@@ -0,0 +1,92 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from modules.reservation.application.dtos.reservation_create_dto import ReservationCreateDto
+from modules.reservation.application.dtos.reservation_reschedule_dto import ReservationRescheduleDto
+from modules.reservation.application.slots import cover_slots
+from modules.reservation.infrastructure.slot_capacity_repository import SlotCapacityRepository
+
+EVENING = (datetime.utcnow() + timedelta(days=2)).replace(hour=20, minute=0, second=0, microsecond=0)
+
+@pytest.fixture
+def restaurant(seed_restaurant, seed_tables):
+    # Tope de 6 cubiertos por franja y tres mesas de 4
+    restaurant = seed_restaurant(max_covers_per_slot=6)
+    seed_tables(restaurant.id, range(1, 4))
+    return restaurant
+
+@pytest.fixture
+def service(db, make_reservation_service):
+    return make_reservation_service(capacity_repo=SlotCapacityRepository(db))
+
+def book(service, restaurant_id, people, start=EVENING):
+    return service.create_reservation(uuid4(), ReservationCreateDto(
+        restaurant_id=restaurant_id, start_time=start, end_time=start + timedelta(hours=2), num_people=people,
+        special_instructions=None
+    ))
+
+def test_cover_slots_align_to_quarter_hours():
+    assert cover_slots(EVENING + timedelta(minutes=20), EVENING + timedelta(minutes=50)) == [
+        EVENING + timedelta(minutes=15), EVENING + timedelta(minutes=30), EVENING + timedelta(minutes=45)
+    ]
+
+def test_add_covers_is_all_or_nothing(db, restaurant):
+    repo = SlotCapacityRepository(db)
+    slots = cover_slots(EVENING, EVENING + timedelta(hours=1))
+
+    assert repo.add_covers(restaurant.id, slots[2:], 5, 6)
+    assert not repo.add_covers(restaurant.id, slots, 2, 6)
+    assert not repo.add_covers(restaurant.id, [EVENING - timedelta(hours=3)], 7, 6)
+
+    covers = repo.get_covers(restaurant.id, EVENING, EVENING + timedelta(hours=1))
+    assert [covers.get(slot, 0) for slot in slots] == [0, 0, 5, 5]
+
+def test_admission_cancellation_and_reschedule_keep_counters(db, service, restaurant):
+    first = book(service, restaurant.id, 4)
+    book(service, restaurant.id, 2, EVENING + timedelta(hours=1))
+
+    # El mismo horario ya tiene 4 y luego 6 cubiertos en las franjas que se pisan
+    with pytest.raises(HTTPException) as exc_info:
+        book(service, restaurant.id, 2, EVENING + timedelta(minutes=30))
+    assert exc_info.value.status_code == 409
+    assert len(service.get_all_by_restaurant(restaurant.id)) == 2
+
+    service.cancel_reservation(first.uuid, first.user_id, is_admin=True)
+    book(service, restaurant.id, 3, EVENING + timedelta(minutes=30))
+
+    covers = SlotCapacityRepository(db).get_covers(restaurant.id, EVENING, EVENING + timedelta(hours=4))
+    assert covers[EVENING] == 0
+    assert covers[EVENING + timedelta(minutes=30)] == 3
+    assert covers[EVENING + timedelta(hours=1)] == 5
+    assert max(covers.values()) <= 6
+
+def test_reschedule_moves_covers(db, service, restaurant):
+    reservation = book(service, restaurant.id, 4)
+    later = EVENING + timedelta(days=1)
+
+    service.reschedule_reservation(reservation.uuid, reservation.user_id, ReservationRescheduleDto(
+        start_time=later, end_time=later + timedelta(hours=2)
+    ), is_admin=True)
+
+    repo = SlotCapacityRepository(db)
+    assert set(repo.get_covers(restaurant.id, EVENING, EVENING + timedelta(hours=2)).values()) == {0}
+    assert set(repo.get_covers(restaurant.id, later, later + timedelta(hours=2)).values()) == {4}
+
+def test_cancel_by_restaurant_releases_covers_in_one_update(db, service, restaurant):
+    book(service, restaurant.id, 4)
+    book(service, restaurant.id, 2, EVENING + timedelta(hours=1))
+    book(service, restaurant.id, 3, EVENING + timedelta(days=1))
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    result = service.cancel_by_restaurant(restaurant.id, EVENING, EVENING + timedelta(hours=4))
+
+    assert result.cancelled == 2
+    assert len([s for s in statements if s.startswith("UPDATE restaurant_slot_covers")]) == 1
+    repo = SlotCapacityRepository(db)
+    assert set(repo.get_covers(restaurant.id, EVENING, EVENING + timedelta(hours=4)).values()) == {0}
+    later = EVENING + timedelta(days=1)
+    assert set(repo.get_covers(restaurant.id, later, later + timedelta(hours=2)).values()) == {3}
@@ -0,0 +1,133 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from sqlmodel import select
+
+from modules.reservation.application.recurrence import SeriesFrequency
+from modules.reservation.application.dtos.reservation_create_dto import ReservationCreateDto
+from modules.reservation.application.dtos.reservation_reschedule_dto import ReservationRescheduleDto
+from modules.reservation.application.dtos.reservation_series_dto import ReservationSeriesCreateDto
+from modules.reservation.application.dtos.waitlist_create_dto import WaitlistCreateDto
+from modules.reservation.application.dtos.slot_hold_dto import SlotHoldConfirmDto, SlotHoldCreateDto
+from modules.reservation.domain.waitlist_entry import WaitlistStatus
+from modules.reservation.infrastructure.slot_hold_db_model import SlotHoldDB
+from modules.reservation.infrastructure.slot_hold_repository import SlotHoldRepository
+from modules.reservation.infrastructure.waitlist_repository import WaitlistRepository
+
+EVENING = (datetime.utcnow() + timedelta(days=2)).replace(hour=20, minute=0, second=0, microsecond=0)
+
+@pytest.fixture
+def table_id(seed_restaurant, seed_tables):
+    return seed_tables(seed_restaurant().id, [1])[0].id
+
+@pytest.fixture
+def service(db, make_reservation_service):
+    return make_reservation_service(hold_repo=SlotHoldRepository(db), waitlist_repo=WaitlistRepository(db))
+
+def hold(service, user_id, table_id, start=EVENING, ttl_minutes=10):
+    return service.create_hold(user_id, SlotHoldCreateDto(
+        table_id=table_id, start_time=start, end_time=start + timedelta(hours=2), num_people=2, ttl_minutes=ttl_minutes
+    ))
+
+def create(service, user_id, table_id, start=EVENING):
+    return service.create_reservation(user_id, ReservationCreateDto(
+        table_id=table_id, start_time=start, end_time=start + timedelta(hours=2), num_people=2,
+        special_instructions=None
+    ))
+
+def test_hold_blocks_other_customers_until_confirmed(db, service, table_id):
+    holder, other = uuid4(), uuid4()
+    token = hold(service, holder, table_id)
+
+    with pytest.raises(HTTPException) as held:
+        create(service, other, table_id, EVENING + timedelta(hours=1))
+    with pytest.raises(HTTPException) as double_hold:
+        hold(service, other, table_id, EVENING - timedelta(hours=1))
+    assert (held.value.status_code, double_hold.value.status_code) == (409, 409)
+
+    reservation = service.confirm_hold(token.id, holder, SlotHoldConfirmDto(special_instructions="Ventana"))
+
+    assert (reservation.table_id, reservation.start_time, reservation.special_instructions) == (table_id, EVENING, "Ventana")
+    assert db.exec(select(SlotHoldDB)).all() == []
+    with pytest.raises(HTTPException) as gone:
+        service.confirm_hold(token.id, holder, SlotHoldConfirmDto())
+    assert gone.value.status_code == 404
+
+def test_hold_accepts_timezone_aware_times(service, table_id):
+    aware = EVENING.replace(tzinfo=timezone.utc)
+
+    token = service.create_hold(uuid4(), SlotHoldCreateDto(
+        table_id=table_id, start_time=aware, end_time=aware + timedelta(hours=2), num_people=2, ttl_minutes=10
+    ))
+
+    assert (token.start_time, token.end_time) == (EVENING, EVENING + timedelta(hours=2))
+    with pytest.raises(HTTPException) as exc_info:
+        create(service, uuid4(), table_id, EVENING + timedelta(hours=1))
+    assert exc_info.value.status_code == 409
+
+def test_confirm_requires_the_holder(service, table_id):
+    token = hold(service, uuid4(), table_id)
+
+    with pytest.raises(HTTPException) as exc_info:
+        service.confirm_hold(token.id, uuid4(), SlotHoldConfirmDto())
+
+    assert exc_info.value.status_code == 403
+
+def test_expired_holds_stop_blocking_and_are_swept(db, table_id):
+    repo = SlotHoldRepository(db)
+    token_id, now = uuid4(), datetime.utcnow()
+    db.add(SlotHoldDB(id=token_id, user_id=uuid4(), table_id=table_id, restaurant_id=uuid4(), start_time=EVENING,
+                      end_time=EVENING + timedelta(hours=2), num_people=2, expires_at=now - timedelta(seconds=1)))
+    db.commit()
+
+    assert not repo.exists_active_by_table_and_time(table_id, EVENING, EVENING + timedelta(hours=1), now)
+    assert repo.get(token_id, now) is None
+    assert repo.delete_expired(now, 100) == 1
+    assert repo.delete_expired(now, 100) == 0
+
+HELD = "This table is on hold for another customer at that time."
+
+def test_reschedule_into_a_held_slot_is_rejected(service, table_id):
+    owner = uuid4()
+    reservation = create(service, owner, table_id, EVENING + timedelta(days=1))
+    hold(service, uuid4(), table_id)
+
+    with pytest.raises(HTTPException) as exc_info:
+        service.reschedule_reservation(reservation.uuid, owner, ReservationRescheduleDto(
+            start_time=EVENING + timedelta(hours=1), end_time=EVENING + timedelta(hours=3)
+        ))
+
+    assert (exc_info.value.status_code, exc_info.value.detail) == (409, HELD)
+    # Su propia retención no le impide moverse
+    hold(service, owner, table_id, EVENING + timedelta(days=2))
+    moved = service.reschedule_reservation(reservation.uuid, owner, ReservationRescheduleDto(
+        start_time=EVENING + timedelta(days=2), end_time=EVENING + timedelta(days=2, hours=2)
+    ))
+    assert moved.start_time == EVENING + timedelta(days=2)
+
+def test_series_reports_held_occurrences_as_conflicts(service, table_id):
+    hold(service, uuid4(), table_id, EVENING + timedelta(weeks=1))
+
+    result = service.create_series(uuid4(), ReservationSeriesCreateDto(
+        table_id=table_id, start_time=EVENING, end_time=EVENING + timedelta(hours=2), num_people=2,
+        frequency=SeriesFrequency.WEEKLY, count=3
+    ))
+
+    assert [r.start_time for r in result.created] == [EVENING, EVENING + timedelta(weeks=2)]
+    assert [(c.start_time, c.reason) for c in result.conflicts] == [(EVENING + timedelta(weeks=1), HELD)]
+
+def test_waitlist_promotion_skips_held_slots(service, table_id):
+    freed = create(service, uuid4(), table_id)
+    # Otro cliente retiene la franja siguiente, que el cliente en espera ocuparía en parte
+    hold(service, uuid4(), table_id, EVENING + timedelta(hours=2))
+    restaurant_id = service.table_repo.get_by_id(table_id).restaurant_id
+    entry = service.join_waitlist(uuid4(), WaitlistCreateDto(
+        restaurant_id=restaurant_id, party_size=2, window_start=EVENING + timedelta(hours=1),
+        window_end=EVENING + timedelta(hours=1)
+    ))
+
+    service.cancel_reservation(freed.uuid, uuid4(), is_admin=True)
+
+    assert service.waitlist_repo.get_by_id(entry.id).status == WaitlistStatus.WAITING
+    assert not service.reservation_repo.get_active_by_table_and_time(table_id, EVENING, EVENING + timedelta(hours=4))
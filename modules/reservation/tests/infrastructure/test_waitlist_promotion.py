@@ -0,0 +1,66 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta
+
+from modules.reservation.application.dtos.waitlist_create_dto import WaitlistCreateDto
+from modules.reservation.domain.reservation import Reservation, ReservationStatus
+from modules.reservation.domain.waitlist_entry import WaitlistStatus
+from modules.reservation.infrastructure.waitlist_repository import WaitlistRepository
+
+EVENING = datetime(2030, 7, 10, 20, 0)
+
+@pytest.fixture
+def restaurant_id(seed_restaurant):
+    return seed_restaurant().id
+
+@pytest.fixture
+def table_id(seed_tables, restaurant_id):
+    return seed_tables(restaurant_id, [1])[0].id
+
+@pytest.fixture
+def service(db, make_reservation_service):
+    return make_reservation_service(waitlist_repo=WaitlistRepository(db))
+
+def book(service, table_id, start, hours=2):
+    return service.reservation_repo.save(Reservation(
+        uuid=uuid4(), user_id=uuid4(), table_id=table_id, start_time=start, end_time=start + timedelta(hours=hours),
+        num_people=2, special_instructions=None, status=ReservationStatus.CONFIRMED
+    ))
+
+def join(service, restaurant_id, party_size, window_start, window_end):
+    return service.join_waitlist(uuid4(), WaitlistCreateDto(
+        restaurant_id=restaurant_id, party_size=party_size, window_start=window_start, window_end=window_end
+    ))
+
+def test_cancellation_promotes_first_compatible_entry(service, restaurant_id, table_id):
+    book(service, table_id, EVENING - timedelta(hours=2))
+    freed = book(service, table_id, EVENING)
+    book(service, table_id, EVENING + timedelta(hours=2))
+
+    too_big = join(service, restaurant_id, 6, EVENING, EVENING)
+    other_day = join(service, restaurant_id, 2, EVENING + timedelta(days=1), EVENING + timedelta(days=1))
+    first = join(service, restaurant_id, 3, EVENING - timedelta(hours=1), EVENING + timedelta(minutes=30))
+    second = join(service, restaurant_id, 2, EVENING, EVENING)
+
+    service.cancel_reservation(freed.uuid, uuid4(), is_admin=True)
+
+    promoted = service.waitlist_repo.get_by_id(first.id)
+    assert promoted.status == WaitlistStatus.PROMOTED
+    reservation = service.reservation_repo.get_by_id(promoted.reservation_id)
+    # El hueco empieza donde terminaba la reserva cancelada (no antes de la ventana del cliente)
+    assert (reservation.start_time, reservation.end_time) == (EVENING, EVENING + timedelta(hours=2))
+    assert reservation.table_id == table_id
+    assert reservation.num_people == 3
+    for entry in (too_big, other_day, second):
+        assert service.waitlist_repo.get_by_id(entry.id).status == WaitlistStatus.WAITING
+
+def test_entry_is_skipped_when_the_gap_is_too_short(service, restaurant_id, table_id):
+    book(service, table_id, EVENING - timedelta(hours=1))
+    freed = book(service, table_id, EVENING + timedelta(hours=1), hours=1)
+    book(service, table_id, EVENING + timedelta(hours=2))
+
+    entry = join(service, restaurant_id, 2, EVENING, EVENING + timedelta(hours=1))
+
+    service.cancel_reservation(freed.uuid, uuid4(), is_admin=True)
+
+    assert service.waitlist_repo.get_by_id(entry.id).status == WaitlistStatus.WAITING
@@ -1,8 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import time
+from typing import Optional
 
 class CreateRestaurantDTO(BaseModel):
     name: str
     address: str
     opening_time: time
-    closing_time: time
\ No newline at end of file
+    closing_time: time
+    max_covers_per_slot: Optional[int] = Field(None, ge=1)
\ No newline at end of file
@@ -1,10 +1,12 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import time
+from typing import Optional
 
 class RestaurantResponseDto(BaseModel):
     id: UUID
     name: str
     address: str
     opening_time: time
-    closing_time: time
\ No newline at end of file
+    closing_time: time
+    max_covers_per_slot: Optional[int] = None
\ No newline at end of file
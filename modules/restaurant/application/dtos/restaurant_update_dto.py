@@ -1,9 +1,10 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import time
 
 class UpdateRestaurantDTO(BaseModel):
     name: Optional[str] = None
     address: Optional[str] = None
     opening_time: Optional[time] = None
-    closing_time: Optional[time] = None
\ No newline at end of file
+    closing_time: Optional[time] = None
+    max_covers_per_slot: Optional[int] = Field(None, ge=1)
\ No newline at end of file
@@ -33,7 +33,8 @@ class RestaurantService:
             name=dto.name,
             address=dto.address,
             opening_time=dto.opening_time,
-            closing_time=dto.closing_time
+            closing_time=dto.closing_time,
+            max_covers_per_slot=dto.max_covers_per_slot
         )
 
         saved = self.restaurant_repo.save(restaurant)
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import time
+from typing import Optional
 
 class Restaurant(BaseModel):
     id: UUID
@@ -8,3 +9,5 @@ class Restaurant(BaseModel):
     address: str
     opening_time: time
     closing_time: time
+    # Tope de cubiertos (suma de num_people) por franja de 15 minutos; None = sin tope
+    max_covers_per_slot: Optional[int] = None
@@ -2,6 +2,7 @@ from sqlmodel import SQLModel, Field
 from uuid import uuid4, UUID
 from modules.restaurant.domain.restaurant import Restaurant
 from datetime import datetime
+from typing import Optional
 
 class RestaurantDBModel(SQLModel, Restaurant, table=True):
     id: UUID = Field(default_factory=uuid4, index=True, primary_key=True)
@@ -9,6 +10,7 @@ class RestaurantDBModel(SQLModel, Restaurant, table=True):
     address: str
     opening_time: str
     closing_time: str
+    max_covers_per_slot: Optional[int] = None
 
 def _parse_time_string(time_str: str):
     # Remove timezone information if present
@@ -31,7 +33,8 @@ def to_domain(restaurat_db: RestaurantDBModel) -> Restaurant:
         name=restaurat_db.name,
         address=restaurat_db.address,
         opening_time=_parse_time_string(restaurat_db.opening_time),
-        closing_time=_parse_time_string(restaurat_db.closing_time)
+        closing_time=_parse_time_string(restaurat_db.closing_time),
+        max_covers_per_slot=restaurat_db.max_covers_per_slot
     )
 
 def to_db(restaurant: Restaurant) -> RestaurantDBModel:
@@ -40,5 +43,6 @@ def to_db(restaurant: Restaurant) -> RestaurantDBModel:
         name=restaurant.name,
         address=restaurant.address,
         opening_time=str(restaurant.opening_time),
-        closing_time=str(restaurant.closing_time)
+        closing_time=str(restaurant.closing_time),
+        max_covers_per_slot=restaurant.max_covers_per_slot
     )
@@ -4,6 +4,7 @@ from sqlmodel import Session, select
 from modules.restaurant.domain.restaurant import Restaurant
 from modules.restaurant.domain.restaurant_repository_interface import IRestaurantRepository
 from modules.restaurant.infrastructure.restaurant_db_model import RestaurantDBModel, to_domain, to_db
+from modules.reservation.infrastructure import reservation_view
 
 class RestaurantRepository(IRestaurantRepository):
     def __init__(self, db: Session):
@@ -48,6 +49,8 @@ class RestaurantRepository(IRestaurantRepository):
             setattr(db_restaurant, field, value)
 
         self.db.add(db_restaurant)
+        # Nombre desnormalizado en las reservas del restaurante
+        reservation_view.rename_restaurant(self.db, restaurant.id, restaurant.name)
         self.db.commit()
         self.db.refresh(db_restaurant)
         return to_domain(db_restaurant)
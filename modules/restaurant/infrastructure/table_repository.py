@@ -4,6 +4,7 @@ from uuid import UUID
 from modules.restaurant.domain.table_repository_interface import ITableRepository
 from modules.restaurant.domain.table import Table
 from modules.restaurant.infrastructure.table_db_model import TableDBModel, to_domain, to_db
+from modules.reservation.infrastructure import reservation_view
 
 class TableRepository(ITableRepository):
     def __init__(self, db: Session):
@@ -43,6 +44,8 @@ class TableRepository(ITableRepository):
             setattr(db_table, field, value)
 
         self.db.add(db_table)
+        # Número de mesa y restaurante desnormalizados en las reservas de la mesa
+        reservation_view.refresh_table(self.db, table.id, table.number, table.restaurant_id)
         self.db.commit()
         self.db.refresh(db_table)
         return to_domain(db_table)
@@ -50,6 +53,7 @@ class TableRepository(ITableRepository):
     def delete(self, table_id: UUID) -> None:
         db_table = self.db.get(TableDBModel, table_id)
         if db_table:
+            reservation_view.detach_table(self.db, table_id)
             self.db.delete(db_table)
             self.db.commit()
 